@@ -0,0 +1,24 @@
+"""
+Compile the hot modules with mypyc, next to their sources.
+
+Usage: python mypyc_build.py
+
+See "Compiling Hot Modules" in the README. Delete the generated *.so files
+to fall back to pure Python.
+"""
+
+from mypyc.build import mypycify
+from setuptools import setup
+
+# Modules that compile with mypyc and are tested compiled in CI
+MYPYC_MODULES = ["src/utils/tree.py"]
+
+# packages=[] turns off setuptools' package discovery, which takes src/ for a
+# src layout and would copy the extensions to src/src/. Only the listed
+# modules are type checked, so the mypy overrides for other modules are
+# unused here.
+setup(
+    packages=[],
+    ext_modules=mypycify(["--no-warn-unused-configs", *MYPYC_MODULES]),
+    script_args=["build_ext", "--inplace"],
+)
@@ -11,6 +11,13 @@ def get_parser() -> ArgumentParser:
         ArgumentParser: The configured argument parser for the CLI.
     """
     argparser = ArgumentParser(description="Vestigium - A Version Control System")
+    argparser.add_argument(
+        "-C",
+        metavar="path",
+        dest="cwd",
+        default=".",
+        help="Run as if ves was started in <path> instead of the current directory.",
+    )
     argsubparsers = argparser.add_subparsers(title="Commands", dest="command")
     argsubparsers.required = True
 
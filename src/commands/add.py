@@ -2,7 +2,7 @@ import os
 from argparse import Namespace
 from io import BytesIO
 
-from src.core.index import VesIndexEntry
+from src.core.index import VesIndex, VesIndexEntry
 from src.core.objects import object_hash
 from src.core.repository import VesRepository, repo_find
 from src.utils.transaction import IndexTransaction, rm_in_memory
@@ -16,15 +16,18 @@ def cmd_add(args: Namespace) -> None:
     the repository and delegates the actual addition operation to the add() function.
 
     Args:
-        args: Parsed command line arguments containing the paths to add
+        args: Parsed command line arguments containing the paths to add, and
+            optionally cwd, the directory that relative paths and the
+            repository search start from (defaults to the current directory)
 
     Note:
         If no repository is found in the current directory or its parents,
         the function returns silently without performing any operation.
     """
-    repo = repo_find()
+    cwd = getattr(args, "cwd", ".")
+    repo = repo_find(cwd)
     assert repo is not None
-    add(repo, args.path)
+    add(repo, [os.path.join(cwd, path) for path in args.path])
 
 
 def add(
@@ -32,7 +35,7 @@ def add(
     paths: list[str],
     delete: bool = True,
     skip_missing: bool = False,
-) -> None:
+) -> VesIndex:
     """
     Add files to the Vestigium index (staging area) using transaction management.
 
@@ -54,6 +57,9 @@ def add(
         delete: Unused parameter, kept for interface compatibility
         skip_missing: Unused parameter, kept for interface compatibility
 
+    Returns:
+        The updated index, as written to disk; callers need not read it back
+
     Raises:
         Exception: If any path is not a file or is outside the repository worktree
         OSError: If file cannot be read or filesystem metadata cannot be accessed
@@ -112,3 +118,5 @@ def add(
             )
 
             index.entries.append(entry)
+
+    return index
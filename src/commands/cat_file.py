@@ -17,12 +17,13 @@ def cmd_cat_file(args: Namespace) -> None:
         args (Namespace): Command line arguments containing:
             - object: Name or hash of the object to display
             - type: Type of the object (blob, tree, commit, tag)
+            - cwd (optional): Directory to search for the repository from
 
     Returns:
         None: Prints the object content to stdout or an error message
 
     """
-    repo = repo_find()
+    repo = repo_find(getattr(args, "cwd", "."))
     assert repo is not None
     cat_file(repo, args.object, fmt=args.type.encode())
 
@@ -1,3 +1,4 @@
+import sys
 from argparse import Namespace
 
 from src.core.repository import repo_find
@@ -17,11 +18,12 @@ def cmd_check_ignore(args: Namespace) -> None:
     Side Effects:
         Prints each path that is ignored by the repository's ignore rules.
     """
-    repo = repo_find()
+    repo = repo_find(getattr(args, "cwd", "."))
     assert repo is not None
     rules = vesignore_read(repo)
     if rules is None:
         return
-    for path in args.path:
-        if check_ignore(rules, path):
-            print(path)
+    # Collect the answers first so the output is written in one call
+    ignored = [path for path in args.path if check_ignore(rules, path)]
+    if ignored:
+        sys.stdout.write("\n".join(ignored) + "\n")
@@ -19,6 +19,8 @@ def cmd_checkout(args: Namespace) -> None:
         args (Namespace): Command line arguments containing:
                          - commit: SHA hash or reference to commit/tree to checkout
                          - path: Destination directory path where files will be extracted
+                         - cwd (optional): Directory that path and the repository
+                           search are relative to
 
     Behavior:
         - If given a commit, extracts the associated tree
@@ -30,7 +32,8 @@ def cmd_checkout(args: Namespace) -> None:
     Raises:
         Exception: If destination exists but is not a directory, or if directory is not empty
     """
-    repo = repo_find()
+    cwd = getattr(args, "cwd", ".")
+    repo = repo_find(cwd)
     assert repo is not None
 
     sha = object_find(repo, args.commit)
@@ -44,13 +47,14 @@ def cmd_checkout(args: Namespace) -> None:
         assert isinstance(obj, VesCommit)
         obj = object_read(repo, obj.kvlm[b"tree"].decode("ascii"))
 
-    if os.path.exists(args.path):
-        if not os.path.isdir(args.path):
+    path = os.path.join(cwd, args.path)
+    if os.path.exists(path):
+        if not os.path.isdir(path):
             raise Exception(f"Not a directory {args.path}!")
-        if os.listdir(args.path):
+        if os.listdir(path):
             raise Exception(f"Not empty {args.path}!")
     else:
-        os.makedirs(args.path)
+        os.makedirs(path)
 
     assert isinstance(obj, VesTree)
-    tree_checkout(repo, obj, os.path.realpath(args.path))
+    tree_checkout(repo, obj, os.path.realpath(path))
@@ -25,13 +25,14 @@ def cmd_commit(args: Namespace) -> None:
     4. Updates HEAD or the active branch reference
 
     Args:
-        args: Parsed command line arguments containing the commit message
+        args: Parsed command line arguments containing the commit message, and
+            optionally cwd, the directory to search for the repository from
 
     Note:
         If no repository is found, the function returns silently.
         The commit message is expected to be in args.message.
     """
-    repo = repo_find()
+    repo = repo_find(getattr(args, "cwd", "."))
     assert repo is not None
     index = index_read(repo)
 
@@ -1,3 +1,4 @@
+import os
 from argparse import Namespace
 
 from src.core.objects import object_hash
@@ -12,15 +13,18 @@ def cmd_hash_object(args: Namespace) -> None:
             - path (str): Path to the file to hash.
             - type (str): Type of the object (e.g., 'blob', 'tree').
             - write (bool): Whether to write the object to the repository.
+            - cwd (str, optional): Directory that path and the repository
+              search are relative to.
 
     Returns:
         None. Prints the SHA-1 hash of the object.
     """
+    cwd = getattr(args, "cwd", ".")
     if args.write:
-        repo = repo_find()
+        repo = repo_find(cwd)
     else:
         repo = None
 
-    with open(args.path, "rb") as fd:
+    with open(os.path.join(cwd, args.path), "rb") as fd:
         sha = object_hash(fd, args.type.encode(), repo)
         print(sha)
@@ -1,3 +1,4 @@
+import os
 from argparse import Namespace
 
 from src.core.repository import repo_create
@@ -9,6 +10,7 @@ def cmd_init(args: Namespace) -> None:
 
     Initializes a new, empty repository at the specified path.
     Args:
-        args (Namespace): Parsed command-line arguments. Must contain 'path'.
+        args (Namespace): Parsed command-line arguments. Must contain 'path',
+            which is resolved against the optional 'cwd'.
     """
-    repo_create(args.path)
+    repo_create(os.path.join(getattr(args, "cwd", "."), args.path))
@@ -29,7 +29,7 @@ def cmd_log(args: Namespace) -> None:
           c_def456a -> c_abc123f;
         }
     """
-    repo = repo_find()
+    repo = repo_find(getattr(args, "cwd", "."))
     assert repo is not None
 
     print("digraph veslog{")
@@ -32,7 +32,7 @@ def cmd_ls_files(args: Namespace) -> None:
     Returns:
         None
     """
-    repo = repo_find()
+    repo = repo_find(getattr(args, "cwd", "."))
     assert repo is not None
     index = index_read(repo)
 
@@ -18,7 +18,7 @@ def cmd_ls_tree(args: Namespace) -> None:
                          - tree: SHA or reference to the tree object
                          - recursive: Whether to recursively list subdirectories
     """
-    repo = repo_find()
+    repo = repo_find(getattr(args, "cwd", "."))
     assert repo is not None
     ls_tree(repo, args.tree, args.recursive)
 
@@ -61,6 +61,8 @@ def ls_tree(
 
     assert isinstance(obj, VesTree)
 
+    # Plain concatenation instead of os.path.join for every item
+    base = prefix + os.sep if prefix else ""
     for item in obj.items:
         if len(item.mode) == 5:
             type_bytes = item.mode[0:1]
@@ -79,11 +81,12 @@ def ls_tree(
             case _:
                 raise Exception(f"Weird tree leaf mode {item.mode.decode('ascii')}")
 
+        path = base + item.path
         if not (recursive and type_str == "tree"):
             # Leaf node: print the entry
             print(
-                f"{'0' * (6 - len(item.mode)) + item.mode.decode('ascii')} {type_str} {item.sha}\t{os.path.join(prefix, item.path)}"
+                f"{'0' * (6 - len(item.mode)) + item.mode.decode('ascii')} {type_str} {item.sha}\t{path}"
             )
         else:
             # Directory node with recursive flag: recurse into subdirectory
-            ls_tree(repo, item.sha, recursive, os.path.join(prefix, item.path))
+            ls_tree(repo, item.sha, recursive, path)
@@ -24,7 +24,7 @@ def cmd_rev_parse(args: Namespace) -> None:
     else:
         fmt = None
 
-    repo = repo_find()
+    repo = repo_find(getattr(args, "cwd", "."))
     assert repo is not None
 
     print(object_find(repo, args.name, fmt, follow=True))
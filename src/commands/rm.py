@@ -3,6 +3,7 @@ from argparse import Namespace
 
 from src.core.index import index_read, index_write
 from src.core.repository import VesRepository, repo_find
+from src.utils.transaction import unlink_paths
 
 
 def cmd_rm(args: Namespace) -> None:
@@ -13,15 +14,18 @@ def cmd_rm(args: Namespace) -> None:
     the repository and delegates the actual removal operation to the rm() function.
 
     Args:
-        args: Parsed command line arguments containing the paths to remove
+        args: Parsed command line arguments containing the paths to remove, and
+            optionally cwd, the directory that relative paths and the
+            repository search start from (defaults to the current directory)
 
     Note:
         If no repository is found in the current directory or its parents,
         the function returns silently without performing any operation.
     """
-    repo = repo_find()
+    cwd = getattr(args, "cwd", ".")
+    repo = repo_find(cwd)
     assert repo is not None
-    rm(repo, args.path)
+    rm(repo, [os.path.join(cwd, path) for path in args.path])
 
 
 def rm(
@@ -63,13 +67,14 @@ def rm(
     index = index_read(repo)
 
     worktree = repo.worktree + os.sep
+    wt_len = len(worktree)
 
-    # Validate paths and make them absolute
-    abspaths = set()
+    # Validate paths and key them by their worktree-relative name
+    targets: dict[str, str] = dict()
     for path in paths:
         abspath = os.path.abspath(path)
         if abspath.startswith(worktree):
-            abspaths.add(abspath)
+            targets[abspath[wt_len:]] = abspath
         else:
             raise Exception(f"Cannot remove paths outside of worktree: {paths}")
 
@@ -78,22 +83,21 @@ def rm(
 
     # Filter entries: keep those not being removed
     for e in index.entries:
-        full_path = os.path.join(repo.worktree, e.name)
-
-        if full_path in abspaths:
-            remove.append(full_path)
-            abspaths.remove(full_path)
+        target = targets.pop(e.name, None)
+        if target is not None:
+            remove.append(target)
         else:
             kept_entries.append(e)
 
     # Check if any paths weren't found in the index
-    if len(abspaths) > 0 and not skip_missing:
-        raise Exception(f"Cannot remove paths not in the index: {abspaths}")
+    if len(targets) > 0 and not skip_missing:
+        raise Exception(
+            f"Cannot remove paths not in the index: {set(targets.values())}"
+        )
 
     # Delete files from filesystem if requested
     if delete:
-        for path in remove:
-            os.unlink(path)
+        unlink_paths(remove)
 
     # Update index with remaining entries
     index.entries = kept_entries
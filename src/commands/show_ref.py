@@ -4,7 +4,7 @@ from src.core.refs import RefDict, ref_list
 from src.core.repository import VesRepository, repo_find
 
 
-def cmd_show_ref(_: Namespace) -> None:
+def cmd_show_ref(args: Namespace) -> None:
     """
     CLI command to display all references in the repository.
 
@@ -22,7 +22,7 @@ def cmd_show_ref(_: Namespace) -> None:
         789abc... refs/tags/v1.0
         012def... refs/remotes/origin/master
     """
-    repo = repo_find()
+    repo = repo_find(getattr(args, "cwd", "."))
     assert repo is not None
     refs = ref_list(repo)
     show_ref(repo, refs, prefix="refs")
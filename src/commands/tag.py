@@ -27,7 +27,7 @@ def cmd_tag(args: Namespace) -> None:
         - If args.name is provided: Creates a new tag pointing to args.object
         - If args.name is None: Lists all existing tags in the repository
     """
-    repo = repo_find()
+    repo = repo_find(getattr(args, "cwd", "."))
     assert repo is not None
 
     if args.name:
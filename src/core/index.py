@@ -1,9 +1,10 @@
 import os
+import tempfile
 from dataclasses import dataclass, field
 from math import ceil
-from typing import List, Tuple
+from typing import IO, List, Optional, Tuple
 
-from src.core.repository import VesRepository, repo_file
+from src.core.repository import VesRepository, file_stamp, repo_file
 
 
 @dataclass
@@ -67,6 +68,8 @@ class VesIndex:
     Attributes:
         version: Index format version (should be 2 for compatibility)
         entries: List of VesIndexEntry objects representing tracked files
+        stamp: file_stamp() of the index file when index_read read it, or None
+               if the index was not read from disk
 
     Note:
         The entries list is automatically initialized as empty list for each instance.
@@ -75,6 +78,7 @@ class VesIndex:
 
     version: int = 2
     entries: List[VesIndexEntry] = field(default_factory=list)
+    stamp: Optional[Tuple[int, ...]] = field(default=None, compare=False, repr=False)
 
 
 def index_read(repo: VesRepository) -> VesIndex:
@@ -112,8 +116,11 @@ def index_read(repo: VesRepository) -> VesIndex:
     """
     index_file = repo_file(repo, "index")
 
+    # Stamp before reading: a write racing with the read changes the stamp
+    stamp = file_stamp(index_file)
+
     # New repositories have no index!
-    if not os.path.exists(index_file):
+    if stamp is None:
         return VesIndex()
 
     with open(index_file, "rb") as f:
@@ -198,7 +205,7 @@ def index_read(repo: VesRepository) -> VesIndex:
             )
         )
 
-    return VesIndex(version=version, entries=entries)
+    return VesIndex(version=version, entries=entries, stamp=stamp)
 
 
 def index_write(repo: VesRepository, index: VesIndex) -> None:
@@ -233,48 +240,106 @@ def index_write(repo: VesRepository, index: VesIndex) -> None:
     index_file = repo_file(repo, "index")
 
     with open(index_file, "wb") as f:
+        _index_serialize(index, f)
+
+
+def index_write_if_unchanged(repo: VesRepository, index: VesIndex) -> bool:
+    """
+    Replace the index file with index, unless it changed since index_read.
+
+    Used for optional updates, such as status recording fresh file times,
+    that must never overwrite a concurrent write by another command. The
+    index is written to a temporary file and renamed over the index file,
+    so a failed write leaves the old index intact.
+
+    The stamp check and the rename are not atomic together; callers should
+    also skip the write while the index was modified too recently for its
+    stamp to be trusted, as a rewrite in the same clock tick keeps its mtime.
+
+    Args:
+        repo: The VesRepository instance to write the index to
+        index: The VesIndex object, as returned by index_read
+
+    Returns:
+        True if the index was written, False if it had changed on disk or
+        was not read from disk
+
+    Raises:
+        OSError: If the temporary file cannot be written or renamed
+    """
+    if index.stamp is None:
+        return False
+
+    index_file = repo_file(repo, "index")
+
+    fd, tmp_file = tempfile.mkstemp(prefix="index-", suffix=".tmp", dir=repo.vesdir)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            _index_serialize(index, f)
+        os.chmod(tmp_file, 0o644)
+
+        if file_stamp(index_file) != index.stamp:
+            os.unlink(tmp_file)
+            return False
+        os.replace(tmp_file, index_file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.unlink(tmp_file)
+        raise
+
+    index.stamp = file_stamp(index_file)
+    return True
+
 
-        # HEADER
-        f.write(b"DIRC")
-        f.write(index.version.to_bytes(4, "big"))
-        f.write(len(index.entries).to_bytes(4, "big"))
-
-        # ENTRIES
-        idx = 0
-        for e in index.entries:
-            # Write timestamps
-            f.write(e.ctime[0].to_bytes(4, "big"))
-            f.write(e.ctime[1].to_bytes(4, "big"))
-            f.write(e.mtime[0].to_bytes(4, "big"))
-            f.write(e.mtime[1].to_bytes(4, "big"))
-            # Write filesystem metadata
-            f.write(e.dev.to_bytes(4, "big"))
-            f.write(e.ino.to_bytes(4, "big"))
-            f.write((0).to_bytes(2, "big"))  # unused field
-            # Write file mode
-            mode = (e.mode_type << 12) | e.mode_perms
-            f.write(mode.to_bytes(2, "big"))
-            # Write user/group IDs and file size
-            f.write(e.uid.to_bytes(4, "big"))
-            f.write(e.gid.to_bytes(4, "big"))
-            f.write(e.fsize.to_bytes(4, "big"))
-            # Write SHA hash
-            f.write(int(e.sha, 16).to_bytes(20, "big"))
-
-            # Prepare flags and name
-            flag_assume_valid = 0x1 << 15 if e.flag_assume_valid else 0
-            name_bytes = e.name.encode("utf8")
-            bytes_len = len(name_bytes)
-            name_length = 0xFFF if bytes_len >= 0xFFF else bytes_len
-
-            # Write flags and name
-            f.write((flag_assume_valid | e.flag_stage | name_length).to_bytes(2, "big"))
-            f.write(name_bytes)
-            f.write((0).to_bytes(1, "big"))
-
-            # Update counter and apply padding
-            idx += 62 + len(name_bytes) + 1
-            if idx % 8 != 0:
-                pad = 8 - (idx % 8)
-                f.write((0).to_bytes(pad, "big"))
-                idx += pad
+def _index_serialize(index: VesIndex, f: IO[bytes]) -> None:
+    """
+    Write the binary index format of index to an open file.
+
+    Args:
+        index: The VesIndex object to serialize
+        f: File opened for binary writing
+    """
+    # HEADER
+    f.write(b"DIRC")
+    f.write(index.version.to_bytes(4, "big"))
+    f.write(len(index.entries).to_bytes(4, "big"))
+
+    # ENTRIES
+    idx = 0
+    for e in index.entries:
+        # Write timestamps
+        f.write(e.ctime[0].to_bytes(4, "big"))
+        f.write(e.ctime[1].to_bytes(4, "big"))
+        f.write(e.mtime[0].to_bytes(4, "big"))
+        f.write(e.mtime[1].to_bytes(4, "big"))
+        # Write filesystem metadata
+        f.write(e.dev.to_bytes(4, "big"))
+        f.write(e.ino.to_bytes(4, "big"))
+        f.write((0).to_bytes(2, "big"))  # unused field
+        # Write file mode
+        mode = (e.mode_type << 12) | e.mode_perms
+        f.write(mode.to_bytes(2, "big"))
+        # Write user/group IDs and file size
+        f.write(e.uid.to_bytes(4, "big"))
+        f.write(e.gid.to_bytes(4, "big"))
+        f.write(e.fsize.to_bytes(4, "big"))
+        # Write SHA hash
+        f.write(int(e.sha, 16).to_bytes(20, "big"))
+
+        # Prepare flags and name
+        flag_assume_valid = 0x1 << 15 if e.flag_assume_valid else 0
+        name_bytes = e.name.encode("utf8")
+        bytes_len = len(name_bytes)
+        name_length = 0xFFF if bytes_len >= 0xFFF else bytes_len
+
+        # Write flags and name
+        f.write((flag_assume_valid | e.flag_stage | name_length).to_bytes(2, "big"))
+        f.write(name_bytes)
+        f.write((0).to_bytes(1, "big"))
+
+        # Update counter and apply padding
+        idx += 62 + len(name_bytes) + 1
+        if idx % 8 != 0:
+            pad = 8 - (idx % 8)
+            f.write((0).to_bytes(pad, "big"))
+            idx += pad
@@ -3,16 +3,15 @@ import os
 import re
 import zlib
 from abc import ABC, abstractmethod
-from dataclasses import InitVar, dataclass, field
-from typing import IO, Any, Dict, List, Optional
+from typing import IO, Any, Dict, Iterable, List, Optional, Union
 
+from src.core.packfile import pack_lookup, packs_load
 from src.core.refs import ref_resolve
 from src.core.repository import VesRepository, repo_dir, repo_file
 from src.utils.kvlm import kvlm_parse, kvlm_serialize
 from src.utils.tree import VesTreeLeaf, tree_parse, tree_serialize
 
 
-@dataclass(kw_only=True, slots=True)
 class VesObject(ABC):
     """
     Abstract base class for all VCS objects (blobs, trees, commits, tags).
@@ -20,11 +19,14 @@ class VesObject(ABC):
     This class defines the interface that all VCS objects must implement.
     Objects can be created from raw byte data (when reading from storage)
     or initialized empty (when creating new objects).
+
+    Objects are plain classes with __slots__: they are created in tight loops
+    when walking trees and history, and need no generated __eq__ or __repr__.
     """
 
-    data: InitVar[Optional[bytes]] = None
+    __slots__ = ()
 
-    def __post_init__(self, data: Optional[bytes]) -> None:
+    def __init__(self, data: Optional[bytes] = None) -> None:
         """
         Initialize a VCS object.
 
@@ -76,7 +78,6 @@ class VesObject(ABC):
         pass
 
 
-@dataclass(kw_only=True, slots=True)
 class VesCommit(VesObject):
     """
     Represents a commit object in the VCS.
@@ -85,7 +86,9 @@ class VesCommit(VesObject):
         kvlm (dict): Dictionary containing commit metadata.
     """
 
-    kvlm: Dict[Optional[bytes], Any] = field(default_factory=dict)
+    __slots__ = ("kvlm",)
+
+    kvlm: Dict[Optional[bytes], Any]
 
     @property
     def format_type(self) -> bytes:
@@ -104,11 +107,12 @@ class VesCommit(VesObject):
         self.kvlm = dict()
 
 
-@dataclass(kw_only=True, slots=True)
 class VesTree(VesObject):
     """Represents a tree object in the VCS."""
 
-    items: List[VesTreeLeaf] = field(default_factory=list)
+    __slots__ = ("items",)
+
+    items: List[VesTreeLeaf]
 
     @property
     def format_type(self) -> bytes:
@@ -126,66 +130,210 @@ class VesTree(VesObject):
         self.items = list()
 
 
-@dataclass(kw_only=True, slots=True)
 class VesBlob(VesObject):
-    """Represents a blob object in the VCS."""
+    """
+    Represents a blob object in the VCS.
+
+    Blobs read from the object store keep a memoryview into the decompressed
+    buffer; the payload is only copied into a bytes object when blobdata is
+    first accessed. Writers that accept buffers can use view to skip the copy.
+    """
+
+    __slots__ = ("_view", "_blobdata")
 
-    blobdata: bytes = b""
+    _view: Optional[memoryview]
+    _blobdata: Optional[bytes]
 
     @property
     def format_type(self) -> bytes:
         return b"blob"
 
+    @property
+    def blobdata(self) -> bytes:
+        """Blob payload as bytes, materialized on first access."""
+        if self._blobdata is None:
+            assert self._view is not None
+            self._blobdata = bytes(self._view)
+            self._view = None
+        return self._blobdata
+
+    @blobdata.setter
+    def blobdata(self, value: bytes) -> None:
+        self._blobdata = value
+        self._view = None
+
+    @property
+    def view(self) -> memoryview:
+        """Zero-copy view of the blob payload."""
+        if self._view is not None:
+            return self._view
+        return memoryview(self.blobdata)
+
     def serialize(self, repo: Optional[VesRepository] = None) -> bytes:
         """Serialize blob object to bytes."""
         return self.blobdata
 
-    def deserialize(self, data: bytes) -> None:
-        """Deserialize bytes into blob object."""
-        self.blobdata = data
+    def deserialize(self, data: Union[bytes, memoryview]) -> None:
+        """Deserialize bytes into blob object, deferring any copy of a view."""
+        if isinstance(data, memoryview):
+            self._view = data
+            self._blobdata = None
+        else:
+            self._view = None
+            self._blobdata = data
+
+    def init(self) -> None:
+        self._view = None
+        self._blobdata = b""
 
 
-@dataclass(kw_only=True, slots=True)
 class VesTag(VesCommit):
     """Represents a tag object in the VCS."""
 
+    __slots__ = ()
+
     @property
     def format_type(self) -> bytes:
         return b"tag"
 
 
-def _object_read_raw(repo: VesRepository, sha: str) -> Optional[tuple[bytes, bytes]]:
+# Object classes by their header type; new types register here
+OBJECT_TYPES: Dict[bytes, type[VesObject]] = {
+    b"commit": VesCommit,
+    b"tree": VesTree,
+    b"tag": VesTag,
+    b"blob": VesBlob,
+}
+
+
+def _object_read_raw(
+    repo: VesRepository, sha: str
+) -> Optional[tuple[bytes, memoryview]]:
     """
     Reads the raw data of a VCS object from the repository's object store.
 
+    Packed objects are looked up first, then loose object files.
+
     Returns:
-        Optional[tuple[bytes, bytes]]: A tuple of (object_type, content_data)
-                                       or None if not found.
+        Optional[tuple[bytes, memoryview]]: A tuple of (object_type, content_data)
+                                            or None if not found. The content is
+                                            a view into the decompressed buffer.
     """
-    path = repo_file(repo, "objects", sha[:2], sha[2:])
+    compressed: Optional[Union[bytes, memoryview]] = pack_lookup(repo, sha)
 
-    if not os.path.isfile(path):
-        return None
+    if compressed is None:
+        path = repo_file(repo, "objects", sha[:2], sha[2:])
+
+        if not os.path.isfile(path):
+            return None
+
+        with open(path, "rb") as f:
+            compressed = f.read()
+
+    return _object_decode(sha, compressed)
+
+
+def _object_exists(repo: VesRepository, sha: str) -> bool:
+    """
+    Checks that an object is stored, packed or loose, without reading it.
+    """
+    if pack_lookup(repo, sha) is not None:
+        return True
+    return os.path.isfile(repo_file(repo, "objects", sha[:2], sha[2:]))
+
+
+def _object_decode(
+    sha: str, compressed: Union[bytes, memoryview]
+) -> tuple[bytes, memoryview]:
+    """
+    Decompresses a stored object and splits it into its type and content.
+
+    Returns:
+        tuple[bytes, memoryview]: A tuple of (object_type, content_data).
+
+    Raises:
+        Exception: If the object header is malformed or the size does not match.
+    """
+    raw = zlib.decompress(compressed)
+
+    object_type_end = raw.find(b" ")
+    if object_type_end == -1:
+        raise Exception(f"Malformed object {sha}: no space separator")
+
+    fmt = raw[:object_type_end]
+
+    object_size_end = raw.find(b"\x00", object_type_end)
+    if object_size_end == -1:
+        raise Exception(f"Malformed object {sha}: no null separator")
+
+    size = int(raw[object_type_end:object_size_end].decode("ascii"))
+    if size != len(raw) - object_size_end - 1:
+        raise Exception(f"Malformed object {sha}: bad length")
+
+    content = memoryview(raw)[object_size_end + 1 :]
+    return (fmt, content)
+
+
+def _inflate_header(sha: str, chunks: Iterable[Union[bytes, memoryview]]) -> bytes:
+    """
+    Inflates compressed chunks only until the object header's null separator.
+
+    Returns:
+        bytes: The decompressed data seen so far, containing the full header.
+    """
+    decompressor = zlib.decompressobj()
+    header = b""
+    for chunk in chunks:
+        header += decompressor.decompress(chunk, 64)
+        while b"\x00" not in header and decompressor.unconsumed_tail:
+            header += decompressor.decompress(decompressor.unconsumed_tail, 64)
+        if b"\x00" in header:
+            return header
+    raise Exception(f"Malformed object {sha}: no null separator")
+
+
+def object_peek(repo: VesRepository, sha: str) -> Optional[tuple[bytes, int]]:
+    """
+    Reads only the header of a VCS object: its type and payload size.
+
+    Only the first compressed chunk is inflated, and only as far as the
+    header's null separator, so the cost does not grow with the object size.
+    Use this instead of object_read when the payload would be thrown away.
 
-    with open(path, "rb") as f:
-        raw = zlib.decompress(f.read())
+    Args:
+        repo (VesRepository): The repository to read from.
+        sha (str): The SHA-1 hash of the object (40 hex characters).
 
-        object_type_end = raw.find(b" ")
-        if object_type_end == -1:
-            raise Exception(f"Malformed object {sha}: no space separator")
+    Returns:
+        Optional[tuple[bytes, int]]: A tuple of (object_type, size), or None
+                                     if the object does not exist.
 
-        fmt = raw[:object_type_end]
+    Raises:
+        Exception: If the object header is malformed.
+    """
+    packed = pack_lookup(repo, sha)
+
+    if packed is not None:
+        header = _inflate_header(sha, [packed])
+    else:
+        path = repo_file(repo, "objects", sha[:2], sha[2:])
 
-        object_size_end = raw.find(b"\x00", object_type_end)
-        if object_size_end == -1:
-            raise Exception(f"Malformed object {sha}: no null separator")
+        try:
+            f = open(path, "rb")
+        except (FileNotFoundError, NotADirectoryError):
+            return None
 
-        size = int(raw[object_type_end:object_size_end].decode("ascii"))
-        if size != len(raw) - object_size_end - 1:
-            raise Exception(f"Malformed object {sha}: bad length")
+        with f:
+            header = _inflate_header(sha, iter(lambda: f.read(4096), b""))
 
-        content = raw[object_size_end + 1 :]
-        return (fmt, content)
+    object_type_end = header.find(b" ")
+    object_size_end = header.find(b"\x00")
+    if object_type_end == -1 or object_type_end > object_size_end:
+        raise Exception(f"Malformed object {sha}: no space separator")
+
+    fmt = header[:object_type_end]
+    size = int(header[object_type_end:object_size_end].decode("ascii"))
+    return (fmt, size)
 
 
 def object_read(repo: VesRepository, sha: str) -> Optional[VesObject]:
@@ -216,21 +364,87 @@ def object_read(repo: VesRepository, sha: str) -> Optional[VesObject]:
     if result is None:
         return None
 
-    fmt, content = result
+    return _object_build(sha, *result)
+
+
+def _object_build(sha: str, fmt: bytes, content: memoryview) -> VesObject:
+    """Instantiates the object class matching fmt from decoded content."""
+    # Blobs keep the view and copy lazily; the other types parse bytes
+    if fmt == b"blob":
+        blob = VesBlob()
+        blob.deserialize(content)
+        return blob
 
-    match fmt:
-        case b"commit":
-            c: type[VesObject] = VesCommit
-        case b"tree":
-            c = VesTree
-        case b"tag":
-            c = VesTag
-        case b"blob":
-            c = VesBlob
-        case _:
-            raise Exception(f"Unknown type {fmt.decode('ascii')} for object {sha}")
+    try:
+        c = OBJECT_TYPES[fmt]
+    except KeyError:
+        raise Exception(f"Unknown type {fmt.decode('ascii')} for object {sha}")
 
-    return c(data=content)
+    return c(data=content.tobytes())
+
+
+# Upper bound on object files held open at once by object_read_many
+PREFETCH_BATCH_SIZE = 64
+
+
+def object_read_many(repo: VesRepository, shas: List[str]) -> List[Optional[VesObject]]:
+    """
+    Reads several objects, letting the kernel prefetch their files in parallel.
+
+    Loose object files are opened in batches and, where the platform supports
+    posix_fadvise, flagged with POSIX_FADV_WILLNEED before any of them is read.
+    The kernel can then fetch the whole batch while earlier objects are being
+    decompressed, instead of each read waiting on its own disk access.
+    Packed objects are read through the pack as usual.
+
+    Args:
+        repo (VesRepository): The repository to read from.
+        shas (List[str]): SHA-1 hashes of the objects to read.
+
+    Returns:
+        List[Optional[VesObject]]: The objects in the same order as shas, with
+                                   None for objects that were not found.
+
+    Raises:
+        Exception: If an object is malformed or has unknown type.
+    """
+    ret: List[Optional[VesObject]] = list()
+
+    for start in range(0, len(shas), PREFETCH_BATCH_SIZE):
+        batch = shas[start : start + PREFETCH_BATCH_SIZE]
+        fds: List[Optional[int]] = list()
+
+        try:
+            for sha in batch:
+                if pack_lookup(repo, sha) is not None:
+                    fds.append(None)
+                    continue
+                path = repo_file(repo, "objects", sha[:2], sha[2:])
+                try:
+                    fd = os.open(path, os.O_RDONLY)
+                except (FileNotFoundError, NotADirectoryError):
+                    fds.append(None)
+                    continue
+                fds.append(fd)
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+
+            for i, sha in enumerate(batch):
+                opened = fds[i]
+                if opened is None:
+                    # Packed or missing: object_read handles both
+                    ret.append(object_read(repo, sha))
+                    continue
+                fds[i] = None
+                with os.fdopen(opened, "rb") as f:
+                    compressed = f.read()
+                ret.append(_object_build(sha, *_object_decode(sha, compressed)))
+        finally:
+            for leftover in fds:
+                if leftover is not None:
+                    os.close(leftover)
+
+    return ret
 
 
 def object_write(obj: VesObject, repo: Optional[VesRepository] = None) -> str:
@@ -254,13 +468,9 @@ def object_write(obj: VesObject, repo: Optional[VesRepository] = None) -> str:
     Returns:
         str: The SHA-1 hash of the object (40 hex characters).
     """
-    data = obj.serialize()
+    sha, result = object_encode(obj)
 
-    # Create the object format: {type} {size}\0{content}
-    result = obj.format_type + b" " + str(len(data)).encode() + b"\x00" + data
-    sha = hashlib.sha1(result).hexdigest()
-
-    if repo:
+    if repo and pack_lookup(repo, sha) is None:
         path = repo_file(repo, "objects", sha[:2], sha[2:], mkdir=True)
 
         if not os.path.exists(path):
@@ -269,6 +479,65 @@ def object_write(obj: VesObject, repo: Optional[VesRepository] = None) -> str:
     return sha
 
 
+def object_encode(obj: VesObject) -> tuple[str, bytes]:
+    """
+    Serializes an object into its stored form without writing it.
+
+    Args:
+        obj (VesObject): The object to encode.
+
+    Returns:
+        tuple[str, bytes]: The object's SHA-1 hash and its uncompressed
+                           stored form, "{type} {size}\0{content}".
+    """
+    data = obj.serialize()
+
+    # Create the object format: {type} {size}\0{content}
+    result = obj.format_type + b" " + str(len(data)).encode() + b"\x00" + data
+    return hashlib.sha1(result).hexdigest(), result
+
+
+def object_write_many(
+    repo: VesRepository, encoded: Iterable[tuple[str, bytes]]
+) -> None:
+    """
+    Writes several encoded objects to the repository's object store at once.
+
+    Objects are grouped by their fan-out directory, so each directory is
+    checked (and created) once per batch rather than once per object, and
+    each file is created with O_EXCL: an object that already exists costs
+    one failed open instead of a stat followed by a skip.
+
+    Args:
+        repo (VesRepository): The repository to write to.
+        encoded (Iterable[tuple[str, bytes]]): (sha, stored form) pairs as
+            returned by object_encode(). Duplicates are written once.
+    """
+    by_dir: Dict[str, Dict[str, bytes]] = dict()
+    for sha, result in encoded:
+        by_dir.setdefault(sha[:2], dict())[sha[2:]] = result
+
+    for fanout, objects in by_dir.items():
+        directory: Optional[str] = None
+        for name, result in objects.items():
+            if pack_lookup(repo, fanout + name) is not None:
+                continue
+            if directory is None:
+                directory = repo_dir(repo, "objects", fanout, mkdir=True)
+                assert directory is not None
+
+            try:
+                fd = os.open(
+                    os.path.join(directory, name),
+                    os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+                    0o666,
+                )
+            except FileExistsError:
+                continue
+            with os.fdopen(fd, "wb") as f:
+                f.write(zlib.compress(result))
+
+
 def object_find(
     repo: VesRepository, name: str, fmt: Optional[bytes] = None, follow: bool = True
 ) -> Optional[str]:
@@ -303,7 +572,7 @@ def object_find(
         return sha
 
     while True:
-        header_result = _object_read_raw(repo, sha)
+        header_result = object_peek(repo, sha)
         if header_result is None:
             raise Exception(f"Cannot read object {sha}.")
 
@@ -323,7 +592,12 @@ def object_find(
         elif obj_type == b"commit" and fmt == b"tree":
             obj = object_read(repo, sha)
             assert isinstance(obj, VesCommit)
-            sha = obj.kvlm[b"tree"].decode("ascii")
+            # A commit's "tree" field always names a tree: skip peeking it,
+            # but still check that the tree is stored
+            tree_sha: str = obj.kvlm[b"tree"].decode("ascii")
+            if not _object_exists(repo, tree_sha):
+                raise Exception(f"Cannot read object {tree_sha}.")
+            return tree_sha
         else:
             return None
 
@@ -345,19 +619,12 @@ def object_hash(fd: IO[bytes], fmt: bytes, repo: Optional[VesRepository] = None)
     """
     data = fd.read()
 
-    match fmt:
-        case b"commit":
-            obj: VesObject = VesCommit(data=data)
-        case b"tree":
-            obj = VesTree(data=data)
-        case b"tag":
-            obj = VesTag(data=data)
-        case b"blob":
-            obj = VesBlob(data=data)
-        case _:
-            raise Exception(f"Unknown type {fmt.decode('utf-8')}!")
+    try:
+        c = OBJECT_TYPES[fmt]
+    except KeyError:
+        raise Exception(f"Unknown type {fmt.decode('utf-8')}!")
 
-    return object_write(obj, repo)
+    return object_write(c(data=data), repo)
 
 
 def object_resolve(repo: VesRepository, name: str) -> Optional[List[Optional[str]]]:
@@ -417,6 +684,12 @@ def object_resolve(repo: VesRepository, name: str) -> Optional[List[Optional[str
                 if f.startswith(rem):
                     candidates.append(prefix + f)
 
+        # Packed objects that are not also stored loose
+        for pack in packs_load(repo):
+            for packed_sha in pack.offsets:
+                if packed_sha.startswith(name) and packed_sha not in candidates:
+                    candidates.append(packed_sha)
+
     as_tag = ref_resolve(repo, "refs/tags/" + name)
     if as_tag:
         candidates.append(as_tag)
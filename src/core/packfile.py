@@ -0,0 +1,209 @@
+import hashlib
+import mmap
+import os
+import tempfile
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from src.core.repository import VesRepository, repo_dir, repo_file
+
+# Sidecar index layout: magic, entry count, then fixed-size entries of
+# 20-byte binary SHA, 8-byte offset and 8-byte length (all big endian).
+PACK_INDEX_SIGNATURE = b"VPIX"
+PACK_INDEX_ENTRY_SIZE = 36
+
+
+class VesPackFile(object):
+    """
+    A read-only pack of zlib-compressed objects, memory-mapped for random access.
+
+    A pack is the concatenation of loose object files (each one the zlib stream
+    of "{type} {size}\\0{content}") stored in .ves/objects/pack/{name}.pack.
+    A sidecar {name}.idx maps every SHA to the offset and length of its
+    compressed stream, so reading an object costs one slice of the mapping
+    instead of an open/read/close of its own file.
+
+    Attributes:
+        path (str): Path to the .pack file
+        offsets (Dict[str, Tuple[int, int]]): SHA -> (offset, length) in the pack
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.offsets = pack_index_read(path[: -len(".pack")] + ".idx")
+
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def get(self, sha: str) -> Optional[memoryview]:
+        """
+        Return the compressed stream of an object, or None if not in this pack.
+
+        The returned view points straight into the mapping; no bytes are copied.
+        """
+        location = self.offsets.get(sha)
+        if location is None:
+            return None
+        offset, length = location
+        return memoryview(self._mm)[offset : offset + length]
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def pack_index_read(path: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Read a pack's sidecar index into a SHA -> (offset, length) dictionary.
+
+    Args:
+        path: Path to the .idx file
+
+    Returns:
+        Dictionary mapping hex SHAs to the location of their compressed stream
+
+    Raises:
+        Exception: If the index signature is not "VPIX" or its length does
+                   not match its entry count
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    if raw[:4] != PACK_INDEX_SIGNATURE:
+        raise Exception(f"Malformed pack index {path}: bad signature")
+    count = int.from_bytes(raw[4:8], "big")
+    if len(raw) != 8 + count * PACK_INDEX_ENTRY_SIZE:
+        raise Exception(f"Malformed pack index {path}: bad length")
+
+    offsets: Dict[str, Tuple[int, int]] = dict()
+    idx = 8
+    for _ in range(count):
+        sha = raw[idx : idx + 20].hex()
+        offset = int.from_bytes(raw[idx + 20 : idx + 28], "big")
+        length = int.from_bytes(raw[idx + 28 : idx + 36], "big")
+        offsets[sha] = (offset, length)
+        idx += PACK_INDEX_ENTRY_SIZE
+
+    return offsets
+
+
+def pack_write(repo: VesRepository, shas: Iterable[str]) -> Optional[str]:
+    """
+    Pack the given loose objects into a new pack file.
+
+    The loose objects are copied as-is (they are already compressed) and are
+    left in place; readers consult packs first, so the pack takes over reads.
+
+    Args:
+        repo: The repository whose objects should be packed
+        shas: SHAs of loose objects to include
+
+    Returns:
+        The path of the new .pack file, or None if there was nothing to pack
+
+    Raises:
+        Exception: If one of the objects does not exist as a loose object
+    """
+    pack_data = bytearray()
+    index_entries = bytearray()
+    count = 0
+
+    for sha in sorted(set(shas)):
+        path = repo_file(repo, "objects", sha[:2], sha[2:])
+        try:
+            with open(path, "rb") as f:
+                compressed = f.read()
+        except FileNotFoundError:
+            raise Exception(f"Cannot pack missing object {sha}")
+
+        index_entries += bytes.fromhex(sha)
+        index_entries += len(pack_data).to_bytes(8, "big")
+        index_entries += len(compressed).to_bytes(8, "big")
+        pack_data += compressed
+        count += 1
+
+    if count == 0:
+        return None
+
+    name = "pack-" + hashlib.sha1(index_entries).hexdigest()
+    pack_path = repo_file(repo, "objects", "pack", name + ".pack", mkdir=True)
+    index_path = repo_file(repo, "objects", "pack", name + ".idx")
+
+    _pack_file_write(pack_path, [pack_data])
+
+    # Write the index last: a pack only becomes visible once its index exists
+    _pack_file_write(
+        index_path, [PACK_INDEX_SIGNATURE, count.to_bytes(4, "big"), index_entries]
+    )
+
+    # Make the new pack visible to this repository instance. Packs already
+    # open stay open: views into their mappings may still be in use.
+    if repo._packs is not None and pack_path not in (p.path for p in repo._packs):
+        repo._packs.append(VesPackFile(pack_path))
+    return pack_path
+
+
+def _pack_file_write(path: str, chunks: List[Union[bytes, bytearray]]) -> None:
+    """
+    Write a pack or index file under a temporary name and rename it into place.
+
+    Readers therefore never see a partial file: packs_load takes an existing
+    .idx to mean the pack is complete. The ".tmp" name matches neither
+    ".pack" nor ".idx", so a crash before the rename leaves nothing to load.
+
+    Args:
+        path: Final path of the file
+        chunks: Contents to write, in order
+    """
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def packs_load(repo: VesRepository) -> List[VesPackFile]:
+    """
+    Return the packs of a repository, opening and caching them on first use.
+
+    Args:
+        repo: The repository to load packs for
+
+    Returns:
+        List of memory-mapped packs (empty if the repository has none)
+    """
+    if repo._packs is not None:
+        return repo._packs
+
+    packs: List[VesPackFile] = list()
+    pack_dir = repo_dir(repo, "objects", "pack")
+    if pack_dir is not None:
+        for f in sorted(os.listdir(pack_dir)):
+            if f.endswith(".pack") and os.path.exists(
+                os.path.join(pack_dir, f[: -len(".pack")] + ".idx")
+            ):
+                packs.append(VesPackFile(os.path.join(pack_dir, f)))
+
+    repo._packs = packs
+    return packs
+
+
+def pack_lookup(repo: VesRepository, sha: str) -> Optional[memoryview]:
+    """
+    Find the compressed stream of an object in the repository's packs.
+
+    Args:
+        repo: The repository to search
+        sha: The SHA-1 hash of the object (40 hex characters)
+
+    Returns:
+        A zero-copy view of the compressed object, or None if it is not packed
+    """
+    for pack in packs_load(repo):
+        compressed = pack.get(sha)
+        if compressed is not None:
+            return compressed
+    return None
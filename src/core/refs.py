@@ -1,4 +1,5 @@
 import os
+import tempfile
 from typing import Dict, Optional, Union
 
 from src.core.repository import VesRepository, repo_dir, repo_file
@@ -33,12 +34,12 @@ def ref_resolve(repo: VesRepository, ref: str) -> Optional[str]:
     """
     path = repo_file(repo, ref)
 
-    if not os.path.isfile(path):
+    try:
+        with open(path, "r") as fp:
+            data = fp.read()[:-1]  # Remove trailing newline
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
         return None
 
-    with open(path, "r") as fp:
-        data = fp.read()[:-1]  # Remove trailing newline
-
     if data.startswith("ref: "):
         # Symbolic reference: recursively resolve the target
         return ref_resolve(repo, data[5:])
@@ -129,8 +130,22 @@ def ref_create(repo: VesRepository, ref_name: str, sha: str) -> None:
 
     File structure:
         References are stored as text files under .ves/refs/ with the SHA
-        hash as content followed by a newline character.
+        hash as content followed by a newline character. The content is
+        written to a temporary file and renamed into place, so readers never
+        see a partially written reference. The temporary file lives directly
+        in .ves/, outside refs/, so a crash before the rename cannot leave
+        behind a file that ref_list would report as a reference.
     """
     file = repo_file(repo, "refs/" + ref_name, mkdir=True)
-    with open(file, "w") as fp:
-        fp.write(sha + "\n")
+
+    fd, tmp_file = tempfile.mkstemp(prefix="ref-", suffix=".tmp", dir=repo.vesdir)
+    try:
+        try:
+            os.chmod(tmp_file, 0o644)
+            os.write(fd, sha.encode("ascii") + b"\n")
+        finally:
+            os.close(fd)
+        os.replace(tmp_file, file)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
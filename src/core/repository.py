@@ -1,7 +1,41 @@
-import configparser
 import os
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import configparser
+
+    from src.core.packfile import VesPackFile
+
+CoreConfig = Dict[Tuple[str, str], str]
+
+
+def _read_core_config(path: str) -> CoreConfig:
+    """
+    Reads a repository config file into a flat (section, key) -> value mapping.
+
+    The repository itself only needs a handful of keys, so this avoids building
+    a full ConfigParser every time a repository is opened. Keys are lowercased
+    like ConfigParser does.
+    Args:
+        path: Path to the INI-style config file.
+    Returns:
+        CoreConfig: Mapping of (section, key) pairs to their string values.
+    """
+    ret: CoreConfig = {}
+    section = ""
+    with open(path, "r") as f:
+        for line in f:
+            s = line.strip()
+            if not s or s[0] in "#;":
+                continue
+            if s[0] == "[" and s[-1] == "]":
+                section = s[1:-1].strip()
+                continue
+            key, _, value = s.partition("=")
+            ret[(section, key.strip().lower())] = value.strip()
+    return ret
 
 
 @dataclass
@@ -10,24 +44,33 @@ class VesRepository:
 
     _worktree: str
     _vesdir: str = field(init=False)
-    _conf: configparser.ConfigParser = field(init=False)
+    _core_config: CoreConfig = field(init=False)
+    _conf: Optional["configparser.ConfigParser"] = field(init=False)
+    _packs: Optional[List["VesPackFile"]] = field(init=False)
+    _tree_dicts: "OrderedDict[str, Dict[str, str]]" = field(init=False)
 
     def __init__(self, path: str, force: bool = False) -> None:
         self._worktree = path
         self._vesdir = os.path.join(path, ".ves")
+        self._conf = None
+        self._packs = None  # Loaded on first object lookup
+        self._tree_dicts = OrderedDict()  # Flattened trees by SHA, see tree_flatten
 
         if not (force or os.path.isdir(self._vesdir)):
             raise Exception(f"Not a Ves repository {path}")
 
-        self._conf = configparser.ConfigParser()
+        self._core_config = {}
         config_path = repo_path(self, "config")
         if os.path.exists(config_path):
-            self._conf.read([config_path])
+            self._core_config = _read_core_config(config_path)
         elif not force:
             raise Exception("Configuration file missing")
 
         if not force:
-            vers: int = int(self._conf.get("core", "repositoryformatversion"))
+            raw_vers = self._core_config.get(("core", "repositoryformatversion"))
+            if raw_vers is None:
+                raise Exception("Missing core.repositoryformatversion in config")
+            vers: int = int(raw_vers)
             if vers != 0:
                 raise Exception(f"Unsupported repositoryformatversion: {vers}")
 
@@ -40,7 +83,13 @@ class VesRepository:
         return self._vesdir
 
     @property
-    def conf(self) -> configparser.ConfigParser:
+    def conf(self) -> "configparser.ConfigParser":
+        # Only import and parse the full config when someone asks for it
+        if self._conf is None:
+            import configparser
+
+            self._conf = configparser.ConfigParser()
+            self._conf.read([repo_path(self, "config")])
         return self._conf
 
 
@@ -61,6 +110,8 @@ def repo_file(repo: VesRepository, *path: str, mkdir: bool = False) -> str:
     """
     Returns the absolute path to a file under the repository's .ves directory, optionally creating parent directories.
     Example: repo_file(repo, "refs", "remotes", "origin", "HEAD") will create .ves/refs/remotes/origin if mkdir=True.
+    When mkdir=False no filesystem check is made: callers open the file (or stat it) themselves,
+    so checking the parent directory here would only add redundant stat calls.
     Args:
         repo: VesRepository instance.
         *path: Path components for the file.
@@ -68,16 +119,35 @@ def repo_file(repo: VesRepository, *path: str, mkdir: bool = False) -> str:
     Returns:
         str: The absolute file path.
     Raises:
-        Exception: If parent directory creation fails and mkdir=True, or if parent directory doesn't exist and mkdir=False.
+        Exception: If parent directory creation fails and mkdir=True.
     """
+    if not mkdir:
+        return repo_path(repo, *path)
+
     parent_dir = repo_dir(repo, *path[:-1], mkdir=mkdir)
     if parent_dir is None:
         raise Exception(
-            f"Parent directory for file {'/'.join(path)} does not exist and mkdir=False"
+            f"Parent directory for file {'/'.join(path)} could not be created"
         )
     return repo_path(repo, *path)
 
 
+def file_stamp(path: str) -> Optional[Tuple[int, ...]]:
+    """
+    Returns what changes when a file is rewritten, or None if it does not exist.
+    Callers compare stamps to tell whether a file under .ves changed since they read it.
+    Args:
+        path: Path of the file to stat.
+    Returns:
+        Optional[Tuple[int, ...]]: (mtime_ns, ctime_ns, size, inode), or None if the file is missing.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino)
+
+
 def repo_dir(repo: VesRepository, *path: str, mkdir: bool = False) -> Optional[str]:
     """
     Returns the absolute path to a directory under the repository's .ves directory, optionally creating it.
@@ -148,13 +218,16 @@ def repo_create(path: str) -> VesRepository:
     return repo
 
 
-def repo_default_config() -> configparser.ConfigParser:
+def repo_default_config() -> "configparser.ConfigParser":
     """
     Returns a default configuration for a VesRepository, with core settings.
     The config includes repositoryformatversion, filemode, and bare options.
+    configparser is imported here, as only repo_create needs it.
     Returns:
         configparser.ConfigParser: The default configuration object.
     """
+    import configparser
+
     ret = configparser.ConfigParser()
     ret.add_section("core")
     ret.set("core", "repositoryformatversion", "0")
@@ -1,11 +1,247 @@
 import os
+import re
+import time
 from dataclasses import dataclass, field
-from fnmatch import fnmatch
-from typing import Dict, List, Optional, Tuple
+from fnmatch import translate
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 from src.core.index import index_read
 from src.core.objects import VesBlob, object_read
-from src.core.repository import VesRepository
+from src.core.repository import VesRepository, file_stamp
+
+try:
+    import re2
+except ImportError:  # Optional: pip install vestigium[re2]
+    re2 = None
+
+
+def rule_regex(pattern: str) -> Optional[str]:
+    """
+    Translate a single ignore pattern into an anchored regular expression.
+
+    Patterns ending in '/' are directory rules:
+    - "dir/" matches "dir" itself and everything below it
+    - "**/dir/" matches anything below a "dir" component at any depth
+    - "dir/**/" matches anything below "dir"
+    Other patterns follow fnmatch semantics, where '*' also matches '/'.
+
+    Args:
+        pattern: The ignore pattern, without any leading '!' or '\\'
+
+    Returns:
+        The regular expression source, or None if the pattern can never match
+    """
+    if not pattern.endswith("/"):
+        return translate(pattern)
+
+    dir_pattern = pattern[:-1]  # Remove trailing slash
+
+    if "**" not in dir_pattern:
+        return f"(?s:{re.escape(dir_pattern)}(?:/.*)?)\\Z"
+
+    if dir_pattern.startswith("**/"):
+        target_dir = dir_pattern[3:]  # Remove **/
+        if "/" in target_dir:
+            return None  # A single path component never contains '/'
+        return f"(?s:(?:.*/)?{re.escape(target_dir)}/.*)\\Z"
+    if dir_pattern.endswith("/**"):
+        target_dir = dir_pattern[:-3]  # Remove /**
+        return f"(?s:{re.escape(target_dir)}/.*)\\Z"
+    return None
+
+
+# "*.ext" rules: a plain suffix check, no regex needed
+SUFFIX_RULE = re.compile(r"\*\.[A-Za-z0-9_]+")
+GLOB_CHARS = frozenset("*?[")
+
+# From this many glob rules on, an RE2 set (when google-re2 is installed)
+# matches all of them in one DFA pass instead of trying each alternative
+RE2_MIN_GLOBS = 32
+
+
+def re2_glob_set(regexes: List[str]) -> Optional["re2.Set"]:
+    """
+    Compile rule regexes into an RE2 set that reports every matching rule.
+
+    RE2 has no atomic groups and no \\Z. Neither is needed here: a set
+    matches in linear time without backtracking, and the set is anchored
+    on both ends. fnmatch's atomic groups never change which paths match,
+    so they become plain groups.
+
+    Args:
+        regexes: Regular expression sources as produced by rule_regex
+
+    Returns:
+        The compiled set, or None if google-re2 is not installed or one of
+        the expressions uses syntax RE2 does not support
+    """
+    if re2 is None:
+        return None
+
+    glob_set = re2.Set.FullMatchSet()
+    try:
+        for regex in regexes:
+            glob_set.Add(regex.replace("(?>", "(?:").removesuffix("\\Z"))
+        glob_set.Compile()
+    except re2.error:
+        return None
+    return glob_set
+
+
+class VesIgnoreRules(object):
+    """
+    A compiled set of ignore rules, as read from one ignore file.
+
+    Rules are classified once when the rule set is built. The common shapes
+    are answered with dictionary lookups instead of regular expressions:
+    - "*.ext" rules, looked up by the path's extension
+    - literal names without glob characters, looked up by the whole path
+    - "dir/" rules, looked up by each leading directory of the path
+    Remaining patterns are folded into a single regex, compiled once, with
+    one capturing alternative per rule, latest rule first. Alternatives are
+    fully anchored, so the first one that matches is the last matching rule,
+    and a single match call replaces a Python loop over the rules. fnmatch
+    wraps inner '*' in atomic groups, so no pattern can backtrack
+    exponentially.
+    Large glob sets use an RE2 set instead when google-re2 is installed,
+    which finds every matching rule in a single DFA pass over the path.
+    Each lookup table keeps the index of the last rule of its kind, so the
+    rule-order semantics (last match wins) are preserved. A rule set without
+    negations stops at the first lookup hit: every rule ignores, so later
+    rules cannot change the answer, and e.g. everything below a "build/"
+    rule is decided without running the glob regex.
+    Directory rules ("dir/", "**/dir/", "dir/**/") are also kept apart, so
+    match_dir can tell whether a whole directory is ignored.
+
+    Attributes:
+        rules: The (pattern, should_ignore) tuples, in file order
+        values: should_ignore of each rule, by rule index
+        negations: Whether any rule is a negation ("!pattern")
+        suffixes: Extension (e.g. ".pyc") -> index of the last "*.ext" rule
+        literals: Exact path -> index of the last literal rule
+        dirs: Directory path -> index of the last "dir/" rule
+        glob_regex: Combined regex of the other rules, or None if there are none
+        glob_rules: Rule index of each glob_regex alternative, by group number
+        glob_set: RE2 set of the other rules, used instead of glob_regex
+        glob_set_rules: Rule index of each glob_set pattern, by set id
+        dir_glob_regex: Combined regex of the "**" directory rules, or None
+    """
+
+    def __init__(self, rules: List[Tuple[str, bool]]) -> None:
+        self.rules = rules
+        self.values: List[bool] = [value for _, value in rules]
+        self.negations = not all(self.values)
+        self.suffixes: Dict[str, int] = dict()
+        self.literals: Dict[str, int] = dict()
+        self.dirs: Dict[str, int] = dict()
+        self.glob_regex: Optional[re.Pattern[str]] = None
+        self.glob_rules: List[int] = list()
+        self.glob_set: Optional["re2.Set"] = None
+        self.glob_set_rules: List[int] = list()
+        self.dir_glob_regex: Optional[re.Pattern[str]] = None
+
+        globs = list()
+        dir_globs = list()
+        for index, (pattern, _) in enumerate(rules):
+            if SUFFIX_RULE.fullmatch(pattern):
+                self.suffixes[pattern[1:]] = index
+            elif pattern.endswith("/") and "**" not in pattern:
+                self.dirs[pattern[:-1]] = index
+            elif not pattern.endswith("/") and GLOB_CHARS.isdisjoint(pattern):
+                self.literals[pattern] = index
+            else:
+                regex = rule_regex(pattern)
+                if regex is not None:
+                    globs.append((index, regex))
+                    if pattern.endswith("/"):
+                        dir_globs.append(regex)
+
+        if dir_globs:
+            self.dir_glob_regex = re.compile("|".join(dir_globs))
+
+        if len(globs) >= RE2_MIN_GLOBS:
+            self.glob_set = re2_glob_set([regex for _, regex in globs])
+            if self.glob_set is not None:
+                self.glob_set_rules = [index for index, _ in globs]
+                return
+
+        if globs:
+            # Latest rule first; group 0 is the whole match
+            globs.reverse()
+            self.glob_rules = [-1] + [index for index, _ in globs]
+            self.glob_regex = re.compile("|".join(f"({regex})" for _, regex in globs))
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __iter__(self) -> Iterator[Tuple[str, bool]]:
+        return iter(self.rules)
+
+    def match(self, path: str) -> Optional[bool]:
+        """
+        Return the result of the last rule matching path, or None.
+
+        Args:
+            path: File path relative to the directory of the rule set
+        """
+        best = self.literals.get(path, -1)
+
+        dot = path.rfind(".")
+        if dot != -1:
+            best = max(best, self.suffixes.get(path[dot:], -1))
+
+        if self.dirs:
+            best = max(best, self.dirs.get(path, -1))
+            slash = path.find("/")
+            while slash != -1:
+                best = max(best, self.dirs.get(path[:slash], -1))
+                slash = path.find("/", slash + 1)
+
+        if best != -1 and not self.negations:
+            return True
+
+        # The latest matching glob overrides an earlier fast-path match
+        if self.glob_set is not None:
+            ids = self.glob_set.Match(path)
+            if ids:
+                best = max(best, self.glob_set_rules[max(ids)])
+        elif self.glob_regex is not None:
+            m = self.glob_regex.match(path)
+            if m is not None:
+                best = max(best, self.glob_rules[m.lastindex or 0])
+
+        return self.values[best] if best != -1 else None
+
+    def match_dir(self, path: str) -> bool:
+        """
+        Return whether a directory rule matches the directory path.
+
+        Only directory rules are tried. They match everything below the
+        directory, so a caller may skip it as a whole. Other patterns could
+        match the directory name without matching the files inside it (e.g.
+        "*.o?" and "foo.o/"), so they are left to per-file checks. Rule order
+        is not considered: only use this on rule sets without negations.
+
+        Args:
+            path: Directory path relative to the directory of the rule set,
+                  without a trailing '/'
+        """
+        if self.dirs:
+            if path in self.dirs:
+                return True
+            slash = path.find("/")
+            while slash != -1:
+                if path[:slash] in self.dirs:
+                    return True
+                slash = path.find("/", slash + 1)
+
+        return (
+            self.dir_glob_regex is not None
+            and self.dir_glob_regex.match(path + "/") is not None
+        )
+
+
+RuleSet = Union[VesIgnoreRules, List[Tuple[str, bool]]]
 
 
 @dataclass
@@ -20,10 +256,39 @@ class VesIgnore:
     Attributes:
         absolute: List of rule sets that apply to the entire repository
         scoped: Dictionary mapping directory paths to their specific ignore rules
+        chains: Cache of scope_chain() results by directory, filled as paths
+                are checked; sibling files share one walk up the tree
+        compiled: Whether every rule set is a VesIgnoreRules, set by
+                  vesignore_read and rules_compile. Reset it after assigning
+                  plain rule lists to a VesIgnore that was already checked
     """
 
-    absolute: List[List[Tuple[str, bool]]] = field(default_factory=list)
-    scoped: Dict[str, List[Tuple[str, bool]]] = field(default_factory=dict)
+    absolute: List[RuleSet] = field(default_factory=list)
+    scoped: Dict[str, RuleSet] = field(default_factory=dict)
+    chains: Dict[str, List[Tuple[str, RuleSet]]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    compiled: bool = field(default=False, repr=False, compare=False)
+
+
+# Parsed ignore rules by .ves directory: (global ignore file, stamps of the
+# exclude file, global file and index, rules). See vesignore_read.
+RuleStamps = Tuple[Optional[Tuple[int, ...]], ...]
+_RULES_CACHE: Dict[str, Tuple[str, RuleStamps, VesIgnore]] = dict()
+
+# Inputs modified this recently are not trusted to be stable: file timestamps
+# come from a coarse clock, so a later write could keep the same stamp
+RULES_CACHE_RACY_NS = 2 * 10**9
+
+
+def vesignore_invalidate(repo: VesRepository) -> None:
+    """
+    Drop the cached ignore rules of a repository.
+
+    Args:
+        repo: The repository whose rules vesignore_read should read again
+    """
+    _RULES_CACHE.pop(repo.vesdir, None)
 
 
 def vesignore_read(repo: VesRepository) -> Optional[VesIgnore]:
@@ -35,6 +300,12 @@ def vesignore_read(repo: VesRepository) -> Optional[VesIgnore]:
     2. Global user configuration (~/.config/ves/ignore)
     3. .vesignore files tracked in the repository index
 
+    The result is cached per repository and reused while the exclude file, the
+    global file and the index keep the same stamps (see file_stamp); scoped
+    rules only change with the index. Rules read while one of those files was
+    modified within RULES_CACHE_RACY_NS are not cached, since a rewrite in the
+    same clock tick could go unnoticed. Callers must not modify the result.
+
     Args:
         repo: The VesRepository to read ignore rules from
 
@@ -42,22 +313,32 @@ def vesignore_read(repo: VesRepository) -> Optional[VesIgnore]:
         A VesIgnore object containing all parsed ignore rules, or None if
         the repository is invalid
     """
-    ret = VesIgnore(absolute=list(), scoped=dict())
-
-    # Read local configuration in .ves/info/exclude
     repo_file = os.path.join(repo.vesdir, "info/exclude")
-    if os.path.exists(repo_file):
-        with open(repo_file, "r") as f:
-            ret.absolute.append(vesignore_parse(f.readlines()))
 
-    # Global configuration
     if "XDG_CONFIG_HOME" in os.environ:
         config_home = os.environ["XDG_CONFIG_HOME"]
     else:
         config_home = os.path.expanduser("~/.config")
     global_file = os.path.join(config_home, "ves/ignore")
 
-    if os.path.exists(global_file):
+    index_file = os.path.join(repo.vesdir, "index")
+
+    stamps = (file_stamp(repo_file), file_stamp(global_file), file_stamp(index_file))
+    cached = _RULES_CACHE.get(repo.vesdir)
+    # The global file moves with XDG_CONFIG_HOME, so its path must match too
+    if cached is not None and cached[:2] == (global_file, stamps):
+        return cached[2]
+
+    # Every rule set below comes from vesignore_parse
+    ret = VesIgnore(absolute=list(), scoped=dict(), compiled=True)
+
+    # Read local configuration in .ves/info/exclude
+    if stamps[0] is not None:
+        with open(repo_file, "r") as f:
+            ret.absolute.append(vesignore_parse(f.readlines()))
+
+    # Global configuration
+    if stamps[1] is not None:
         with open(global_file, "r") as f:
             ret.absolute.append(vesignore_parse(f.readlines()))
 
@@ -71,6 +352,10 @@ def vesignore_read(repo: VesRepository) -> Optional[VesIgnore]:
             assert isinstance(contents, VesBlob)
             lines = contents.blobdata.decode("utf8").splitlines()
             ret.scoped[dir_name] = vesignore_parse(lines)
+
+    settled = time.time_ns() - RULES_CACHE_RACY_NS
+    if all(stamp is None or stamp[0] < settled for stamp in stamps):
+        _RULES_CACHE[repo.vesdir] = (global_file, stamps, ret)
     return ret
 
 
@@ -115,18 +400,18 @@ def parse_line(raw: str) -> Optional[Tuple[str, bool]]:
         return (raw, True)
 
 
-def vesignore_parse(lines: List[str]) -> List[Tuple[str, bool]]:
+def vesignore_parse(lines: List[str]) -> VesIgnoreRules:
     """
-    Parse multiple lines from an ignore file into a list of rules.
+    Parse multiple lines from an ignore file into a compiled rule set.
 
     This function processes each line using parse_line and collects
-    all valid rules into a single list, filtering out comments and empty lines.
+    all valid rules into a single rule set, filtering out comments and empty lines.
 
     Args:
         lines: List of strings representing lines from an ignore file
 
     Returns:
-        List of tuples (pattern, should_ignore) representing ignore rules
+        VesIgnoreRules holding the (pattern, should_ignore) rules
     """
     ret = list()
 
@@ -135,56 +420,56 @@ def vesignore_parse(lines: List[str]) -> List[Tuple[str, bool]]:
         if parsed:
             ret.append(parsed)
 
-    return ret
+    return VesIgnoreRules(ret)
 
 
-def check_ignore1(rules: List[Tuple[str, bool]], path: str) -> Optional[bool]:
+def check_ignore1(rules: RuleSet, path: str) -> Optional[bool]:
     """
     Check if a path matches any rule in a single rule set.
 
-    This function iterates through rules in order and returns the result
-    of the last matching rule. Later rules override earlier ones.
+    Later rules override earlier ones; see VesIgnoreRules.match.
 
     Args:
-        rules: List of (pattern, should_ignore) tuples to check against
+        rules: Compiled rule set, or a plain list of (pattern, should_ignore)
+               tuples which is compiled on the fly
         path: File path to check
 
     Returns:
         True if the path should be ignored, False if it should be included,
         None if no rules match
     """
-    result = None
-    for pattern, value in rules:
-        if pattern.endswith("/"):
-            dir_pattern = pattern[:-1]  # Remove trailing slash
-
-            # Handle ** globstar patterns
-            if "**" in dir_pattern:
-                if dir_pattern.startswith("**/"):
-                    target_dir = dir_pattern[3:]  # Remove **/
-                    path_parts = path.split("/")
-                    for i, part in enumerate(path_parts):
-                        if part == target_dir:
-                            if i < len(path_parts) - 1:  # Not the last part
-                                result = value
-                                break
-                elif dir_pattern.endswith("/**"):
-                    target_dir = dir_pattern[:-3]  # Remove /**
-                    if path.startswith(target_dir + "/"):
-                        result = value
-            else:
-                # Simple directory pattern
-                if path.startswith(dir_pattern + "/") or path == dir_pattern:
-                    result = value
-        else:
-            # Regular pattern matching
-            if fnmatch(path, pattern):
-                result = value
-    return result
+    if not isinstance(rules, VesIgnoreRules):
+        rules = VesIgnoreRules(rules)
+
+    return rules.match(path)
+
+
+def scope_chain(rules: Dict[str, RuleSet], parent: str) -> List[Tuple[str, RuleSet]]:
+    """
+    List the scoped rule sets that apply to files in a directory.
+
+    Args:
+        rules: Dictionary mapping directory paths to their ignore rules
+        parent: Directory path (relative to repository root, "" for the root)
+
+    Returns:
+        (directory, rule set) pairs from the closest directory up to the root,
+        including only directories that have rules
+    """
+    chain = list()
+    while True:
+        if parent in rules:
+            chain.append((parent, rules[parent]))
+        if parent == "":
+            break
+        parent = parent.rpartition("/")[0]
+    return chain
 
 
 def check_ignore_scoped(
-    rules: Dict[str, List[Tuple[str, bool]]], path: str
+    rules: Dict[str, RuleSet],
+    path: str,
+    chains: Optional[Dict[str, List[Tuple[str, RuleSet]]]] = None,
 ) -> Optional[bool]:
     """
     Check if a path matches any scoped ignore rule.
@@ -196,29 +481,31 @@ def check_ignore_scoped(
     Args:
         rules: Dictionary mapping directory paths to their ignore rules
         path: File path to check (relative to repository root)
+        chains: Optional cache of scope_chain() results by directory
 
     Returns:
         True if the path should be ignored, False if it should be included,
         None if no scoped rules match
     """
-    parent = os.path.dirname(path)
-    while True:
-        if parent in rules:
-            # Calculate relative path from the parent directory
-            if parent == "":
-                relative_path = path
-            else:
-                relative_path = os.path.relpath(path, parent)
-            result = check_ignore1(rules[parent], relative_path)
-            if result != None:
-                return result
-        if parent == "":
-            break
-        parent = os.path.dirname(parent)
+    # A directory given as "dir/" is scoped by the directory containing it
+    parent = path.rstrip("/").rpartition("/")[0]
+
+    chain = chains.get(parent) if chains is not None else None
+    if chain is None:
+        chain = scope_chain(rules, parent)
+        if chains is not None:
+            chains[parent] = chain
+
+    for scope, ruleset in chain:
+        # Calculate relative path from the scope directory
+        relative_path = path[len(scope) + 1 :] if scope else path
+        result = check_ignore1(ruleset, relative_path)
+        if result != None:
+            return result
     return None
 
 
-def check_ignore_absolute(rules: List[List[Tuple[str, bool]]], path: str) -> bool:
+def check_ignore_absolute(rules: List[RuleSet], path: str) -> bool:
     """
     Check if a path matches any absolute ignore rule.
 
@@ -233,7 +520,6 @@ def check_ignore_absolute(rules: List[List[Tuple[str, bool]]], path: str) -> boo
     Returns:
         True if the path should be ignored, False otherwise
     """
-    parent = os.path.dirname(path)
     for ruleset in rules:
         result = check_ignore1(ruleset, path)
         if result != None:
@@ -241,6 +527,32 @@ def check_ignore_absolute(rules: List[List[Tuple[str, bool]]], path: str) -> boo
     return False  # This is a reasonable default at this point.
 
 
+def rules_compile(rules: VesIgnore) -> None:
+    """
+    Replace plain rule lists in a VesIgnore with compiled VesIgnoreRules.
+
+    Rule sets read from disk are compiled already; lists assigned by callers
+    would otherwise be compiled again by check_ignore1 on every path checked.
+    Each list is compiled once, in place, before any scope chain caches it.
+    Once done, rules.compiled is set, so later calls return at once instead
+    of visiting every rule set on each path checked.
+
+    Args:
+        rules: VesIgnore object whose rule sets should be compiled
+    """
+    if rules.compiled:
+        return
+
+    for i, ruleset in enumerate(rules.absolute):
+        if not isinstance(ruleset, VesIgnoreRules):
+            rules.absolute[i] = VesIgnoreRules(ruleset)
+    for scope, ruleset in rules.scoped.items():
+        if not isinstance(ruleset, VesIgnoreRules):
+            rules.scoped[scope] = VesIgnoreRules(ruleset)
+            rules.chains.clear()
+    rules.compiled = True
+
+
 def check_ignore(rules: VesIgnore, path: str) -> bool:
     """
     Check if a path should be ignored according to all ignore rules.
@@ -250,7 +562,9 @@ def check_ignore(rules: VesIgnore, path: str) -> bool:
 
     Args:
         rules: VesIgnore object containing all ignore rules
-        path: File path to check (must be relative to repository root)
+        path: File path to check (must be relative to repository root).
+              A directory can be checked as "dir/": directory rules such
+              as "build/" and "**/build/" then match it
 
     Returns:
         True if the path should be ignored, False otherwise
@@ -263,8 +577,64 @@ def check_ignore(rules: VesIgnore, path: str) -> bool:
             "This function requires path to be relative to the repository's root"
         )
 
-    result = check_ignore_scoped(rules.scoped, path)
+    rules_compile(rules)
+    result = check_ignore_scoped(rules.scoped, path, rules.chains)
     if result != None:
         return result
 
     return check_ignore_absolute(rules.absolute, path)
+
+
+def check_ignore_dir(rules: VesIgnore, path: str) -> bool:
+    """
+    Check if a directory is ignored as a whole by a directory rule.
+
+    Unlike check_ignore, only "dir/", "**/dir/" and "dir/**/" rules are
+    tried (see VesIgnoreRules.match_dir), so a True result means every path
+    below the directory is ignored too. Only valid when no rule set has
+    negations (see has_negations).
+
+    Args:
+        rules: VesIgnore object containing all ignore rules
+        path: Directory path relative to the repository root, without a
+              trailing '/'
+
+    Returns:
+        True if a directory rule ignores the directory, False otherwise
+    """
+    rules_compile(rules)
+
+    parent = path.rpartition("/")[0]
+    chain = rules.chains.get(parent)
+    if chain is None:
+        chain = rules.chains[parent] = scope_chain(rules.scoped, parent)
+
+    for scope, ruleset in chain:
+        if not isinstance(ruleset, VesIgnoreRules):
+            ruleset = VesIgnoreRules(ruleset)
+        if ruleset.match_dir(path[len(scope) + 1 :] if scope else path):
+            return True
+
+    for ruleset in rules.absolute:
+        if not isinstance(ruleset, VesIgnoreRules):
+            ruleset = VesIgnoreRules(ruleset)
+        if ruleset.match_dir(path):
+            return True
+    return False
+
+
+def has_negations(rules: VesIgnore) -> bool:
+    """
+    Check whether any rule set contains a negation ("!pattern") rule.
+
+    Without negations, a file below an ignored directory can never be
+    re-included, so callers may skip ignored directories entirely.
+
+    Args:
+        rules: VesIgnore object containing all ignore rules
+
+    Returns:
+        True if at least one rule un-ignores paths, False otherwise
+    """
+    rule_sets = list(rules.absolute) + list(rules.scoped.values())
+    return any(not value for ruleset in rule_sets for _, value in ruleset)
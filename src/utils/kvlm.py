@@ -31,39 +31,42 @@ def kvlm_parse(raw: bytes, start: int = 0, dct: Optional[dict] = None) -> dict:
     if not dct:
         dct = dict()
 
-    spc = raw.find(b" ", start)
-    nl = raw.find(b"\n", start)
-
-    # Base case: if newline comes before space (or there's no space),
-    # the rest of the content is the final message
-    if (spc < 0) or (nl < spc):
-        assert nl == start
-        dct[None] = raw[start + 1 :]
-        return dct
-
-    # Recursive case: extract a key-value pair
-    key = raw[start:spc]
-
-    # Find the end of the value handling continuation lines
-    end = start
+    # One iteration per header line; a loop rather than recursion, so that
+    # objects with many headers (e.g. merge parents) cost no stack frames
     while True:
-        end = raw.find(b"\n", end + 1)
-        if raw[end + 1] != ord(" "):
-            break
-
-    # Extract the value removing leading spaces from continuation lines
-    value = raw[spc + 1 : end].replace(b"\n ", b"\n")
-
-    # Handle duplicate keys by creating lists
-    if key in dct:
-        if type(dct[key]) == list:
-            dct[key].append(value)
+        spc = raw.find(b" ", start)
+        nl = raw.find(b"\n", start)
+
+        # Base case: if newline comes before space (or there's no space),
+        # the rest of the content is the final message
+        if (spc < 0) or (nl < spc):
+            assert nl == start
+            dct[None] = raw[start + 1 :]
+            return dct
+
+        # Extract a key-value pair
+        key = raw[start:spc]
+
+        # Find the end of the value handling continuation lines
+        end = start
+        while True:
+            end = raw.find(b"\n", end + 1)
+            if raw[end + 1] != ord(" "):
+                break
+
+        # Extract the value removing leading spaces from continuation lines
+        value = raw[spc + 1 : end].replace(b"\n ", b"\n")
+
+        # Handle duplicate keys by creating lists
+        if key in dct:
+            if type(dct[key]) == list:
+                dct[key].append(value)
+            else:
+                dct[key] = [dct[key], value]
         else:
-            dct[key] = [dct[key], value]
-    else:
-        dct[key] = value
+            dct[key] = value
 
-    return kvlm_parse(raw, start=end + 1, dct=dct)
+        start = end + 1
 
 
 def kvlm_serialize(kvlm: dict) -> bytes:
@@ -96,7 +99,8 @@ def kvlm_serialize(kvlm: dict) -> bytes:
         b'author John Doe\ncommitter Jane Smith\n\nCommit message'
     """
 
-    ret = b""
+    # Collect the pieces and join once: repeated bytes += is quadratic
+    parts: list[bytes] = []
 
     for k in kvlm.keys():
         # Skip the message itself
@@ -108,14 +112,16 @@ def kvlm_serialize(kvlm: dict) -> bytes:
             val = [val]
 
         for v in val:
-            # Add spaces after newlines for continuation lines
-            ret += k + b" " + (v.replace(b"\n", b"\n ")) + b"\n"
+            # Add spaces after newlines for continuation lines; most values
+            # are single-line, so skip the copy when there is nothing to replace
+            if b"\n" in v:
+                v = v.replace(b"\n", b"\n ")
+            parts.append(k + b" " + v + b"\n")
 
     # Append blank line and message
+    parts.append(b"\n")
     message = kvlm.get(None, b"")
     if isinstance(message, bytes):
-        ret += b"\n" + message
-    else:
-        ret += b"\n"
+        parts.append(message)
 
-    return ret
+    return b"".join(parts)
@@ -1,15 +1,28 @@
+import hashlib
+import io
+import mmap
 import os
+import time
 from collections import defaultdict
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
 
-from src.core.index import VesIndex
+from src.core.index import VesIndex, index_write_if_unchanged
 from src.core.objects import object_hash
 from src.core.repository import VesRepository
-from src.utils.ignore import VesIgnore, check_ignore, vesignore_read
+from src.utils.ignore import (
+    VesIgnore,
+    check_ignore,
+    check_ignore_dir,
+    has_negations,
+    vesignore_read,
+)
 from src.utils.tree import tree_to_dict
 
 
-def _optimize_untracked_display(untracked_files: List[str]) -> List[str]:
+def _optimize_untracked_display(
+    untracked_files: List[str], worktree_files: Iterable[str]
+) -> List[str]:
     """
     Optimize the display of untracked files by showing directory names
     instead of individual files when an entire directory is untracked.
@@ -19,6 +32,9 @@ def _optimize_untracked_display(untracked_files: List[str]) -> List[str]:
 
     Args:
         untracked_files: List of untracked file paths
+        worktree_files: Every file path in the worktree that is not
+            ignored, as collected by _walk_worktree; used instead of walking
+            each directory again
 
     Returns:
         List of optimized entries to display (files or directories)
@@ -30,41 +46,113 @@ def _optimize_untracked_display(untracked_files: List[str]) -> List[str]:
     dirs_to_files = defaultdict(list)
     files_only = []
 
+    sep = os.sep
     for file_path in untracked_files:
-        if os.path.sep in file_path:
-            dir_name = file_path.split(os.path.sep)[0]
+        dir_name, found, _ = file_path.partition(sep)
+        if found:
             dirs_to_files[dir_name].append(file_path)
         else:
             files_only.append(file_path)
 
+    # Bucket every worktree file under its top-level directory in one pass
+    dirs_to_all = defaultdict(set)
+    for file_path in worktree_files:
+        dir_name, found, _ = file_path.partition(sep)
+        if found and dir_name in dirs_to_files:
+            dirs_to_all[dir_name].add(file_path)
+
     result = []
 
     result.extend(files_only)
 
-    # For each directory, check if we should show the directory or individual files
+    # A directory is shown as a whole only if all of its files are untracked
     for dir_name, files_in_dir in dirs_to_files.items():
-        dir_path = dir_name
-        all_files_in_dir_untracked = True
-
-        if os.path.exists(dir_path) and os.path.isdir(dir_path):
-            for root, _, files in os.walk(dir_path):
-                for f in files:
-                    full_path = os.path.join(root, f)
-                    rel_path = os.path.relpath(full_path, ".")
-                    if rel_path not in untracked_set:
-                        all_files_in_dir_untracked = False
-                        break
-                if not all_files_in_dir_untracked:
-                    break
-
-        if all_files_in_dir_untracked and len(files_in_dir) > 0:
-            result.append(dir_name + os.path.sep)
+        if dirs_to_all[dir_name] <= untracked_set:
+            result.append(dir_name + sep)
         else:
             result.extend(files_in_dir)
 
     return sorted(result)
 
 
+# Files modified within this window of a status run are always re-hashed
+# next time: a change in the same timestamp tick would otherwise go unseen
+RACY_WINDOW_NS = 10**9
+
+# Below this many candidates a thread pool costs more to start than it saves
+PARALLEL_HASH_THRESHOLD = 16
+
+
+def _hash_worktree_file(dir_entry: os.DirEntry) -> str:
+    """
+    Compute the blob SHA of a worktree file or symlink without writing it.
+
+    Regular files are memory-mapped and fed to SHA-1 after the blob header,
+    so the kernel streams pages straight into the hash with no intermediate
+    buffer. hashlib releases the GIL while hashing large buffers, which lets
+    several files be hashed at once from a thread pool.
+
+    Args:
+        dir_entry: The DirEntry of the file, as returned by _walk_worktree
+
+    Returns:
+        The SHA-1 the file would have as a blob object
+    """
+    if dir_entry.is_symlink():
+        link_target = os.readlink(dir_entry.path)
+        return object_hash(io.BytesIO(link_target.encode()), b"blob", None)
+
+    fd = os.open(dir_entry.path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        h = hashlib.sha1(b"blob " + str(size).encode() + b"\x00")
+        # Empty files cannot be mapped
+        if size > 0:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+    finally:
+        os.close(fd)
+
+    return h.hexdigest()
+
+
+def _walk_worktree(
+    repo: VesRepository, skip_dir: Optional[Callable[[str], bool]] = None
+) -> Dict[str, os.DirEntry]:
+    """
+    Collect every file and symlink in the working tree, skipping .ves.
+
+    The walk uses os.scandir directly and keeps the DirEntry objects, so
+    callers can reuse their cached type and stat information instead of
+    issuing new exists/stat/islink calls per file.
+
+    Args:
+        repo: The VesRepository whose worktree should be walked
+        skip_dir: Optional predicate on a directory path relative to the
+            worktree; directories it accepts are not descended into
+
+    Returns:
+        Dictionary mapping paths relative to the worktree to their DirEntry
+    """
+    files: Dict[str, os.DirEntry] = dict()
+    prefix_len = len(repo.worktree) + 1
+    stack = [repo.worktree]
+
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.path == repo.vesdir:
+                        continue
+                    if skip_dir is not None and skip_dir(entry.path[prefix_len:]):
+                        continue
+                    stack.append(entry.path)
+                else:
+                    files[entry.path[prefix_len:]] = entry
+
+    return files
+
+
 def cmd_status_head_index(repo: VesRepository, index: VesIndex) -> None:
     """
     Display changes between HEAD and the index (staged changes).
@@ -87,14 +175,15 @@ def cmd_status_head_index(repo: VesRepository, index: VesIndex) -> None:
     head = tree_to_dict(repo, "HEAD")
 
     for entry in index.entries:
-        if entry.name in head:
-            if head[entry.name] != entry.sha:
-                print("  modified:", entry.name)
-            del head[entry.name]  # Delete the key
-        else:
+        head_sha = head.get(entry.name)
+        if head_sha is None:
             print("  added:   ", entry.name)
+        elif head_sha != entry.sha:
+            print("  modified:", entry.name)
 
-    for file_path in head.keys():
+    # Whatever HEAD has that the index lacks was deleted
+    index_names = {entry.name for entry in index.entries}
+    for file_path in sorted(head.keys() - index_names):
         print("  deleted: ", file_path)
 
 
@@ -122,56 +211,103 @@ def cmd_status_index_worktree(repo: VesRepository, index: VesIndex) -> None:
     ignore = vesignore_read(repo)
     assert isinstance(ignore, VesIgnore)
 
-    vesdir_prefix = repo.vesdir + os.path.sep
+    # Skip directories ignored by a directory rule while walking. This is
+    # only safe when nothing inside them can matter: no tracked files, and
+    # no negation rule that could re-include one of their files.
+    skip_dir: Optional[Callable[[str], bool]] = None
+    if not has_negations(ignore):
+        tracked_dirs = set()
+        for entry in index.entries:
+            parent = entry.name.rpartition(os.sep)[0]
+            while parent and parent not in tracked_dirs:
+                tracked_dirs.add(parent)
+                parent = parent.rpartition(os.sep)[0]
 
-    all_files: List[str] = list()
+        def skip_ignored_dir(path: str) -> bool:
+            return path not in tracked_dirs and check_ignore_dir(ignore, path)
 
-    for root, _, files in os.walk(repo.worktree, True):
-        if root == repo.vesdir or root.startswith(vesdir_prefix):
-            continue
-        for f in files:
-            full_path = os.path.join(root, f)
-            rel_path = os.path.relpath(full_path, repo.worktree)
-            all_files.append(rel_path)
+        skip_dir = skip_ignored_dir
 
-    for entry in index.entries:
-        full_path = os.path.join(repo.worktree, entry.name)
+    worktree_files = _walk_worktree(repo, skip_dir)
 
-        if not os.path.exists(full_path):
-            print("  deleted: ", entry.name)
-        else:
-            stat = os.stat(full_path)
-
-            # Compare metadata
-            ctime_ns = entry.ctime[0] * 10**9 + entry.ctime[1]
-            mtime_ns = entry.mtime[0] * 10**9 + entry.mtime[1]
-            if (stat.st_ctime_ns != ctime_ns) or (stat.st_mtime_ns != mtime_ns):
-                # If different, deep compare.
-                if os.path.islink(full_path):
-                    link_target = os.readlink(full_path)
-                    import io
-
-                    new_sha = object_hash(
-                        io.BytesIO(link_target.encode()), b"blob", None
-                    )
-                else:
-                    with open(full_path, "rb") as fd:
-                        new_sha = object_hash(fd, b"blob", None)
+    # Files changed later than this are too recent to cache as clean
+    racy_after_ns = time.time_ns() - RACY_WINDOW_NS
+
+    # Entries whose size changed are modified without reading them; entries
+    # whose times changed need a content comparison
+    modified = set()
+    candidates = []
 
-                # If the hashes are the same, the files are actually the same.
-                same = entry.sha == new_sha
+    for entry in index.entries:
+        dir_entry = worktree_files.get(entry.name)
+        if dir_entry is None:
+            continue
 
-                if not same:
-                    print("  modified:", entry.name)
+        # lstat, like add: a symlink is compared by its own metadata
+        stat = dir_entry.stat(follow_symlinks=False)
+
+        # Compare metadata
+        ctime_ns = entry.ctime[0] * 10**9 + entry.ctime[1]
+        mtime_ns = entry.mtime[0] * 10**9 + entry.mtime[1]
+        if (stat.st_ctime_ns != ctime_ns) or (stat.st_mtime_ns != mtime_ns):
+            if stat.st_size != entry.fsize:
+                modified.add(entry.name)
+            else:
+                candidates.append((entry, dir_entry, stat))
+
+    # If different, deep compare. Hashing is independent per file, so larger
+    # batches are spread over a thread pool.
+    dir_entries = [dir_entry for _, dir_entry, _ in candidates]
+    if len(candidates) <= PARALLEL_HASH_THRESHOLD:
+        new_shas = [_hash_worktree_file(d) for d in dir_entries]
+    else:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            new_shas = list(executor.map(_hash_worktree_file, dir_entries))
+
+    # If the hashes are the same, the files are actually the same: record
+    # their new times in the index so the next status skips the hash.
+    refreshed = False
+    for (entry, _, stat), new_sha in zip(candidates, new_shas):
+        if entry.sha != new_sha:
+            modified.add(entry.name)
+        elif stat.st_mtime_ns < racy_after_ns and stat.st_ctime_ns < racy_after_ns:
+            entry.ctime = divmod(stat.st_ctime_ns, 10**9)
+            entry.mtime = divmod(stat.st_mtime_ns, 10**9)
+            refreshed = True
+
+    # Refreshing is only an optimization: it is dropped whenever another
+    # command may have written the index since it was read, including a
+    # write within the same tick as the stamp, which the stamp cannot show
+    if refreshed and index.stamp is not None and index.stamp[0] < racy_after_ns:
+        try:
+            index_write_if_unchanged(repo, index)
+        except OSError:
+            # Status still works on a read-only repository
+            pass
 
-        if entry.name in all_files:
-            all_files.remove(entry.name)
+    for entry in index.entries:
+        if entry.name not in worktree_files:
+            print("  deleted: ", entry.name)
+        elif entry.name in modified:
+            print("  modified:", entry.name)
 
     print()
     print("Untracked files:")
 
-    untracked_files = [f for f in all_files if not check_ignore(ignore, f)]
-    displayed_entries = _optimize_untracked_display(untracked_files)
+    indexed_names = {entry.name for entry in index.entries}
+    untracked_files = []
+    ignored_files = set()
+    for f in sorted(worktree_files.keys() - indexed_names):
+        if check_ignore(ignore, f):
+            ignored_files.add(f)
+        else:
+            untracked_files.append(f)
+
+    # Ignored files must not keep a directory from collapsing, whether or
+    # not the walk pruned them
+    displayed_entries = _optimize_untracked_display(
+        untracked_files, worktree_files.keys() - ignored_files
+    )
 
     for file_entry in displayed_entries:
         print(" ", file_entry)
@@ -1,10 +1,37 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from types import TracebackType
 from typing import Optional
 
 from src.core.index import VesIndex, index_read, index_write
 from src.core.repository import VesRepository
 
+# Below this many files a thread pool costs more to start than it saves
+PARALLEL_UNLINK_THRESHOLD = 16
+
+
+def unlink_paths(paths: list[str]) -> None:
+    """
+    Delete files from the filesystem, in parallel for large batches.
+
+    Each unlink is an independent syscall, so bulk removals are spread over
+    a thread pool. Small batches are deleted serially.
+
+    Args:
+        paths: Absolute paths of the files to delete
+
+    Raises:
+        OSError: If any file cannot be deleted
+    """
+    if len(paths) <= PARALLEL_UNLINK_THRESHOLD:
+        for path in paths:
+            os.unlink(path)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+        # Consume the results so the first failure is raised here
+        list(executor.map(os.unlink, paths))
+
 
 def rm_in_memory(
     index: VesIndex,
@@ -27,12 +54,14 @@ def rm_in_memory(
         skip_missing: If True, ignore paths not found in index
     """
     worktree = repo.worktree + os.sep
+    wt_len = len(worktree)
 
-    abspaths = set()
+    # Key targets by their worktree-relative name, matching index entry names
+    targets: dict[str, str] = dict()
     for path in paths:
         abspath = os.path.abspath(path)
         if abspath.startswith(worktree):
-            abspaths.add(abspath)
+            targets[abspath[wt_len:]] = abspath
         else:
             raise Exception(f"Cannot remove paths outside of worktree: {paths}")
 
@@ -41,20 +70,19 @@ def rm_in_memory(
 
     # Filter entries: keep those not being removed
     for e in index.entries:
-        full_path = os.path.join(repo.worktree, e.name)
-
-        if full_path in abspaths:
-            remove.append(full_path)
-            abspaths.remove(full_path)
+        target = targets.pop(e.name, None)
+        if target is not None:
+            remove.append(target)
         else:
             kept_entries.append(e)
 
-    if len(abspaths) > 0 and not skip_missing:
-        raise Exception(f"Cannot remove paths not in the index: {abspaths}")
+    if len(targets) > 0 and not skip_missing:
+        raise Exception(
+            f"Cannot remove paths not in the index: {set(targets.values())}"
+        )
 
     if delete:
-        for path in remove:
-            os.unlink(path)
+        unlink_paths(remove)
 
     index.entries = kept_entries
 
@@ -1,5 +1,10 @@
 import os
-from typing import TYPE_CHECKING
+import re
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import chain, repeat
+from typing import TYPE_CHECKING, Iterable, Optional
 
 from src.core.index import VesIndex, VesIndexEntry
 from src.core.repository import VesRepository
@@ -22,12 +27,19 @@ class VesTreeLeaf(object):
         sha (str): SHA-1 hash of the referenced object (40 hex characters)
     """
 
+    # One leaf per tree entry: slots keep large trees compact
+    __slots__ = ("mode", "path", "sha")
+
     def __init__(self, mode: bytes, path: str, sha: str) -> None:
         self.mode = mode
         self.path = path
         self.sha = sha
 
 
+# One tree entry: "{mode} {path}\0" followed by the 20-byte binary SHA
+TREE_ENTRY = re.compile(rb"(\d{5,6}) ([^\x00]*)\x00(.{20})", re.DOTALL)
+
+
 def tree_parse_one(raw: bytes, start: int = 0) -> tuple[int, VesTreeLeaf]:
     """
     Parse a single entry from a Ves tree object's binary data.
@@ -59,10 +71,45 @@ def tree_parse_one(raw: bytes, start: int = 0) -> tuple[int, VesTreeLeaf]:
     path = raw[space_terminator + 1 : null_terminator]
 
     # Extract 20-byte SHA and convert to hex string
-    raw_sha = int.from_bytes(raw[null_terminator + 1 : null_terminator + 21], "big")
-    sha = format(raw_sha, "040x")
+    sha = raw[null_terminator + 1 : null_terminator + 21].hex()
+
+    # Intern SHAs and names: the same entries repeat across every tree
+    # version read during a walk, so share one string object per value
+    return null_terminator + 21, VesTreeLeaf(
+        mode, sys.intern(path.decode("utf8")), sys.intern(sha)
+    )
+
+
+def tree_parse_columns(raw: bytes) -> tuple[list[bytes], list[str], list[str]]:
+    """
+    Parse a complete Ves tree object into parallel lists of fields.
+
+    This is the column form of tree_parse(): entry i is (modes[i], paths[i],
+    shas[i]). Callers that only read the fields, like tree_flatten(), use it
+    directly and skip building one VesTreeLeaf per entry.
+
+    Args:
+        raw (bytes): Complete raw binary data of the tree object
+
+    Returns:
+        tuple[list[bytes], list[str], list[str]]: Modes padded to 6 digits,
+            interned paths and interned hex SHAs, in tree order
 
-    return null_terminator + 21, VesTreeLeaf(mode, path.decode("utf8"), sha)
+    Raises:
+        AssertionError: If the data is not a sequence of well-formed entries
+    """
+    intern = sys.intern
+    entries = TREE_ENTRY.findall(raw)
+
+    # findall skips what it cannot match: the matches tile the whole buffer
+    # only if every entry was well formed
+    size = sum(len(mode) + len(path) for mode, path, _ in entries)
+    assert size + 22 * len(entries) == len(raw)
+
+    modes = [mode if len(mode) == 6 else b"0" + mode for mode, _, _ in entries]
+    paths = [intern(path.decode("utf8")) for _, path, _ in entries]
+    shas = [intern(sha.hex()) for _, _, sha in entries]
+    return modes, paths, shas
 
 
 def tree_parse(raw: bytes) -> list[VesTreeLeaf]:
@@ -83,21 +130,23 @@ def tree_parse(raw: bytes) -> list[VesTreeLeaf]:
     Note:
         Tree entries are sorted by Ves in a specific order for consistency.
         This function preserves the original order from the binary data.
-    """
-    pos = 0
-    max = len(raw)
-    ret = list()
-
-    while pos < max:
-        pos, data = tree_parse_one(raw, pos)
-        ret.append(data)
+        Entry boundaries are found by a single regex scan in C; Python only
+        builds the leaves.
 
-    return ret
+    Raises:
+        AssertionError: If the data is not a sequence of well-formed entries
+    """
+    return list(map(VesTreeLeaf, *tree_parse_columns(raw)))
 
 
 def tree_leaf_sort_key(leaf: VesTreeLeaf) -> str:
     """
     Generate a sorting key for a VesTreeLeaf.
+
+    Directories sort as if their name ended in "/", so "foo" lands after
+    "foo.c" but before "foo0". A (path, is_dir) tuple would put "foo" first.
+    sort() computes the key once per leaf, so the concatenation is not
+    repeated per comparison.
     """
     if leaf.mode.startswith(b"10"):
         return leaf.path
@@ -106,51 +155,236 @@ def tree_leaf_sort_key(leaf: VesTreeLeaf) -> str:
 
 
 def tree_serialize(obj: "VesTree") -> bytes:
+    """
+    Serialize a VesTree into its binary form, sorting its items in place.
+
+    The sort key is computed once per leaf and only directory keys allocate
+    a new string; each tree is serialized once per object_write(), so keys
+    are not cached on the leaves.
+
+    Args:
+        obj (VesTree): The tree to serialize
+
+    Returns:
+        bytes: Concatenated "{mode} {path}\0{20-byte-sha}" entries
+    """
     obj.items.sort(key=tree_leaf_sort_key)
-    ret = b""
-    for i in obj.items:
-        ret += i.mode
-        ret += b" "
-        ret += i.path.encode("utf8")
-        ret += b"\x00"
-        sha = int(i.sha, 16)
-        ret += sha.to_bytes(20, byteorder="big")
-    return ret
+    # Format each entry in one step and join once: repeated bytes += is
+    # quadratic, and one piece per entry keeps the list short
+    fromhex = bytes.fromhex
+    return b"".join(
+        [
+            b"%s %s\x00%s" % (i.mode, i.path.encode("utf8"), fromhex(i.sha))
+            for i in obj.items
+        ]
+    )
+
+
+# Blob writes are independent I/O, so checkout overlaps them on a thread pool
+CHECKOUT_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+# Files smaller than this are handed to the pool in batches, so that one
+# task (and one future) covers several creates instead of just one
+CHECKOUT_SMALL_BLOB = 4096
+CHECKOUT_BATCH_SIZE = 16
+# Blobs are read this many at a time, just before their writes are submitted
+CHECKOUT_READ_BATCH = 64
+# Submitting blocks while this many bytes are waiting to be written, so a
+# slow disk does not leave the whole tree decompressed in the pool's queue
+CHECKOUT_MAX_PENDING_BYTES = 64 * 1024 * 1024
+
+
+def _write_blob(dest: str, data: memoryview) -> None:
+    # Raw fd write, no fsync or temp-file rename: the content is addressed by
+    # its SHA, so a file cut short by a crash shows up as modified in status
+    # and is fixed by checking it out again
+    fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        while data:
+            # Keep the write out of the slice expression: compiled with
+            # mypyc, that form called os.write twice per chunk
+            written = os.write(fd, data)
+            data = data[written:]
+    finally:
+        os.close(fd)
+
+
+def _write_blobs(batch: list[tuple[str, memoryview]]) -> None:
+    for dest, data in batch:
+        _write_blob(dest, data)
+
+
+class _CheckoutWriter(object):
+    """
+    Submits blob writes to a thread pool, capping the bytes still in flight.
+    """
+
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor,
+        max_pending_bytes: int = CHECKOUT_MAX_PENDING_BYTES,
+    ) -> None:
+        self.executor = executor
+        self.max_pending_bytes = max_pending_bytes
+        self.pending: dict[Future[None], int] = {}
+        self.pending_bytes = 0
+
+    def submit(self, batch: list[tuple[str, memoryview]]) -> None:
+        size = sum(len(data) for _, data in batch)
+        # A single write larger than the cap still goes through once the
+        # pool has drained
+        while self.pending and self.pending_bytes + size > self.max_pending_bytes:
+            done, _ = wait(self.pending, return_when=FIRST_COMPLETED)
+            self._collect(done)
+
+        if len(batch) == 1:
+            future = self.executor.submit(_write_blob, *batch[0])
+        else:
+            future = self.executor.submit(_write_blobs, batch)
+        self.pending[future] = size
+        self.pending_bytes += size
+
+    def finish(self) -> None:
+        self._collect(wait(self.pending).done)
+
+    def _collect(self, done: Iterable[Future[None]]) -> None:
+        for future in done:
+            self.pending_bytes -= self.pending.pop(future)
+            # Surface the first failed write
+            future.result()
+
+
+@dataclass
+class VesCheckoutPerfData:
+    """
+    Filesystem calls made by one tree_checkout().
+
+    Attributes:
+        mkdir_calls: Directories created
+        scandir_calls: Existing directories listed to find what is already there
+        write_calls: Regular files written
+        symlink_calls: Symbolic links created
+    """
 
+    mkdir_calls: int = 0
+    scandir_calls: int = 0
+    write_calls: int = 0
+    symlink_calls: int = 0
 
-def tree_checkout(repo: VesRepository, tree: "VesTree", path: str) -> None:
+
+def tree_checkout(
+    repo: VesRepository, tree: "VesTree", path: str
+) -> VesCheckoutPerfData:
     """
     Recursively checks out the contents of a VesTree object to the specified filesystem path.
     For each item in the tree:
-    - If the item is a tree, creates a corresponding directory and recursively checks out its contents.
+    - If the item is a tree, creates a corresponding directory (unless it already exists) and recursively checks out its contents.
     - If the item is a blob, writes its data to a file at the destination path.
     - Raises an exception if an object cannot be read.
+    Directories are created and objects are read in tree order; file writes
+    are handed to a thread pool and all complete before this returns.
+    Only directories that existed before the checkout are listed; ones this
+    call creates are known to be empty.
     Args:
         repo (VesRepository): The repository from which to read objects.
         tree (VesTree): The tree object representing the directory structure to check out.
         path (str): The filesystem path where the tree should be checked out.
+    Returns:
+        VesCheckoutPerfData: Counts of the filesystem calls that were made.
     Raises:
         Exception: If an object cannot be read from the repository.
+        OSError: If a file cannot be written.
     """
-    from src.core.objects import VesBlob, VesTree, object_read
+    perf = VesCheckoutPerfData()
+    with ThreadPoolExecutor(max_workers=CHECKOUT_WORKERS) as executor:
+        writer = _CheckoutWriter(executor)
+        _tree_checkout(repo, tree, path, True, writer, perf)
+        writer.finish()
+
+    return perf
+
+
+def _tree_checkout(
+    repo: VesRepository,
+    tree: "VesTree",
+    path: str,
+    existed: bool,
+    writer: _CheckoutWriter,
+    perf: VesCheckoutPerfData,
+) -> None:
+    from src.core.objects import VesTree, object_read_many
+
+    existing: set[str] = set()
+    if existed:
+        with os.scandir(path) as it:
+            existing = {e.name for e in it if e.is_dir()}
+        perf.scandir_calls += 1
+
+    # Subtrees are small and read up front; blobs are read in batches as
+    # they are written, and never held across the recursion
+    subtree_shas = [item.sha for item in tree.items if item.mode.startswith(b"04")]
+    subtrees = iter(object_read_many(repo, subtree_shas))
+    blobs: list[VesTreeLeaf] = []
 
     for item in tree.items:
-        obj = object_read(repo, item.sha)
+        # Mode format: (04=tree, 10=blob, 12=symlink)
+        if not item.mode.startswith(b"04"):
+            blobs.append(item)
+            if len(blobs) == CHECKOUT_READ_BATCH:
+                _checkout_blobs(repo, blobs, path, writer, perf)
+                blobs = []
+            continue
+
+        _checkout_blobs(repo, blobs, path, writer, perf)
+        blobs = []
+
+        obj = next(subtrees)
         if obj is None:
             raise Exception(f"Failed to read object {item.sha}")
+        assert isinstance(obj, VesTree)
         dest = os.path.join(path, item.path)
-
-        if obj.format_type == b"tree":
-            assert isinstance(obj, VesTree)
+        subdir_existed = item.path in existing
+        if not subdir_existed:
             os.mkdir(dest)
-            tree_checkout(repo, obj, dest)
-        elif obj.format_type == b"blob":
-            assert isinstance(obj, VesBlob)
-            if item.mode.startswith(b"12"):
-                os.symlink(obj.blobdata.decode("utf8"), dest)
-            else:
-                with open(dest, "wb") as f:
-                    f.write(obj.blobdata)
+            perf.mkdir_calls += 1
+        _tree_checkout(repo, obj, dest, subdir_existed, writer, perf)
+
+    _checkout_blobs(repo, blobs, path, writer, perf)
+
+
+def _checkout_blobs(
+    repo: VesRepository,
+    items: list[VesTreeLeaf],
+    path: str,
+    writer: _CheckoutWriter,
+    perf: VesCheckoutPerfData,
+) -> None:
+    from src.core.objects import VesBlob, object_read_many
+
+    small: list[tuple[str, memoryview]] = []
+
+    for item, obj in zip(items, object_read_many(repo, [item.sha for item in items])):
+        if obj is None:
+            raise Exception(f"Failed to read object {item.sha}")
+        assert isinstance(obj, VesBlob)
+        dest = os.path.join(path, item.path)
+
+        if item.mode.startswith(b"12"):
+            os.symlink(obj.blobdata.decode("utf8"), dest)
+            perf.symlink_calls += 1
+            continue
+
+        data = obj.view
+        if len(data) >= CHECKOUT_SMALL_BLOB:
+            writer.submit([(dest, data)])
+        else:
+            small.append((dest, data))
+            if len(small) == CHECKOUT_BATCH_SIZE:
+                writer.submit(small)
+                small = []
+        perf.write_calls += 1
+
+    if small:
+        writer.submit(small)
 
 
 def tree_to_dict(repo: VesRepository, ref: str, prefix: str = "") -> dict[str, str]:
@@ -168,7 +402,7 @@ def tree_to_dict(repo: VesRepository, ref: str, prefix: str = "") -> dict[str, s
     Args:
         repo: The VesRepository instance to read objects from
         ref: Reference to the tree object (SHA hash, branch name, or tag)
-        prefix: Path prefix for nested calls (used internally for recursion)
+        prefix: Path prefix prepended to every returned path
 
     Returns:
         A dictionary mapping file paths to their SHA hashes. Returns empty
@@ -177,28 +411,169 @@ def tree_to_dict(repo: VesRepository, ref: str, prefix: str = "") -> dict[str, s
     Note:
         This function is useful for comparing tree states, as it flattens
         the hierarchical tree structure into a simple path->hash mapping.
+        Flattened trees are cached on the repository by SHA (see
+        tree_flatten), so subtrees shared between commits are read once.
     """
-    from src.core.objects import VesTree, object_find, object_read
+    from src.core.objects import object_find
 
-    ret: dict[str, str] = dict()
     tree_sha = object_find(repo, ref, fmt=b"tree")
     if tree_sha is None:
-        return ret
-    tree = object_read(repo, tree_sha)
-    if tree is None:
-        return ret
+        return dict()
 
-    assert isinstance(tree, VesTree)
-    for leaf in tree.items:
-        full_path = os.path.join(prefix, leaf.path)
+    flat = tree_flatten(repo, tree_sha)
+    if not prefix:
+        return dict(flat)
 
-        # Mode format: (04=tree, 10=blob, 12=symlink)
-        is_subtree = leaf.mode.startswith(b"04")
+    base = prefix + os.sep
+    return {base + path: sha for path, sha in flat.items()}
+
+
+# Trees reading at least this many uncached subtrees at one depth read them
+# on a thread pool: file reads and zlib release the GIL
+PARALLEL_TREE_READ_THRESHOLD = 16
+TREE_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Flattened trees kept per repository; the least recently used are dropped
+# first, so walking a long history does not keep every tree in memory
+TREE_DICT_CACHE_SIZE = 4096
+
+TreeColumns = tuple[list[bytes], list[str], list[str]]
+
+
+def _tree_dict_get(repo: VesRepository, tree_sha: str) -> Optional[dict[str, str]]:
+    cached = repo._tree_dicts.get(tree_sha)
+    if cached is not None:
+        repo._tree_dicts.move_to_end(tree_sha)
+    return cached
+
+
+def _tree_dict_put(repo: VesRepository, tree_sha: str, flat: dict[str, str]) -> None:
+    repo._tree_dicts[tree_sha] = flat
+    if len(repo._tree_dicts) > TREE_DICT_CACHE_SIZE:
+        repo._tree_dicts.popitem(last=False)
+
+
+def tree_flatten(repo: VesRepository, tree_sha: str) -> dict[str, str]:
+    """
+    Flatten a tree object into a path -> blob SHA mapping, with caching.
+
+    Trees are content-addressed, so the flattened form of a SHA never
+    changes and needs no invalidation. The repository keeps the last
+    TREE_DICT_CACHE_SIZE flattened trees in an LRU cache. The returned
+    dictionary is shared: do not modify it.
 
-        if is_subtree:
-            ret.update(tree_to_dict(repo, leaf.sha, full_path))
+    Uncached subtrees are read one depth at a time, in parallel once a depth
+    has PARALLEL_TREE_READ_THRESHOLD of them, then flattened bottom-up.
+
+    Args:
+        repo: The VesRepository instance to read objects from
+        tree_sha: Full SHA-1 hash of a tree object
+
+    Returns:
+        A dictionary mapping paths relative to the tree to their SHA hashes,
+        empty if the tree cannot be read
+    """
+    cached = _tree_dict_get(repo, tree_sha)
+    if cached is not None:
+        return cached
+
+    trees, flat = _tree_read_uncached(repo, tree_sha)
+    return _tree_flatten(repo, tree_sha, trees, flat)
+
+
+def _tree_read_columns(repo: VesRepository, tree_sha: str) -> Optional[TreeColumns]:
+    from src.core.objects import _object_read_raw
+
+    raw = _object_read_raw(repo, tree_sha)
+    if raw is None:
+        return None
+
+    fmt, content = raw
+    assert fmt == b"tree"
+    return tree_parse_columns(content.tobytes())
+
+
+def _tree_read_batch(
+    repo: VesRepository, shas: list[str]
+) -> list[Optional[TreeColumns]]:
+    return [_tree_read_columns(repo, sha) for sha in shas]
+
+
+def _tree_read_uncached(
+    repo: VesRepository, tree_sha: str
+) -> tuple[dict[str, Optional[TreeColumns]], dict[str, dict[str, str]]]:
+    from src.core.packfile import packs_load
+
+    # Load packs before any worker does, so they race on nothing
+    packs_load(repo)
+
+    trees: dict[str, Optional[TreeColumns]] = dict()
+    # Cached subtrees are held here, as the LRU may drop them before use
+    flat: dict[str, dict[str, str]] = dict()
+    level = [tree_sha]
+
+    with ThreadPoolExecutor(max_workers=TREE_READ_WORKERS) as executor:
+        while level:
+            read: Iterable[Optional[TreeColumns]]
+            if len(level) >= PARALLEL_TREE_READ_THRESHOLD:
+                # One task per worker, not per tree, keeps handoffs few
+                step = -(-len(level) // TREE_READ_WORKERS)
+                batches = [level[i : i + step] for i in range(0, len(level), step)]
+                read = chain.from_iterable(
+                    executor.map(_tree_read_batch, repeat(repo), batches)
+                )
+            else:
+                read = _tree_read_batch(repo, level)
+
+            next_level: list[str] = []
+            for sha, columns in zip(level, read):
+                trees[sha] = columns
+                if columns is None:
+                    continue
+                # Mode format: (04=tree, 10=blob, 12=symlink)
+                for mode, sub_sha in zip(columns[0], columns[2]):
+                    if (
+                        not mode.startswith(b"04")
+                        or sub_sha in trees
+                        or sub_sha in flat
+                    ):
+                        continue
+                    cached = _tree_dict_get(repo, sub_sha)
+                    if cached is not None:
+                        flat[sub_sha] = cached
+                    else:
+                        trees[sub_sha] = None
+                        next_level.append(sub_sha)
+            level = next_level
+
+    return trees, flat
+
+
+def _tree_flatten(
+    repo: VesRepository,
+    tree_sha: str,
+    trees: dict[str, Optional[TreeColumns]],
+    flat: dict[str, dict[str, str]],
+) -> dict[str, str]:
+    done = flat.get(tree_sha)
+    if done is not None:
+        return done
+
+    ret: dict[str, str] = dict()
+    columns = trees.get(tree_sha)
+    if columns is None:
+        return ret
+
+    for mode, name, sha in zip(*columns):
+        if mode.startswith(b"04"):
+            base = name + os.sep
+            for path, blob_sha in _tree_flatten(repo, sha, trees, flat).items():
+                ret[base + path] = blob_sha
         else:
-            ret[full_path] = leaf.sha
+            ret[name] = sha
+
+    flat[tree_sha] = ret
+    _tree_dict_put(repo, tree_sha, ret)
     return ret
 
 
@@ -234,21 +609,24 @@ def tree_from_index(repo: VesRepository, index: VesIndex) -> str:
         This function is typically called during commit creation to capture
         the current staged state as a tree structure.
     """
-    from src.core.objects import VesTree, object_write
+    from src.core.objects import VesTree, object_encode, object_write_many
 
+    sep = os.sep
     contents: dict[str, list] = dict()
     contents[""] = list()
 
-    # Group entries by directory path
+    # Group entries by directory path. Index names are normalized relative
+    # paths, so rpartition splits them without going through os.path.
     for entry in index.entries:
-        dirname = os.path.dirname(entry.name)
+        dirname = entry.name.rpartition(sep)[0]
 
-        # Create all directory entries up to root
+        # Create all directory entries up to root, stopping at the first
+        # one already known: its ancestors were added with it, so each
+        # directory is split once and most entries do a single lookup
         key = dirname
-        while key != "":
-            if not key in contents:
-                contents[key] = list()
-            key = os.path.dirname(key)
+        while key != "" and key not in contents:
+            contents[key] = list()
+            key = key.rpartition(sep)[0]
 
         contents[dirname].append(entry)
 
@@ -256,6 +634,11 @@ def tree_from_index(repo: VesRepository, index: VesIndex) -> str:
     sorted_paths = sorted(contents.keys(), key=len, reverse=True)
 
     sha = None
+    # Parents only need their children's SHAs, so trees are hashed as they
+    # are built and written together at the end
+    encoded: list[tuple[str, bytes]] = list()
+    # Only a handful of (type, perms) pairs occur: format each one once
+    leaf_modes: dict[tuple[int, int], bytes] = dict()
 
     for path in sorted_paths:
         tree = VesTree()
@@ -264,11 +647,13 @@ def tree_from_index(repo: VesRepository, index: VesIndex) -> str:
         for entry in contents[path]:
             if isinstance(entry, VesIndexEntry):
                 # Handle regular file entry
-                leaf_mode = f"{entry.mode_type:02o}{entry.mode_perms:04o}".encode(
-                    "ascii"
-                )
+                mode_key = (entry.mode_type, entry.mode_perms)
+                leaf_mode = leaf_modes.get(mode_key)
+                if leaf_mode is None:
+                    leaf_mode = f"{mode_key[0]:02o}{mode_key[1]:04o}".encode("ascii")
+                    leaf_modes[mode_key] = leaf_mode
                 leaf = VesTreeLeaf(
-                    mode=leaf_mode, path=os.path.basename(entry.name), sha=entry.sha
+                    mode=leaf_mode, path=entry.name.rpartition(sep)[2], sha=entry.sha
                 )
             else:
                 # Handle subdirectory (stored as (basename, SHA) tuple)
@@ -276,15 +661,16 @@ def tree_from_index(repo: VesRepository, index: VesIndex) -> str:
 
             tree.items.append(leaf)
 
-        # Write tree object and get its SHA
-        sha = object_write(tree, repo)
+        # Hash tree object and queue it for writing
+        sha, result = object_encode(tree)
+        encoded.append((sha, result))
 
         # Add tree to parent directory
-        parent = os.path.dirname(path)
-        base = os.path.basename(path)
+        parent, _, base = path.rpartition(sep)
         contents[parent].append((base, sha))
 
     if sha is None:
         raise ValueError("Failed to create tree: no entries processed")
 
+    object_write_many(repo, encoded)
     return sha
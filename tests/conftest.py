@@ -1,9 +1,45 @@
 import os
 import shutil
+import sys
 import tempfile
+from argparse import Namespace
+from pathlib import Path
 
 import pytest
 
+from src.commands.init import cmd_init
+from src.core.repository import repo_find
+
+# Test repositories live in RAM when a large enough tmpfs is available
+SHM_DIR = "/dev/shm"
+SHM_MIN_FREE = 1 << 30
+
+
+def _ram_tempdir():
+    """
+    Return the directory test files should be created in, or None for the default.
+
+    VES_TEST_TMPDIR, when set, always wins. Otherwise /dev/shm is used on Linux
+    if it has at least SHM_MIN_FREE bytes available, so that the stress tests
+    still fit; Docker's default 64 MiB /dev/shm is skipped.
+    """
+    override = os.environ.get("VES_TEST_TMPDIR")
+    if override:
+        return override
+    if not sys.platform.startswith("linux") or not os.access(SHM_DIR, os.W_OK):
+        return None
+    stat = os.statvfs(SHM_DIR)
+    if stat.f_bavail * stat.f_frsize < SHM_MIN_FREE:
+        return None
+    return SHM_DIR
+
+
+def pytest_configure(config):
+    """Point tempfile, and with it tmp_path and temp_dir, at the RAM tempdir."""
+    ram_dir = _ram_tempdir()
+    if ram_dir is not None:
+        tempfile.tempdir = ram_dir
+
 
 @pytest.fixture
 def temp_dir():
@@ -19,3 +55,76 @@ def clean_env():
     original_dir = os.getcwd()
     yield
     os.chdir(original_dir)
+
+
+@pytest.fixture(scope="session")
+def _template_repo(tmp_path_factory):
+    """
+    Initialize a repository once per session for repo_path to copy.
+
+    Under pytest-xdist every worker process runs its own session, so each one
+    initializes a private template and nothing is shared between processes.
+    """
+    path = tmp_path_factory.mktemp("template") / "test_repo"
+    cmd_init(Namespace(path=str(path)))
+    return path
+
+
+@pytest.fixture
+def repo_path(temp_dir, _template_repo):
+    """
+    Provide a freshly initialized repository.
+
+    The working directory is left alone; tests pass the repository explicitly,
+    or as cwd to the cmd_* wrappers.
+    """
+    path = Path(temp_dir) / "test_repo"
+    shutil.copytree(_template_repo, path, symlinks=True)
+    return path
+
+
+@pytest.fixture
+def repo(repo_path):
+    """Provide the repository object for repo_path, found once per test."""
+    found = repo_find(str(repo_path))
+    assert found is not None
+    return found
+
+
+# Canonical file contents shared by tests through place_blob
+BLOB_FILES = {
+    "empty.txt": b"",
+    "hello.txt": b"Hello, World!",
+    "binary.bin": bytes(range(256)),
+}
+
+
+@pytest.fixture(scope="session")
+def blob_files(tmp_path_factory):
+    """Write every canonical test file once per session."""
+    base = tmp_path_factory.mktemp("blobs")
+    paths = dict()
+    for name, content in BLOB_FILES.items():
+        paths[name] = base / name
+        paths[name].write_bytes(content)
+    return paths
+
+
+@pytest.fixture
+def place_blob(blob_files):
+    """
+    Place a canonical test file at dest.
+
+    The file is hard-linked rather than rewritten, falling back to a copy on
+    filesystems without hard links. Tests must not modify placed files, since
+    a link shares its content with every other test.
+    """
+
+    def place(name, dest):
+        try:
+            os.link(blob_files[name], dest)
+        except OSError:
+            shutil.copyfile(blob_files[name], dest)
+        return Path(dest)
+
+    return place
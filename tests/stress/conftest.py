@@ -0,0 +1,17 @@
+import shutil
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def stress_root(tmp_path_factory):
+    """
+    Provide one directory shared by the whole stress session.
+
+    Each test works in its own subdirectory and removes it when it ends; the
+    root itself, and anything a failed teardown left, goes at the end of the
+    session.
+    """
+    root = tmp_path_factory.mktemp("stress")
+    yield root
+    shutil.rmtree(root, ignore_errors=True)
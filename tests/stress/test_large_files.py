@@ -6,9 +6,10 @@ from 1MB to 100MB, testing operations like add, commit, status, and checkout.
 """
 
 import io
+import os
 import shutil
-import tempfile
 import time
+from argparse import Namespace
 from contextlib import redirect_stderr, redirect_stdout
 from datetime import datetime
 from pathlib import Path
@@ -23,38 +24,43 @@ from src.core.index import index_read
 from src.core.repository import VesRepository, repo_create
 from src.utils.config import vesconfig_read, vesconfig_user_get
 from src.utils.tree import tree_from_index
-from tests.stress.test_utils import cleanup_test_files, create_large_file
+from tests.stress.test_utils import (
+    cleanup_test_files,
+    create_large_file,
+    create_sparse_file,
+)
+
+# cmd_status takes no options; one shared instance serves every call
+STATUS_ARGS = Namespace()
 
 
 @pytest.mark.stress
 class TestLargeFiles:
     """Test performance with large files."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def repo_env(self, request, stress_root):
         """Set up test environment for each test."""
-        self.test_dir = Path(tempfile.mkdtemp())
+        # A fresh subdirectory of the session root, removed as soon as the
+        # test ends: the tempdir may be in RAM, so the session must not
+        # accumulate every test's repository
+        self.test_dir = stress_root / f"{type(self).__name__}-{request.node.name}"
         self.repo_dir = self.test_dir / "test_repo"
-        self.repo_dir.mkdir()
+        self.repo_dir.mkdir(parents=True)
 
         # Initialize repository
         self.repo = repo_create(str(self.repo_dir))
 
         # Change to repo directory for commands
         self.original_cwd = Path.cwd()
-        import os
-
         os.chdir(self.repo_dir)
 
         self.created_files = []
 
-    def teardown_method(self):
-        """Clean up after each test."""
-        import os
+        yield
 
         os.chdir(self.original_cwd)
-
-        if self.test_dir.exists():
-            shutil.rmtree(self.test_dir)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
 
     def measure_operation_time(self, operation_func, *args, **kwargs) -> Dict[str, Any]:
         """
@@ -63,11 +69,12 @@ class TestLargeFiles:
         Returns:
             Dictionary with timing information
         """
-        start_time = time.time()
-        # Capture and suppress output from the operation
+        # Capture and suppress output from the operation; only the call
+        # itself is timed, on the monotonic high-resolution clock
         with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            start_time = time.perf_counter()
             result = operation_func(*args, **kwargs)
-        end_time = time.time()
+            end_time = time.perf_counter()
 
         return {"result": result, "execution_time": end_time - start_time}
 
@@ -86,10 +93,8 @@ class TestLargeFiles:
 
         # Verify file was added to index
         index = index_read(self.repo)
-        assert any(
-            entry.name == str(large_file.relative_to(self.repo_dir))
-            for entry in index.entries
-        )
+        index_names = {entry.name for entry in index.entries}
+        assert str(large_file.relative_to(self.repo_dir)) in index_names
 
         # Performance assertions (adjust thresholds as needed)
         if file_size_mb <= 10:
@@ -159,8 +164,9 @@ class TestLargeFiles:
 
         # Verify all files were added
         index = index_read(self.repo)
+        index_names = {entry.name for entry in index.entries}
         for file_path in files_to_add:
-            assert any(entry.name == file_path for entry in index.entries)
+            assert file_path in index_names
 
         # Performance assertions
         assert (
@@ -169,16 +175,21 @@ class TestLargeFiles:
 
     def test_status_with_large_files(self):
         """Test status command performance with large files in repo."""
-        # Create several large files
+        # Create several large files. Status finds them unchanged from their
+        # size and times alone, so sparse files stand in for real content
         file_sizes = [1, 2, 5]
+        files_to_add = []
         for size in file_sizes:
             large_file = self.repo_dir / f"status_test_{size}mb.txt"
-            create_large_file(large_file, size)
+            create_sparse_file(large_file, size)
             self.created_files.append(large_file)
-            add(self.repo, [str(large_file.relative_to(self.repo_dir))])
+            files_to_add.append(str(large_file.relative_to(self.repo_dir)))
+
+        # One index update for all of them
+        add(self.repo, files_to_add)
 
         # Measure status operation
-        metrics = self.measure_operation_time(cmd_status, type("Args", (), {})())
+        metrics = self.measure_operation_time(cmd_status, STATUS_ARGS)
 
         # Status should be relatively fast even with large files
         assert (
@@ -6,9 +6,10 @@ testing operations like add, commit, and status with hundreds or thousands of fi
 """
 
 import io
+import os
 import shutil
-import tempfile
 import time
+from argparse import Namespace
 from contextlib import redirect_stderr, redirect_stdout
 from datetime import datetime
 from pathlib import Path
@@ -26,38 +27,40 @@ from tests.stress.test_utils import (
     create_binary_files,
     create_deep_directory_structure,
     create_many_small_files,
+    paths_relative_to,
 )
 
+# cmd_status takes no options; one shared instance serves every call
+STATUS_ARGS = Namespace()
+
 
 @pytest.mark.stress
 class TestManyFiles:
     """Test performance with many files."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def repo_env(self, request, stress_root):
         """Set up test environment for each test."""
-        self.test_dir = Path(tempfile.mkdtemp())
+        # A fresh subdirectory of the session root, removed as soon as the
+        # test ends: the tempdir may be in RAM, so the session must not
+        # accumulate every test's repository
+        self.test_dir = stress_root / f"{type(self).__name__}-{request.node.name}"
         self.repo_dir = self.test_dir / "test_repo"
-        self.repo_dir.mkdir()
+        self.repo_dir.mkdir(parents=True)
 
         # Initialize repository
         self.repo = repo_create(str(self.repo_dir))
 
         # Change to repo directory for commands
         self.original_cwd = Path.cwd()
-        import os
-
         os.chdir(self.repo_dir)
 
         self.created_files = []
 
-    def teardown_method(self):
-        """Clean up after each test."""
-        import os
+        yield
 
         os.chdir(self.original_cwd)
-
-        if self.test_dir.exists():
-            shutil.rmtree(self.test_dir)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
 
     def measure_operation_time(self, operation_func, *args, **kwargs) -> Dict[str, Any]:
         """
@@ -66,11 +69,12 @@ class TestManyFiles:
         Returns:
             Dictionary with timing information
         """
-        start_time = time.time()
-        # Capture and suppress output from the operation
+        # Capture and suppress output from the operation; only the call
+        # itself is timed, on the monotonic high-resolution clock
         with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            start_time = time.perf_counter()
             result = operation_func(*args, **kwargs)
-        end_time = time.time()
+            end_time = time.perf_counter()
 
         return {"result": result, "execution_time": end_time - start_time}
 
@@ -83,7 +87,7 @@ class TestManyFiles:
         self.created_files.extend(created_files)
 
         # Get relative paths for adding
-        relative_paths = [str(f.relative_to(self.repo_dir)) for f in created_files]
+        relative_paths = paths_relative_to(self.repo_dir, created_files)
 
         # Measure add operation
         metrics = self.measure_operation_time(add, self.repo, relative_paths)
@@ -113,7 +117,7 @@ class TestManyFiles:
         created_files = create_many_small_files(files_dir, num_files, 512)
         self.created_files.extend(created_files)
 
-        relative_paths = [str(f.relative_to(self.repo_dir)) for f in created_files]
+        relative_paths = paths_relative_to(self.repo_dir, created_files)
         add(self.repo, relative_paths)
 
         # Measure commit operation
@@ -157,7 +161,7 @@ class TestManyFiles:
         )
         self.created_files.extend(created_files)
 
-        relative_paths = [str(f.relative_to(self.repo_dir)) for f in created_files]
+        relative_paths = paths_relative_to(self.repo_dir, created_files)
 
         # Measure add operation
         metrics = self.measure_operation_time(add, self.repo, relative_paths)
@@ -181,7 +185,7 @@ class TestManyFiles:
         created_files = create_binary_files(binary_dir, num_files)
         self.created_files.extend(created_files)
 
-        relative_paths = [str(f.relative_to(self.repo_dir)) for f in created_files]
+        relative_paths = paths_relative_to(self.repo_dir, created_files)
 
         # Measure add operation
         metrics = self.measure_operation_time(add, self.repo, relative_paths)
@@ -210,7 +214,7 @@ class TestManyFiles:
             created_files = create_many_small_files(batch_dir, batch_size, 512)
             self.created_files.extend(created_files)
 
-            relative_paths = [str(f.relative_to(self.repo_dir)) for f in created_files]
+            relative_paths = paths_relative_to(self.repo_dir, created_files)
 
             # Measure add operation
             metrics = self.measure_operation_time(add, self.repo, relative_paths)
@@ -243,11 +247,11 @@ class TestManyFiles:
         created_files = create_many_small_files(files_dir, num_files, 256)
         self.created_files.extend(created_files)
 
-        relative_paths = [str(f.relative_to(self.repo_dir)) for f in created_files]
+        relative_paths = paths_relative_to(self.repo_dir, created_files)
         add(self.repo, relative_paths)
 
         # Measure status operation
-        metrics = self.measure_operation_time(cmd_status, type("Args", (), {})())
+        metrics = self.measure_operation_time(cmd_status, STATUS_ARGS)
 
         # Status should be reasonably fast
         assert (
@@ -264,7 +268,7 @@ class TestManyFiles:
         all_files = small_files + medium_files + binary_files
         self.created_files.extend(all_files)
 
-        relative_paths = [str(f.relative_to(self.repo_dir)) for f in all_files]
+        relative_paths = paths_relative_to(self.repo_dir, all_files)
 
         # Measure combined operations
         add_metrics = self.measure_operation_time(add, self.repo, relative_paths)
@@ -306,7 +310,7 @@ class TestManyFiles:
         batch_size = 100
         for i in range(0, len(base_files), batch_size):
             batch = base_files[i : i + batch_size]
-            relative_paths = [str(f.relative_to(self.repo_dir)) for f in batch]
+            relative_paths = paths_relative_to(self.repo_dir, batch)
             add(self.repo, relative_paths)
 
         # Verify large index
@@ -315,7 +319,7 @@ class TestManyFiles:
         # Now test batch performance with this large index
         test_files = create_many_small_files(self.repo_dir / "new_batch", 150, 256)
         self.created_files.extend(test_files)
-        test_relative = [str(f.relative_to(self.repo_dir)) for f in test_files]
+        test_relative = paths_relative_to(self.repo_dir, test_files)
 
         # Measure batch operation performance
         metrics = self.measure_operation_time(add, self.repo, test_relative)
@@ -346,14 +350,14 @@ class TestManyFiles:
         # Start with moderately large repository
         initial_files = create_many_small_files(self.repo_dir / "initial", 300, 512)
         self.created_files.extend(initial_files)
-        initial_relative = [str(f.relative_to(self.repo_dir)) for f in initial_files]
+        initial_relative = paths_relative_to(self.repo_dir, initial_files)
 
         # Add initial files
         add(self.repo, initial_relative)
 
         # Perform 5 sequential batch operations
         batch_results = []
-        total_start = time.time()
+        total_start = time.perf_counter()
 
         for batch_num in range(5):
 
@@ -362,7 +366,7 @@ class TestManyFiles:
                 self.repo_dir / f"batch_{batch_num}", 80, 256
             )
             self.created_files.extend(batch_files)
-            batch_relative = [str(f.relative_to(self.repo_dir)) for f in batch_files]
+            batch_relative = paths_relative_to(self.repo_dir, batch_files)
 
             # Measure this batch operation
             batch_metrics = self.measure_operation_time(add, self.repo, batch_relative)
@@ -377,7 +381,7 @@ class TestManyFiles:
                 }
             )
 
-        total_time = time.time() - total_start
+        total_time = time.perf_counter() - total_start
         total_files = sum(r["files"] for r in batch_results)
         avg_throughput = total_files / total_time
 
@@ -6,9 +6,10 @@ that can be used to update documentation with current performance metrics.
 """
 
 import io
+import os
 import shutil
-import tempfile
 import time
+from argparse import Namespace
 from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
 from typing import Any, Dict
@@ -18,49 +19,53 @@ import pytest
 from src.commands.add import add
 from src.commands.status import cmd_status
 from src.core.repository import repo_create
-from tests.stress.test_utils import create_large_file, create_many_small_files
+from tests.stress.test_utils import (
+    create_large_file,
+    create_many_small_files,
+    paths_relative_to,
+)
+
+# cmd_status takes no options; one shared instance serves every call
+STATUS_ARGS = Namespace()
 
 
 @pytest.mark.stress
 class TestPerformanceSummary:
     """Final performance summary for Vestigium VCS."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def repo_env(self, request, stress_root):
         """Set up test environment."""
-        self.test_dir = Path(tempfile.mkdtemp())
+        # A fresh subdirectory of the session root, removed as soon as the
+        # test ends: the tempdir may be in RAM, so the session must not
+        # accumulate every test's repository
+        self.test_dir = stress_root / f"{type(self).__name__}-{request.node.name}"
         self.repo_dir = self.test_dir / "test_repo"
-        self.repo_dir.mkdir()
+        self.repo_dir.mkdir(parents=True)
 
         # Initialize repository
         self.repo = repo_create(str(self.repo_dir))
 
         # Change to repo directory for commands
         self.original_cwd = Path.cwd()
-        import os
-
         os.chdir(self.repo_dir)
 
         self.created_files = []
         self.performance_data = []
 
-    def teardown_method(self):
-        """Clean up after each test."""
-        import os
+        yield
 
         os.chdir(self.original_cwd)
-
-        if self.test_dir.exists():
-            shutil.rmtree(self.test_dir)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
 
     def measure_operation_time(self, operation_func, *args, **kwargs) -> Dict[str, Any]:
         """Measure the execution time of an operation with output suppressed."""
-        start_time = time.time()
-
-        # Capture and suppress output from the operation
+        # Capture and suppress output from the operation; only the call
+        # itself is timed, on the monotonic high-resolution clock
         with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            start_time = time.perf_counter()
             result = operation_func(*args, **kwargs)
-
-        end_time = time.time()
+            end_time = time.perf_counter()
 
         return {"result": result, "execution_time": end_time - start_time}
 
@@ -94,7 +99,7 @@ class TestPerformanceSummary:
             created_files = create_many_small_files(files_dir, num_files, 1024)
             self.created_files.extend(created_files)
 
-            relative_paths = [str(f.relative_to(self.repo_dir)) for f in created_files]
+            relative_paths = paths_relative_to(self.repo_dir, created_files)
 
             metrics = self.measure_operation_time(add, self.repo, relative_paths)
 
@@ -108,7 +113,7 @@ class TestPerformanceSummary:
             )
 
         # Test 3: Status performance
-        status_metrics = self.measure_operation_time(cmd_status, type("Args", (), {})())
+        status_metrics = self.measure_operation_time(cmd_status, STATUS_ARGS)
         status_ops_per_sec = 1 / status_metrics["execution_time"]
 
         print("\n" + "=" * 60)
@@ -6,39 +6,45 @@ for performance testing, including large files and numerous small files.
 """
 
 import os
-import random
 import string
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List
 
+# Maps every byte value onto a printable character (or whitespace), so
+# random bytes can be turned into text in a single C-level translate()
+_TEXT_CHARS = (string.ascii_letters + string.digits + "\n\t ").encode("ascii")
+TEXT_TABLE = bytes(_TEXT_CHARS[b % len(_TEXT_CHARS)] for b in range(256))
+
 
 def generate_random_content(size_bytes: int) -> bytes:
     """
-    Generate random binary content of specified size.
+    Generate random text content of specified size.
 
     Args:
         size_bytes: Size of content to generate in bytes
 
     Returns:
-        Random binary content
+        Random letters, digits and whitespace, as bytes
     """
-    # Use a mix of text and binary data for realistic testing
-    chunk_size = 1024
-    content = bytearray()
+    # Use text rather than raw binary data for realistic testing
+    return os.urandom(size_bytes).translate(TEXT_TABLE)
 
-    while len(content) < size_bytes:
-        remaining = size_bytes - len(content)
-        current_chunk_size = min(chunk_size, remaining)
 
-        # Generate random text content
-        text_chunk = "".join(
-            random.choices(
-                string.ascii_letters + string.digits + "\n\t ", k=current_chunk_size
-            )
-        )
-        content.extend(text_chunk.encode("utf-8")[:current_chunk_size])
+def write_small_file(filepath: Path, content: bytes) -> None:
+    """
+    Write a small file in one unbuffered write.
 
-    return bytes(content[:size_bytes])
+    Args:
+        filepath: Path of the file to create or truncate
+        content: Bytes to write
+    """
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, content)
+    finally:
+        os.close(fd)
 
 
 def create_large_file(filepath: Path, size_mb: int) -> None:
@@ -52,9 +58,34 @@ def create_large_file(filepath: Path, size_mb: int) -> None:
     size_bytes = size_mb * 1024 * 1024
     filepath.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(filepath, "wb") as f:
-        content = generate_random_content(size_bytes)
-        f.write(content)
+    # Stream one megabyte at a time, unbuffered: memory stays flat whatever
+    # the file size. Reserving the blocks up front avoids growing the file
+    # extent by extent.
+    with open(filepath, "wb", buffering=0) as f:
+        if size_bytes and hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(f.fileno(), 0, size_bytes)
+        for _ in range(size_mb):
+            f.write(generate_random_content(1024 * 1024))
+
+
+def create_sparse_file(filepath: Path, size_mb: int) -> None:
+    """
+    Create a large file of zero bytes without writing its content.
+
+    Only for tests that need the size but never hash the content: zeros
+    compress far faster than real data and would skew add/commit timings.
+
+    Args:
+        filepath: Path where to create the file
+        size_mb: Size of the file in megabytes
+    """
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, size_mb * 1024 * 1024)
+    finally:
+        os.close(fd)
 
 
 def create_many_small_files(
@@ -72,22 +103,26 @@ def create_many_small_files(
         List of created file paths
     """
     base_dir.mkdir(parents=True, exist_ok=True)
-    created_files = []
 
-    for i in range(num_files):
-        # Create subdirectories to simulate real project structure
-        subdir = base_dir / f"dir_{i // 10}"
+    # Create subdirectories to simulate real project structure, up front so
+    # the file writes below are independent of each other
+    subdirs = [base_dir / f"dir_{d}" for d in range((num_files + 9) // 10)]
+    for subdir in subdirs:
         subdir.mkdir(exist_ok=True)
 
-        filepath = subdir / f"file_{i:05d}.txt"
-        content = generate_random_content(size_bytes)
-
-        with open(filepath, "wb") as f:
-            f.write(content)
+    # One random body for all files; a per-file header keeps every file
+    # distinct, so content-addressed storage still sees num_files blobs
+    payload = generate_random_content(size_bytes)
 
-        created_files.append(filepath)
+    def write_file(i: int) -> Path:
+        filepath = subdirs[i // 10] / f"file_{i:05d}.txt"
+        header = b"%08d\n" % i
+        write_small_file(filepath, (header + payload[len(header) :])[:size_bytes])
+        return filepath
 
-    return created_files
+    # File creation is syscall-bound and releases the GIL, so overlap it
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+        return list(pool.map(write_file, range(num_files)))
 
 
 def create_deep_directory_structure(
@@ -107,23 +142,29 @@ def create_deep_directory_structure(
     base_dir.mkdir(parents=True, exist_ok=True)
     created_files = []
 
-    def create_level(current_dir: Path, remaining_depth: int, level_index: int):
-        # Create files at current level
-        for i in range(files_per_level):
-            filepath = current_dir / f"level_{level_index}_file_{i}.txt"
-            content = generate_random_content(512)  # Small files
-            with open(filepath, "wb") as f:
-                f.write(content)
-            created_files.append(filepath)
-
-        # Create subdirectories and recurse
-        if remaining_depth > 0:
-            for i in range(2):  # Create 2 subdirs per level
-                subdir = current_dir / f"subdir_{i}"
-                subdir.mkdir(exist_ok=True)
-                create_level(subdir, remaining_depth - 1, level_index + 1)
-
-    create_level(base_dir, depth, 0)
+    def write_file(filepath: Path) -> None:
+        write_small_file(filepath, generate_random_content(512))  # Small files
+
+    # Walk the levels breadth first: a level's directories only need their
+    # parents, so each level is created in one batch on the pool
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+        level = [base_dir]
+        for level_index in range(depth + 1):
+            # Create files at current level
+            for current_dir in level:
+                for i in range(files_per_level):
+                    created_files.append(
+                        current_dir / f"level_{level_index}_file_{i}.txt"
+                    )
+
+            # Create 2 subdirs per directory for the next level
+            if level_index == depth:
+                break
+            level = [d / f"subdir_{i}" for d in level for i in range(2)]
+            list(pool.map(lambda d: d.mkdir(exist_ok=True), level))
+
+        list(pool.map(write_file, created_files))
+
     return created_files
 
 
@@ -141,30 +182,51 @@ def create_binary_files(base_dir: Path, num_files: int) -> List[Path]:
     base_dir.mkdir(parents=True, exist_ok=True)
     created_files = []
 
+    # Build each kind of content once; files differ by a 4-byte index header
+    compressible = b"A" * 100 + b"B" * 96 + b"C" * 100
+    random_binary = os.urandom(296)
+    binary_part = os.urandom(200)
+
     for i in range(num_files):
         filepath = base_dir / f"binary_{i:03d}.bin"
 
         # Create different types of binary content
         if i % 3 == 0:
             # Highly compressible content (repeated patterns)
-            content = b"A" * 100 + b"B" * 100 + b"C" * 100
+            content = struct.pack("<I", i) + compressible
         elif i % 3 == 1:
             # Random binary content
-            content = bytes([random.randint(0, 255) for _ in range(300)])
+            content = struct.pack("<I", i) + random_binary
         else:
             # Mixed content
             text_part = f"File {i} header\n".encode()
-            binary_part = bytes([random.randint(0, 255) for _ in range(200)])
             content = text_part + binary_part
 
-        with open(filepath, "wb") as f:
-            f.write(content)
+        write_small_file(filepath, content)
 
         created_files.append(filepath)
 
     return created_files
 
 
+def paths_relative_to(base_dir: Path, filepaths: List[Path]) -> List[str]:
+    """
+    Convert file paths under base_dir into relative path strings.
+
+    Every path is known to live under base_dir, so the prefix is sliced off
+    the string instead of comparing parts one by one as relative_to() does.
+
+    Args:
+        base_dir: Directory the paths are relative to
+        filepaths: Paths of files inside base_dir
+
+    Returns:
+        List of relative paths, in the same order
+    """
+    n = len(str(base_dir)) + len(os.sep)
+    return [str(f)[n:] for f in filepaths]
+
+
 def cleanup_test_files(filepaths: List[Path]) -> None:
     """
     Clean up test files and empty directories.
@@ -175,16 +237,18 @@ def cleanup_test_files(filepaths: List[Path]) -> None:
     directories_to_check = set()
 
     for filepath in filepaths:
-        if filepath.exists():
-            directories_to_check.add(filepath.parent)
-            filepath.unlink()
+        try:
+            os.unlink(filepath)
+        except FileNotFoundError:
+            continue
+        directories_to_check.add(filepath.parent)
 
-    # Remove empty directories
+    # Remove empty directories, deepest first: rmdir itself refuses to remove
+    # a non-empty directory, so there is no need to list it beforehand
     for directory in sorted(
         directories_to_check, key=lambda p: len(p.parts), reverse=True
     ):
         try:
-            if directory.exists() and not any(directory.iterdir()):
-                directory.rmdir()
+            os.rmdir(directory)
         except OSError:
             pass  # Directory not empty or can't be removed
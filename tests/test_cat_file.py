@@ -1,3 +1,4 @@
+import hashlib
 import os
 from argparse import Namespace
 from pathlib import Path
@@ -6,184 +7,152 @@ import pytest
 
 from src.commands.cat_file import cmd_cat_file
 from src.commands.hash_object import cmd_hash_object
-from src.commands.init import cmd_init
-from src.core.objects import VesBlob, object_read, object_write
-from src.core.repository import repo_find
+from src.core.objects import (
+    VesBlob,
+    object_peek,
+    object_read_many,
+    object_write,
+)
+from src.core.repository import repo_create
+
+# Blobs shared by the read-only cat-file tests through cat_file_repo
+CAT_FILE_BLOBS = {
+    "empty": b"",
+    "binary": bytes(range(256)),  # All possible byte values
+    "large": b"A" * 10000,  # 10KB should be enough for testing
+    "hello": b"test content",
+}
+
+
+@pytest.fixture(scope="module")
+def cat_file_repo(tmp_path_factory):
+    """Create one repository holding CAT_FILE_BLOBS for the whole module."""
+    repo = repo_create(str(tmp_path_factory.mktemp("cat_file") / "test_repo"))
+    hashes = {
+        name: object_write(VesBlob(data=data), repo)
+        for name, data in CAT_FILE_BLOBS.items()
+    }
+    return repo, hashes
 
 
 class TestCatFileCommand:
     """Test cases for the cat-file command."""
 
-    def test_cat_file_basic_functionality(self, temp_dir, clean_env, capsys):
-        """Test that cat-file command runs without crashing."""
-        os.chdir(temp_dir)
-
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
-
-        os.chdir(repo_path)
-        repo = repo_find()
-        assert repo is not None
-
+    def test_cat_file_basic_functionality(self, repo, capsysbinary):
+        """Test that cat-file prints the content of a blob."""
         test_content = b"Hello, World!\nThis is a test file.\n"
         blob = VesBlob(data=test_content)
         obj_hash = object_write(blob, repo)
 
-        # Test cat-file command - should not crash
-        args = Namespace(object=obj_hash, type="blob")
+        args = Namespace(object=obj_hash, type="blob", cwd=repo.worktree)
         cmd_cat_file(args)
 
-        # Verify the object exists and can be read back
-        obj = object_read(repo, obj_hash)
-        assert obj is not None
-        assert obj.serialize() == test_content
+        assert capsysbinary.readouterr().out == test_content
 
-    def test_cat_file_object_not_found(self, temp_dir, clean_env, capsys):
+    def test_cat_file_object_not_found(self, repo_path, capsys):
         """Test that cat-file handles non-existent objects gracefully."""
-        os.chdir(temp_dir)
-
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
-
-        os.chdir(repo_path)
-
         fake_hash = "a" * 40  # Valid format but non-existent
-        args = Namespace(object=fake_hash, type="blob")
+        args = Namespace(object=fake_hash, type="blob", cwd=str(repo_path))
 
         with pytest.raises(Exception, match=f"No such reference {fake_hash}."):
             cmd_cat_file(args)
 
-    def test_cat_file_outside_repository(self, temp_dir, clean_env, capsys):
+    def test_cat_file_outside_repository(self, temp_dir, capsys):
         """Test that cat-file fails gracefully outside a repository."""
-        os.chdir(temp_dir)
-
         fake_hash = "a" * 40
-        args = Namespace(object=fake_hash, type="blob")
+        args = Namespace(object=fake_hash, type="blob", cwd=temp_dir)
 
         with pytest.raises(Exception, match="No ves directory."):
             cmd_cat_file(args)
 
-    def test_cat_file_with_hash_object_integration(self, temp_dir, clean_env, capsys):
+    def test_cat_file_with_hash_object_integration(self, repo_path, repo, capsysbinary):
         """Test integration between hash-object and cat-file commands."""
-        os.chdir(temp_dir)
-
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
-
-        os.chdir(repo_path)
-
         test_file = repo_path / "integration_test.txt"
         test_content = b"Integration test content\nSecond line\n"
         test_file.write_bytes(test_content)
 
-        hash_args = Namespace(path=str(test_file), type="blob", write=True)
+        hash_args = Namespace(
+            path=str(test_file), type="blob", write=True, cwd=repo.worktree
+        )
         cmd_hash_object(hash_args)
 
-        captured = capsys.readouterr()
-        obj_hash = captured.out.strip()
+        captured = capsysbinary.readouterr()
+        obj_hash = captured.out.decode().strip()
 
         assert len(obj_hash) == 40
         assert all(c in "0123456789abcdef" for c in obj_hash.lower())
 
-        cat_args = Namespace(object=obj_hash, type="blob")
+        cat_args = Namespace(object=obj_hash, type="blob", cwd=repo.worktree)
         cmd_cat_file(cat_args)
 
-        repo = repo_find()
-        assert repo is not None
-        obj = object_read(repo, obj_hash)
-        assert obj is not None
-        assert obj.serialize() == test_content
+        assert capsysbinary.readouterr().out == test_content
 
-    def test_cat_file_empty_blob(self, temp_dir, clean_env):
-        """Test cat-file with empty blob content."""
-        os.chdir(temp_dir)
+    def test_blob_hashes_match_git(self, cat_file_repo):
+        """Test that written blobs are stored under their Git SHA-1."""
+        repo, hashes = cat_file_repo
 
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
+        for name, data in CAT_FILE_BLOBS.items():
+            expected = hashlib.sha1(b"blob %d\x00" % len(data) + data).hexdigest()
+            assert hashes[name] == expected
+            assert (
+                Path(repo.vesdir) / "objects" / expected[:2] / expected[2:]
+            ).exists()
 
-        os.chdir(repo_path)
-        repo = repo_find()
-        assert repo is not None
+        # The well-known hash of the empty blob
+        assert hashes["empty"] == "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
 
-        empty_blob = VesBlob(data=b"")
-        empty_hash = object_write(empty_blob, repo)
+    def test_cat_file_empty_blob(self, cat_file_repo, capsysbinary):
+        """Test cat-file with empty blob content."""
+        repo, hashes = cat_file_repo
 
-        args = Namespace(object=empty_hash, type="blob")
+        args = Namespace(object=hashes["empty"], type="blob", cwd=repo.worktree)
         cmd_cat_file(args)
 
-        obj = object_read(repo, empty_hash)
-        assert obj is not None
-        assert obj.serialize() == b""
+        assert capsysbinary.readouterr().out == b""
 
-    def test_cat_file_binary_content(self, temp_dir, clean_env):
+    def test_cat_file_binary_content(self, cat_file_repo, capsysbinary):
         """Test cat-file with binary blob content."""
-        os.chdir(temp_dir)
-
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
-
-        os.chdir(repo_path)
-        repo = repo_find()
-        assert repo is not None
+        repo, hashes = cat_file_repo
 
-        binary_content = bytes(range(256))  # All possible byte values
-        binary_blob = VesBlob(data=binary_content)
-        binary_hash = object_write(binary_blob, repo)
-
-        args = Namespace(object=binary_hash, type="blob")
+        args = Namespace(object=hashes["binary"], type="blob", cwd=repo.worktree)
         cmd_cat_file(args)
 
-        obj = object_read(repo, binary_hash)
-        assert obj is not None
-        assert obj.serialize() == binary_content
+        assert capsysbinary.readouterr().out == CAT_FILE_BLOBS["binary"]
 
-    def test_cat_file_large_blob(self, temp_dir, clean_env):
+    def test_cat_file_large_blob(self, cat_file_repo, capsysbinary):
         """Test cat-file with large blob content."""
-        os.chdir(temp_dir)
+        repo, hashes = cat_file_repo
 
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
+        args = Namespace(object=hashes["large"], type="blob", cwd=repo.worktree)
+        cmd_cat_file(args)
 
-        os.chdir(repo_path)
-        repo = repo_find()
-        assert repo is not None
+        assert capsysbinary.readouterr().out == CAT_FILE_BLOBS["large"]
 
-        # Create large blob (smaller size for testing)
-        large_content = b"A" * 10000  # 10KB should be enough for testing
-        large_blob = VesBlob(data=large_content)
-        large_hash = object_write(large_blob, repo)
+    @pytest.mark.parametrize("obj_type", ["blob", "tree", "commit", "tag"])
+    def test_cat_file_different_types_accepted(self, cat_file_repo, obj_type):
+        """Test that cat-file accepts different object type parameters."""
+        repo, hashes = cat_file_repo
 
-        args = Namespace(object=large_hash, type="blob")
+        # Any type specification should work for a blob object
+        args = Namespace(object=hashes["hello"], type=obj_type, cwd=repo.worktree)
         cmd_cat_file(args)
 
-        obj = object_read(repo, large_hash)
-        assert obj is not None
-        assert obj.serialize() == large_content
+    def test_object_peek_reads_header_only(self, repo):
+        """Test that object_peek returns the type and size of an object."""
+        large_content = os.urandom(100_000)
+        obj_hash = object_write(VesBlob(data=large_content), repo)
 
-    def test_cat_file_different_types_accepted(self, temp_dir, clean_env):
-        """Test that cat-file accepts different object type parameters."""
-        os.chdir(temp_dir)
+        assert object_peek(repo, obj_hash) == (b"blob", len(large_content))
+        assert object_peek(repo, "a" * 40) is None
 
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
+    def test_object_read_many_preserves_order(self, repo):
+        """Test that object_read_many returns objects in request order."""
+        contents = [f"blob number {i}".encode() for i in range(100)]
+        shas = [object_write(VesBlob(data=c), repo) for c in contents]
 
-        os.chdir(repo_path)
-        repo = repo_find()
-        assert repo is not None
+        objs = object_read_many(repo, shas + ["a" * 40])
 
-        test_content = b"test content"
-        blob = VesBlob(data=test_content)
-        blob_hash = object_write(blob, repo)
-
-        # Test with different type specifications (should all work for blob objects)
-        for obj_type in ["blob", "tree", "commit", "tag"]:
-            args = Namespace(object=blob_hash, type=obj_type)
-            # Should not crash regardless of type specified
-            cmd_cat_file(args)
+        assert objs[-1] is None
+        for obj, content in zip(objs, contents):
+            assert isinstance(obj, VesBlob)
+            assert obj.blobdata == content
@@ -1,47 +1,89 @@
-import os
+import random
 from argparse import Namespace
-from pathlib import Path
+from fnmatch import fnmatchcase
 
 import pytest
 
 from src.commands.add import cmd_add
 from src.commands.check_ignore import cmd_check_ignore
 from src.commands.commit import cmd_commit
-from src.commands.init import cmd_init
-from src.core.repository import repo_find
-from src.utils.ignore import VesIgnore, check_ignore, vesignore_read
+from src.utils.ignore import (
+    VesIgnore,
+    VesIgnoreRules,
+    check_ignore,
+    check_ignore_dir,
+    vesignore_invalidate,
+    vesignore_parse,
+    vesignore_read,
+)
+
+
+def reference_check_ignore1(rules, path):
+    """The original rule-by-rule check_ignore1, kept as a test oracle."""
+    result = None
+    for pattern, value in rules:
+        if pattern.endswith("/"):
+            dir_pattern = pattern[:-1]
+            if "**" in dir_pattern:
+                if dir_pattern.startswith("**/"):
+                    parts = path.split("/")
+                    if dir_pattern[3:] in parts[:-1]:
+                        result = value
+                elif dir_pattern.endswith("/**"):
+                    if path.startswith(dir_pattern[:-3] + "/"):
+                        result = value
+            elif path.startswith(dir_pattern + "/") or path == dir_pattern:
+                result = value
+        elif fnmatchcase(path, pattern):
+            result = value
+    return result
+
+
+# Pattern shapes covering every VesIgnoreRules fast path and the glob regex
+FUZZ_PATTERNS = [
+    "*.py",
+    "*.log",
+    "*.gz",
+    "a.py",
+    "build/a.py",
+    "build/",
+    "a/b/",
+    "b*/",
+    "**/cache/",
+    "**/a/",
+    "a/**/",
+    "build/**/",
+    "a**b/",
+    "*",
+    "a*",
+    "*/a.py",
+    "b?",
+    "?.py",
+    "[ab]*",
+    "[!a]*.log",
+    "foo.o?",
+    "*cache*",
+    "build*",
+]
+FUZZ_PARTS = ["a", "b", "build", "cache", "a.py", "b.log", "x.tar.gz", "foo.o"]
 
 
 class TestCheckIgnoreCommand:
     """Test cases for the check-ignore command."""
 
-    def test_check_ignore_no_rules(self, temp_dir, clean_env, capsys):
+    def test_check_ignore_no_rules(self, repo_path, capsys):
         """Test check-ignore when no ignore rules exist."""
-        os.chdir(temp_dir)
-
-        # Initialize repository
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
-        os.chdir(repo_path)
-
         # Check some paths (should produce no output)
-        args = Namespace(path=["test.txt", "src/main.py", "docs/readme.md"])
+        args = Namespace(
+            path=["test.txt", "src/main.py", "docs/readme.md"], cwd=str(repo_path)
+        )
         cmd_check_ignore(args)
 
         captured = capsys.readouterr()
         assert captured.out.strip() == ""
 
-    def test_check_ignore_with_vesignore_file(self, temp_dir, clean_env, capsys):
+    def test_check_ignore_with_vesignore_file(self, repo_path, capsys):
         """Test check-ignore with .vesignore file in repository."""
-        os.chdir(temp_dir)
-
-        # Initialize repository
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
-        os.chdir(repo_path)
-
         # Create .vesignore file
         vesignore_file = repo_path / ".vesignore"
         vesignore_content = """# Ignore patterns
@@ -53,10 +95,10 @@ src/*.pyc
         vesignore_file.write_text(vesignore_content)
 
         # Add .vesignore to index
-        add_args = Namespace(path=[".vesignore"])
+        add_args = Namespace(path=[".vesignore"], cwd=str(repo_path))
         cmd_add(add_args)
 
-        commit_args = Namespace(message="Add ignore rules")
+        commit_args = Namespace(message="Add ignore rules", cwd=str(repo_path))
         cmd_commit(commit_args)
 
         # Test various paths
@@ -68,7 +110,8 @@ src/*.pyc
                 "src/test.pyc",  # Should be ignored (src/*.pyc)
                 "src/main.py",  # Should NOT be ignored
                 "README.md",  # Should NOT be ignored
-            ]
+            ],
+            cwd=str(repo_path),
         )
         cmd_check_ignore(args)
 
@@ -83,16 +126,8 @@ src/*.pyc
         assert "src/main.py" not in ignored_paths
         assert "README.md" not in ignored_paths
 
-    def test_check_ignore_with_negation_rules(self, temp_dir, clean_env, capsys):
+    def test_check_ignore_with_negation_rules(self, repo_path, capsys):
         """Test check-ignore with negation rules (!)."""
-        os.chdir(temp_dir)
-
-        # Initialize repository
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
-        os.chdir(repo_path)
-
         # Create .vesignore with negation rules
         vesignore_file = repo_path / ".vesignore"
         vesignore_content = """# Ignore all .log files
@@ -107,10 +142,10 @@ build/
         vesignore_file.write_text(vesignore_content)
 
         # Add .vesignore to index
-        add_args = Namespace(path=[".vesignore"])
+        add_args = Namespace(path=[".vesignore"], cwd=str(repo_path))
         cmd_add(add_args)
 
-        commit_args = Namespace(message="Add negation rules")
+        commit_args = Namespace(message="Add negation rules", cwd=str(repo_path))
         cmd_commit(commit_args)
 
         # Test paths with negation rules
@@ -120,7 +155,8 @@ build/
                 "important.log",  # Should NOT be ignored (!important.log)
                 "build/output.exe",  # Should be ignored (build/)
                 "build/keep.txt",  # Should NOT be ignored (!build/keep.txt)
-            ]
+            ],
+            cwd=str(repo_path),
         )
         cmd_check_ignore(args)
 
@@ -133,16 +169,8 @@ build/
         assert "build/output.exe" in ignored_paths
         assert "build/keep.txt" not in ignored_paths
 
-    def test_check_ignore_with_local_exclude(self, temp_dir, clean_env, capsys):
+    def test_check_ignore_with_local_exclude(self, repo_path, capsys):
         """Test check-ignore with local exclude file."""
-        os.chdir(temp_dir)
-
-        # Initialize repository
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
-        os.chdir(repo_path)
-
         # Create local exclude file
         exclude_dir = repo_path / ".ves" / "info"
         exclude_dir.mkdir(parents=True, exist_ok=True)
@@ -159,7 +187,8 @@ private/
                 "config.secret",  # Should be ignored (*.secret)
                 "private/data.txt",  # Should be ignored (private/)
                 "public/info.txt",  # Should NOT be ignored
-            ]
+            ],
+            cwd=str(repo_path),
         )
         cmd_check_ignore(args)
 
@@ -171,16 +200,8 @@ private/
         assert "private/data.txt" in ignored_paths
         assert "public/info.txt" not in ignored_paths
 
-    def test_check_ignore_scoped_vesignore(self, temp_dir, clean_env, capsys):
+    def test_check_ignore_scoped_vesignore(self, repo_path, capsys):
         """Test check-ignore with scoped .vesignore files in subdirectories."""
-        os.chdir(temp_dir)
-
-        # Initialize repository
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
-        os.chdir(repo_path)
-
         # Create subdirectory with its own .vesignore
         src_dir = repo_path / "src"
         src_dir.mkdir()
@@ -193,10 +214,10 @@ __pycache__/
         src_vesignore.write_text(src_vesignore_content)
 
         # Add scoped .vesignore to index
-        add_args = Namespace(path=["src/.vesignore"])
+        add_args = Namespace(path=["src/.vesignore"], cwd=str(repo_path))
         cmd_add(add_args)
 
-        commit_args = Namespace(message="Add scoped ignore rules")
+        commit_args = Namespace(message="Add scoped ignore rules", cwd=str(repo_path))
         cmd_commit(commit_args)
 
         # Test paths in different scopes
@@ -207,7 +228,8 @@ __pycache__/
                 "src/__pycache__/test.pyc",  # Should be ignored (src scope: __pycache__/)
                 "docs/main.o",  # Should NOT be ignored (different scope)
                 "src/main.py",  # Should NOT be ignored
-            ]
+            ],
+            cwd=str(repo_path),
         )
         cmd_check_ignore(args)
 
@@ -221,16 +243,8 @@ __pycache__/
         assert "docs/main.o" not in ignored_paths
         assert "src/main.py" not in ignored_paths
 
-    def test_check_ignore_comments_and_empty_lines(self, temp_dir, clean_env, capsys):
+    def test_check_ignore_comments_and_empty_lines(self, repo_path, capsys):
         """Test that comments and empty lines in ignore files are handled correctly."""
-        os.chdir(temp_dir)
-
-        # Initialize repository
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
-        os.chdir(repo_path)
-
         # Create .vesignore with comments and empty lines
         vesignore_file = repo_path / ".vesignore"
         vesignore_content = """
@@ -247,14 +261,16 @@ __pycache__/
         vesignore_file.write_text(vesignore_content)
 
         # Add .vesignore to index
-        add_args = Namespace(path=[".vesignore"])
+        add_args = Namespace(path=[".vesignore"], cwd=str(repo_path))
         cmd_add(add_args)
 
-        commit_args = Namespace(message="Add ignore with comments")
+        commit_args = Namespace(message="Add ignore with comments", cwd=str(repo_path))
         cmd_commit(commit_args)
 
         # Test paths
-        args = Namespace(path=["test.log", "backup.bak", "temp.tmp"])
+        args = Namespace(
+            path=["test.log", "backup.bak", "temp.tmp"], cwd=str(repo_path)
+        )
         cmd_check_ignore(args)
 
         captured = capsys.readouterr()
@@ -265,16 +281,8 @@ __pycache__/
         assert "backup.bak" in ignored_paths
         assert "temp.tmp" in ignored_paths
 
-    def test_check_ignore_escape_characters(self, temp_dir, clean_env, capsys):
+    def test_check_ignore_escape_characters(self, repo_path, capsys):
         """Test ignore rules with escape characters."""
-        os.chdir(temp_dir)
-
-        # Initialize repository
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
-        os.chdir(repo_path)
-
         # Create .vesignore with escaped characters
         vesignore_file = repo_path / ".vesignore"
         vesignore_content = r"""# Escaped patterns
@@ -284,14 +292,16 @@ __pycache__/
         vesignore_file.write_text(vesignore_content)
 
         # Add .vesignore to index
-        add_args = Namespace(path=[".vesignore"])
+        add_args = Namespace(path=[".vesignore"], cwd=str(repo_path))
         cmd_add(add_args)
 
-        commit_args = Namespace(message="Add escaped patterns")
+        commit_args = Namespace(message="Add escaped patterns", cwd=str(repo_path))
         cmd_commit(commit_args)
 
         # Test escaped patterns
-        args = Namespace(path=["#not-a-comment.txt", "!not-a-negation.txt"])
+        args = Namespace(
+            path=["#not-a-comment.txt", "!not-a-negation.txt"], cwd=str(repo_path)
+        )
         cmd_check_ignore(args)
 
         captured = capsys.readouterr()
@@ -301,43 +311,25 @@ __pycache__/
         assert "#not-a-comment.txt" in ignored_paths
         assert "!not-a-negation.txt" in ignored_paths
 
-    def test_check_ignore_without_repository(self, temp_dir, clean_env):
+    def test_check_ignore_without_repository(self, temp_dir):
         """Test that check-ignore fails when not in a repository."""
-        os.chdir(temp_dir)
-
         # Try to run check-ignore without repository
-        args = Namespace(path=["test.txt"])
+        args = Namespace(path=["test.txt"], cwd=temp_dir)
 
         with pytest.raises(Exception, match="No ves directory."):
             cmd_check_ignore(args)
 
-    def test_check_ignore_empty_path_list(self, temp_dir, clean_env, capsys):
+    def test_check_ignore_empty_path_list(self, repo_path, capsys):
         """Test check-ignore with empty path list."""
-        os.chdir(temp_dir)
-
-        # Initialize repository
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
-        os.chdir(repo_path)
-
         # Check empty path list
-        args = Namespace(path=[])
+        args = Namespace(path=[], cwd=str(repo_path))
         cmd_check_ignore(args)
 
         captured = capsys.readouterr()
         assert captured.out.strip() == ""
 
-    def test_check_ignore_mixed_patterns(self, temp_dir, clean_env, capsys):
+    def test_check_ignore_mixed_patterns(self, repo_path, capsys):
         """Test check-ignore with various pattern types."""
-        os.chdir(temp_dir)
-
-        # Initialize repository
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
-        os.chdir(repo_path)
-
         # Create .vesignore with different pattern types
         vesignore_file = repo_path / ".vesignore"
         vesignore_content = """# Various pattern types
@@ -350,10 +342,10 @@ test_*.py               # Prefix pattern
         vesignore_file.write_text(vesignore_content)
 
         # Add .vesignore to index
-        add_args = Namespace(path=[".vesignore"])
+        add_args = Namespace(path=[".vesignore"], cwd=str(repo_path))
         cmd_add(add_args)
 
-        commit_args = Namespace(message="Add mixed patterns")
+        commit_args = Namespace(message="Add mixed patterns", cwd=str(repo_path))
         cmd_commit(commit_args)
 
         # Test various paths
@@ -366,7 +358,8 @@ test_*.py               # Prefix pattern
                 "lib/node_modules/pkg/index.js",  # Should be ignored (**/node_modules/)
                 "main.py",  # Should NOT be ignored
                 "src/main.py",  # Should NOT be ignored
-            ]
+            ],
+            cwd=str(repo_path),
         )
         cmd_check_ignore(args)
 
@@ -382,19 +375,8 @@ test_*.py               # Prefix pattern
         assert "main.py" not in ignored_paths
         assert "src/main.py" not in ignored_paths
 
-    def test_vesignore_read_function(self, temp_dir, clean_env):
+    def test_vesignore_read_function(self, repo_path, repo):
         """Test vesignore_read function directly."""
-        os.chdir(temp_dir)
-
-        # Initialize repository
-        repo_path = Path(temp_dir) / "test_repo"
-        init_args = Namespace(path=str(repo_path))
-        cmd_init(init_args)
-        os.chdir(repo_path)
-
-        repo = repo_find()
-        assert repo is not None
-
         # Initially no rules
         rules = vesignore_read(repo)
         assert rules is not None
@@ -413,6 +395,33 @@ test_*.py               # Prefix pattern
         assert len(rules.absolute) == 1
         assert len(rules.scoped) == 0
 
+    def test_vesignore_read_is_cached_until_inputs_change(
+        self, repo_path, repo, monkeypatch
+    ):
+        """Test that vesignore_read reuses parsed rules while its inputs are unchanged."""
+        import src.utils.ignore as ignore
+
+        exclude_file = repo_path / ".ves" / "info" / "exclude"
+        exclude_file.parent.mkdir(parents=True, exist_ok=True)
+        exclude_file.write_text("*.local\n")
+
+        # Freshly written inputs are racy and never cached
+        first = vesignore_read(repo)
+        assert vesignore_read(repo) is not first
+
+        monkeypatch.setattr(ignore, "RULES_CACHE_RACY_NS", -(10**18))
+        first = vesignore_read(repo)
+        assert vesignore_read(repo) is first
+
+        # Rewriting an input is noticed
+        exclude_file.write_text("*.local\n*.tmp\n")
+        second = vesignore_read(repo)
+        assert second is not first
+        assert len(second.absolute[0]) == 2
+
+        vesignore_invalidate(repo)
+        assert vesignore_read(repo) is not second
+
     def test_check_ignore_function_direct(self, temp_dir, clean_env):
         """Test check_ignore function directly."""
         # Create mock ignore rules
@@ -430,3 +439,151 @@ test_*.py               # Prefix pattern
         # Test absolute path should raise exception
         with pytest.raises(Exception, match="requires path to be relative"):
             check_ignore(rules, "/absolute/path.txt")
+
+    def test_check_ignore_compiles_plain_rule_lists_once(self, temp_dir, clean_env):
+        """Test that plain rule lists are compiled on first use and kept."""
+        rules = VesIgnore()
+        rules.absolute = [[("*.log", True)]]
+        rules.scoped = {"src": [("*.pyc", True)]}
+
+        assert check_ignore(rules, "src/main.pyc") == True
+        compiled = rules.absolute[0]
+        assert isinstance(compiled, VesIgnoreRules)
+        assert isinstance(rules.scoped["src"], VesIgnoreRules)
+
+        assert check_ignore(rules, "app.log") == True
+        assert rules.absolute[0] is compiled
+        assert rules.compiled
+
+        # Later checks do not revisit the rule sets
+        rules.absolute = [[("*.tmp", True)]]
+        assert check_ignore(rules, "x.tmp") == True
+        assert not isinstance(rules.absolute[0], VesIgnoreRules)
+
+        rules.compiled = False
+        assert check_ignore(rules, "x.tmp") == True
+        assert isinstance(rules.absolute[0], VesIgnoreRules)
+
+    def test_check_ignore_rule_order_across_rule_kinds(self, temp_dir, clean_env):
+        """Test that the last matching rule wins across suffix, literal and glob rules."""
+        rules = VesIgnore()
+        rules.absolute = [
+            vesignore_parse(
+                [
+                    "*.log",
+                    "!keep.log",
+                    "logs/",
+                    "!logs/*.md",
+                    "debug*",
+                    "!debug.txt",
+                ]
+            )
+        ]
+
+        assert check_ignore(rules, "app.log") == True
+        assert check_ignore(rules, "keep.log") == False
+        assert check_ignore(rules, "logs/today.txt") == True
+        assert check_ignore(rules, "logs/README.md") == False
+        assert check_ignore(rules, "debug.log") == True
+        assert check_ignore(rules, "debug.txt") == False
+        assert check_ignore(rules, "notes.txt") == False
+
+    def test_check_ignore_without_negations_skips_globs(self, temp_dir, clean_env):
+        """Test that a lookup hit decides a negation-free rule set on its own."""
+        ruleset = vesignore_parse(["build/", "*.o", "a*b"])
+
+        class FailingRegex:
+            def match(self, path):
+                raise AssertionError(f"glob regex consulted for {path}")
+
+        ruleset.glob_regex = FailingRegex()
+
+        assert ruleset.match("build/deep/file.txt") == True
+        assert ruleset.match("src/main.o") == True
+
+        # With a negation the glob rules must still be consulted
+        negated = vesignore_parse(["build/", "!build/keep*"])
+        assert negated.match("build/keep.txt") == False
+        assert negated.match("build/other.txt") == True
+
+    def test_check_ignore_directory_paths(self, temp_dir, clean_env):
+        """Test that directories can be checked with a trailing slash."""
+        rules = VesIgnore()
+        rules.absolute = [vesignore_parse(["build/", "**/cache/", "*.log"])]
+        rules.scoped = {"pkg": vesignore_parse(["dist/"])}
+
+        assert check_ignore(rules, "build/") == True
+        assert check_ignore(rules, "build/sub/") == True
+        assert check_ignore(rules, "src/cache/") == True
+        assert check_ignore(rules, "pkg/dist/") == True
+        assert check_ignore(rules, "src/") == False
+        assert check_ignore(rules, "dist/") == False
+        assert check_ignore(rules, "logs.log/") == False
+
+    def test_check_ignore_dir_only_uses_directory_rules(self, temp_dir, clean_env):
+        """Test that only directory rules ignore a directory as a whole."""
+        rules = VesIgnore()
+        rules.absolute = [vesignore_parse(["build/", "**/cache/", "out/**/", "*.o?"])]
+        rules.scoped = {"pkg": vesignore_parse(["dist/"])}
+
+        assert check_ignore_dir(rules, "build") == True
+        assert check_ignore_dir(rules, "build/sub") == True
+        assert check_ignore_dir(rules, "src/cache") == True
+        assert check_ignore_dir(rules, "out") == True
+        assert check_ignore_dir(rules, "pkg/dist") == True
+        assert check_ignore_dir(rules, "dist") == False
+        assert check_ignore_dir(rules, "src") == False
+
+        # "*.o?" matches "foo.o/" through the slash, but not foo.o/bar.c
+        assert check_ignore(rules, "foo.o/") == True
+        assert check_ignore(rules, "foo.o/bar.c") == False
+        assert check_ignore_dir(rules, "foo.o") == False
+
+    def test_check_ignore_re2_glob_set_matches_re(
+        self, temp_dir, clean_env, monkeypatch
+    ):
+        """Test that the optional RE2 set gives the same answers as re."""
+        pytest.importorskip("re2")
+        import src.utils.ignore as ignore
+
+        lines = ["*", "!*.py", "build*", "!build/keep?.txt", "**/cache/", "a*b*c*d"]
+        paths = ["x.txt", "x.py", "build/out", "build/keep1.txt", "src/cache/f.py"]
+        paths += ["axbxcxd", "a b c d", "deep/dir/file.py"]
+
+        monkeypatch.setattr(ignore, "RE2_MIN_GLOBS", 10**9)
+        plain = vesignore_parse(lines)
+        monkeypatch.setattr(ignore, "RE2_MIN_GLOBS", 0)
+        with_re2 = vesignore_parse(lines)
+
+        assert plain.glob_set is None
+        assert with_re2.glob_set is not None
+        assert [with_re2.match(p) for p in paths] == [plain.match(p) for p in paths]
+
+    @pytest.mark.parametrize("use_re2", [False, True], ids=["re", "re2"])
+    def test_check_ignore_matches_reference_on_random_rules(
+        self, temp_dir, clean_env, monkeypatch, use_re2
+    ):
+        """Test compiled rule sets against the original rule-by-rule check."""
+        import src.utils.ignore as ignore
+
+        if use_re2:
+            pytest.importorskip("re2")
+            monkeypatch.setattr(ignore, "RE2_MIN_GLOBS", 0)
+        else:
+            monkeypatch.setattr(ignore, "RE2_MIN_GLOBS", 10**9)
+
+        rng = random.Random(1234)
+        paths = [
+            "/".join(rng.choice(FUZZ_PARTS) for _ in range(rng.randint(1, 4)))
+            for _ in range(60)
+        ]
+
+        for _ in range(300):
+            rules = [
+                (rng.choice(FUZZ_PATTERNS), rng.random() < 0.7)
+                for _ in range(rng.randint(1, 8))
+            ]
+            compiled = VesIgnoreRules(rules)
+            for path in paths:
+                expected = reference_check_ignore1(rules, path)
+                assert compiled.match(path) == expected, (rules, path)
@@ -11,6 +11,7 @@ from src.commands.commit import cmd_commit
 from src.commands.init import cmd_init
 from src.core.objects import VesCommit, object_find, object_read
 from src.core.repository import repo_find
+from src.utils.tree import CHECKOUT_SMALL_BLOB, VesCheckoutPerfData, tree_checkout
 
 
 class TestCheckoutCommand:
@@ -686,3 +687,174 @@ class TestCheckoutCommand:
 
         # Verify symlink functionality
         assert symlink_file.read_text() == "Regular file content"
+
+    def test_checkout_many_files(self, temp_dir, clean_env):
+        """Test that every file is written before checkout returns."""
+        os.chdir(temp_dir)
+
+        # Initialize repository
+        repo_path = Path(temp_dir) / "test_repo"
+        init_args = Namespace(path=str(repo_path))
+        cmd_init(init_args)
+        os.chdir(repo_path)
+
+        # Spread more files than there are worker threads over a few directories
+        files_to_create = []
+        for d in range(4):
+            (repo_path / f"dir{d}").mkdir()
+            for i in range(50):
+                files_to_create.append((f"dir{d}/file{i}.txt", f"content {d}-{i}\n"))
+
+        for file_path, content in files_to_create:
+            (repo_path / file_path).write_text(content)
+
+        # Files past the small-blob size are written one per task
+        big_data = os.urandom(3 * CHECKOUT_SMALL_BLOB)
+        (repo_path / "dir0" / "big.bin").write_bytes(big_data)
+
+        paths = [file_path for file_path, _ in files_to_create] + ["dir0/big.bin"]
+        add_args = Namespace(path=paths)
+        cmd_add(add_args)
+
+        commit_args = Namespace(message="Add many files")
+        cmd_commit(commit_args)
+
+        repo = repo_find()
+        assert repo is not None
+        head_sha = object_find(repo, "HEAD")
+        assert head_sha is not None
+
+        dest_dir = Path(temp_dir) / "many_checkout"
+        checkout_args = Namespace(commit=head_sha, path=str(dest_dir))
+        cmd_checkout(checkout_args)
+
+        for file_path, content in files_to_create:
+            assert (dest_dir / file_path).read_text() == content
+        assert (dest_dir / "dir0" / "big.bin").read_bytes() == big_data
+
+    def test_checkout_into_existing_directories(self, temp_dir, clean_env):
+        """Test that existing directories are reused and calls are counted."""
+        os.chdir(temp_dir)
+
+        # Initialize repository
+        repo_path = Path(temp_dir) / "test_repo"
+        init_args = Namespace(path=str(repo_path))
+        cmd_init(init_args)
+        os.chdir(repo_path)
+
+        (repo_path / "sub" / "deep").mkdir(parents=True)
+        (repo_path / "top.txt").write_text("top")
+        (repo_path / "sub" / "mid.txt").write_text("mid")
+        (repo_path / "sub" / "deep" / "low.txt").write_text("low")
+
+        add_args = Namespace(path=["top.txt", "sub/mid.txt", "sub/deep/low.txt"])
+        cmd_add(add_args)
+
+        commit_args = Namespace(message="Nested files")
+        cmd_commit(commit_args)
+
+        repo = repo_find()
+        assert repo is not None
+        commit = object_read(repo, object_find(repo, "HEAD"))
+        assert isinstance(commit, VesCommit)
+        tree = object_read(repo, commit.kvlm[b"tree"].decode("ascii"))
+
+        # "sub" already exists, "sub/deep" does not
+        dest_dir = Path(temp_dir) / "partial_checkout"
+        (dest_dir / "sub").mkdir(parents=True)
+
+        perf = tree_checkout(repo, tree, str(dest_dir))
+
+        assert (dest_dir / "top.txt").read_text() == "top"
+        assert (dest_dir / "sub" / "mid.txt").read_text() == "mid"
+        assert (dest_dir / "sub" / "deep" / "low.txt").read_text() == "low"
+        assert perf == VesCheckoutPerfData(
+            mkdir_calls=1, scandir_calls=2, write_calls=3, symlink_calls=0
+        )
+
+    def test_checkout_reads_blobs_in_batches(self, temp_dir, clean_env, monkeypatch):
+        """Test that blobs are read a batch at a time, not a whole tree at once."""
+        import src.core.objects
+        import src.utils.tree
+
+        os.chdir(temp_dir)
+
+        # Initialize repository
+        repo_path = Path(temp_dir) / "test_repo"
+        init_args = Namespace(path=str(repo_path))
+        cmd_init(init_args)
+        os.chdir(repo_path)
+
+        (repo_path / "sub").mkdir()
+        files_to_create = [f"file{i}.txt" for i in range(20)]
+        files_to_create += [f"sub/file{i}.txt" for i in range(5)]
+        for file_path in files_to_create:
+            (repo_path / file_path).write_text(f"content of {file_path}")
+
+        add_args = Namespace(path=files_to_create)
+        cmd_add(add_args)
+
+        commit_args = Namespace(message="Many files")
+        cmd_commit(commit_args)
+
+        repo = repo_find()
+        assert repo is not None
+        commit = object_read(repo, object_find(repo, "HEAD"))
+        assert isinstance(commit, VesCommit)
+        tree = object_read(repo, commit.kvlm[b"tree"].decode("ascii"))
+
+        read_sizes = []
+        object_read_many = src.core.objects.object_read_many
+
+        def recording_read_many(repo, shas):
+            read_sizes.append(len(shas))
+            return object_read_many(repo, shas)
+
+        monkeypatch.setattr(src.core.objects, "object_read_many", recording_read_many)
+        monkeypatch.setattr(src.utils.tree, "CHECKOUT_READ_BATCH", 8)
+
+        dest_dir = Path(temp_dir) / "batched_checkout"
+        dest_dir.mkdir()
+        tree_checkout(repo, tree, str(dest_dir))
+
+        for file_path in files_to_create:
+            assert (dest_dir / file_path).read_text() == f"content of {file_path}"
+        assert max(read_sizes) <= 8
+
+    def test_checkout_caps_pending_writes(self, temp_dir):
+        """Test that submitting writes waits once too many bytes are pending."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from src.utils.tree import _CheckoutWriter
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def __init__(self):
+                super().__init__(max_workers=4)
+                self.futures = []
+                self.in_flight = []
+
+            def submit(self, fn, /, *args, **kwargs):
+                self.in_flight.append(sum(not f.done() for f in self.futures))
+                future = super().submit(fn, *args, **kwargs)
+                self.futures.append(future)
+                return future
+
+        blobs = {
+            os.path.join(temp_dir, f"big{i}.bin"): os.urandom(2 * CHECKOUT_SMALL_BLOB)
+            for i in range(8)
+        }
+
+        # Room for two files: a third write waits for one to finish
+        with RecordingExecutor() as executor:
+            writer = _CheckoutWriter(
+                executor, max_pending_bytes=4 * CHECKOUT_SMALL_BLOB
+            )
+            for dest, data in blobs.items():
+                writer.submit([(dest, memoryview(data))])
+                assert writer.pending_bytes <= 4 * CHECKOUT_SMALL_BLOB
+            writer.finish()
+
+        assert writer.pending_bytes == 0
+        assert max(executor.in_flight) <= 1
+        for dest, data in blobs.items():
+            assert Path(dest).read_bytes() == data
@@ -335,3 +335,40 @@ class TestCommitCommand:
         updated_head = ref_resolve(repo, "HEAD")
         assert updated_head is not None
         assert len(updated_head) == 40
+
+    def test_commit_writes_every_nested_tree(self, temp_dir, clean_env):
+        """Test that all trees of a nested index are written, reused or not."""
+        from src.core.objects import VesTree
+        from src.utils.tree import tree_to_dict
+
+        os.chdir(temp_dir)
+
+        # Initialize repository
+        repo_path = Path(temp_dir) / "test_repo"
+        init_args = Namespace(path=str(repo_path))
+        cmd_init(init_args)
+        os.chdir(repo_path)
+
+        (repo_path / "a" / "b" / "c").mkdir(parents=True)
+        (repo_path / "x").mkdir()
+        files = ["top.txt", "a/one.txt", "a/b/two.txt", "a/b/c/three.txt", "x/four.txt"]
+        for name in files:
+            (repo_path / name).write_text(name)
+
+        cmd_add(Namespace(path=files))
+        cmd_commit(Namespace(message="Nested"))
+
+        # Only the root changes: every subtree already exists on disk
+        (repo_path / "top.txt").write_text("changed")
+        cmd_add(Namespace(path=["top.txt"]))
+        cmd_commit(Namespace(message="Change top"))
+
+        repo = repo_find()
+        assert repo is not None
+        commit = object_read(repo, ref_resolve(repo, "HEAD"))
+        assert isinstance(commit, VesCommit)
+        assert isinstance(object_read(repo, commit.kvlm[b"tree"].decode()), VesTree)
+
+        # A missing subtree would drop its files from the flattened tree
+        flat = tree_to_dict(repo, "HEAD")
+        assert sorted(flat) == sorted(name.replace("/", os.sep) for name in files)
@@ -206,3 +206,27 @@ class TestHashObjectCommand:
         # Expected: 3b18e512dba79e4c8300dd08aeb37f8e728b8dad
         expected_hash = "3b18e512dba79e4c8300dd08aeb37f8e728b8dad"
         assert hash_output == expected_hash
+
+    def test_hash_object_commit_with_many_parents(self, temp_dir, clean_env, capsys):
+        """Test that commits with more headers than the recursion limit parse."""
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        cmd_init(Namespace(path=str(repo_path)))
+        os.chdir(repo_path)
+
+        parents = [f"{i:040x}".encode() for i in range(5000)]
+        raw = b"tree " + b"0" * 40 + b"\n"
+        raw += b"".join(b"parent " + p + b"\n" for p in parents)
+        raw += b"author A <a@example.com> 0 +0000\n\nMerge everything\n"
+
+        commit_file = repo_path / "commit.txt"
+        commit_file.write_bytes(raw)
+
+        cmd_hash_object(Namespace(path=str(commit_file), type="commit", write=True))
+        sha = capsys.readouterr().out.strip()
+
+        commit = object_read(repo_find(), sha)
+        assert commit.kvlm[b"parent"] == parents
+        assert commit.kvlm[None] == b"Merge everything\n"
+        assert commit.serialize() == raw
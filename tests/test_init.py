@@ -91,3 +91,28 @@ class TestInitCommand:
         assert repo.worktree == str(repo_path)
         assert repo.vesdir == str(repo_path / ".ves")
         assert repo.conf is not None
+
+    def test_reopened_repository_reads_config(self, temp_dir, clean_env):
+        """Test that reopening a repository exposes its core configuration."""
+        repo_path = Path(temp_dir) / "test_repo"
+        repo_create(str(repo_path))
+
+        repo = VesRepository(str(repo_path))
+
+        assert repo.conf.get("core", "repositoryformatversion") == "0"
+        assert repo.conf.get("core", "bare") == "false"
+
+    def test_unsupported_repository_format_version(self, temp_dir, clean_env):
+        """Test that opening a repository with an unknown format version fails."""
+        repo_path = Path(temp_dir) / "test_repo"
+        repo_create(str(repo_path))
+
+        config_path = repo_path / ".ves" / "config"
+        config_path.write_text(
+            config_path.read_text().replace(
+                "repositoryformatversion = 0", "repositoryformatversion = 1"
+            )
+        )
+
+        with pytest.raises(Exception, match="Unsupported repositoryformatversion"):
+            VesRepository(str(repo_path))
@@ -4,7 +4,7 @@ from unittest.mock import patch
 
 import pytest
 
-from src.libves import argparser, main
+from src.libves import COMMANDS, argparser, main
 
 
 class TestLibves:
@@ -57,6 +57,15 @@ class TestLibves:
         assert args.write == True
         assert args.path == "test.txt"
 
+    def test_argument_parser_cwd_option(self):
+        """Test that -C sets the directory commands run from."""
+        args = argparser.parse_args(["add", "file1.txt"])
+        assert args.cwd == "."
+
+        args = argparser.parse_args(["-C", "/tmp/test_repo", "add", "file1.txt"])
+        assert args.cwd == "/tmp/test_repo"
+        assert args.path == ["file1.txt"]
+
     def test_argument_parser_log_command(self):
         """Test that the argument parser correctly parses log command."""
         # Test with default HEAD
@@ -338,9 +347,9 @@ class TestLibves:
 
     @patch("builtins.print")
     def test_main_bad_command_with_mock_parser(self, mock_print):
-        """Test the default case in the match statement."""
-        # We need to test the case where the parser accepts a command but it's not in our match statement
-        # This is a bit tricky since all valid commands are in the match statement
+        """Test the fallback for commands missing from the dispatch table."""
+        # We need to test the case where the parser accepts a command but it is not in COMMANDS
+        # This is a bit tricky since all valid commands are in the dispatch table
         # We can mock the argument parsing to return an unknown command
 
         from argparse import Namespace
@@ -353,6 +362,19 @@ class TestLibves:
             main(["fake-args"])
             mock_print.assert_called_once_with("Bad command.")
 
+    def test_every_parser_command_is_dispatched(self):
+        """Test that each subcommand of the parser has a COMMANDS entry."""
+        from argparse import _SubParsersAction
+        from importlib import import_module
+
+        subparsers = next(
+            a for a in argparser._actions if isinstance(a, _SubParsersAction)
+        )
+        assert set(subparsers.choices) == set(COMMANDS)
+
+        for module, function in COMMANDS.values():
+            assert callable(getattr(import_module(module), function))
+
     def test_main_integration_init_and_add(self, temp_dir, clean_env):
         """Integration test: init a repository and add a file."""
         os.chdir(temp_dir)
@@ -379,6 +401,20 @@ class TestLibves:
         index_file = repo_path / ".ves" / "index"
         assert index_file.exists()
 
+    def test_main_integration_with_cwd_option(self, temp_dir, clean_env):
+        """Integration test: -C runs init and add without changing directory."""
+        os.chdir(temp_dir)
+        repo_path = Path(temp_dir) / "integration_repo"
+        (repo_path / "sub").mkdir(parents=True)
+
+        main(["-C", str(repo_path), "init"])
+        (repo_path / "sub" / "test.txt").write_text("Integration test content")
+        main(["-C", str(repo_path / "sub"), "add", "test.txt"])
+
+        assert os.getcwd() == temp_dir
+        assert (repo_path / ".ves" / "index").exists()
+        assert not (Path(temp_dir) / ".ves").exists()
+
     def test_main_no_arguments_fails(self):
         """Test that main() fails gracefully with no arguments."""
         with pytest.raises(SystemExit):
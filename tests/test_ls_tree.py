@@ -424,3 +424,35 @@ class TestLsTreeCommand:
 
         # Should pad to 6 digits
         assert "040000" in output  # Should be padded with leading zero
+
+    def test_ls_tree_orders_directories_as_if_slash_terminated(
+        self, temp_dir, clean_env, capsys
+    ):
+        """Test that directories sort as "name/", after "name.ext" files."""
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        init_args = Namespace(path=str(repo_path))
+        cmd_init(init_args)
+
+        os.chdir(repo_path)
+        repo = repo_find()
+        assert repo is not None
+
+        blob_sha = object_write(VesBlob(data=b"test"), repo)
+        sub_tree = VesTree()
+        sub_tree.items.append(VesTreeLeaf(mode=b"100644", path="x", sha=blob_sha))
+        sub_tree_sha = object_write(sub_tree, repo)
+
+        # "/" sorts after "." but before "0", so the directory lands between
+        tree = VesTree()
+        tree.items.append(VesTreeLeaf(mode=b"100644", path="foo0", sha=blob_sha))
+        tree.items.append(VesTreeLeaf(mode=b"040000", path="foo", sha=sub_tree_sha))
+        tree.items.append(VesTreeLeaf(mode=b"100644", path="foo.c", sha=blob_sha))
+        tree_sha = object_write(tree, repo)
+
+        args = Namespace(tree=tree_sha, recursive=False)
+        cmd_ls_tree(args)
+
+        names = [line.split("\t")[1] for line in capsys.readouterr().out.splitlines()]
+        assert names == ["foo.c", "foo", "foo0"]
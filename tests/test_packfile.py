@@ -0,0 +1,106 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from src.core.objects import (
+    VesBlob,
+    object_find,
+    object_peek,
+    object_read,
+    object_write,
+)
+from src.core.packfile import pack_index_read, pack_write, packs_load
+from src.core.repository import VesRepository, repo_create
+
+
+class TestPackFile:
+    """Test cases for the packed object store."""
+
+    def _repo_with_packed_blobs(self, temp_dir):
+        repo_path = Path(temp_dir) / "test_repo"
+        repo = repo_create(str(repo_path))
+
+        contents = [b"first packed blob", b"second packed blob", os.urandom(5000)]
+        shas = [object_write(VesBlob(data=c), repo) for c in contents]
+
+        pack_path = pack_write(repo, shas)
+        assert pack_path is not None
+
+        # Drop the loose copies so reads can only be served by the pack
+        for sha in shas:
+            os.unlink(repo_path / ".ves" / "objects" / sha[:2] / sha[2:])
+
+        return repo, contents, shas
+
+    def test_read_packed_objects(self, temp_dir, clean_env):
+        """Test that packed objects are read back without loose files."""
+        repo, contents, shas = self._repo_with_packed_blobs(temp_dir)
+
+        for content, sha in zip(contents, shas):
+            obj = object_read(repo, sha)
+            assert isinstance(obj, VesBlob)
+            assert obj.blobdata == content
+            assert object_peek(repo, sha) == (b"blob", len(content))
+
+    def test_packs_visible_to_new_repository_instance(self, temp_dir, clean_env):
+        """Test that a freshly opened repository discovers existing packs."""
+        repo, contents, shas = self._repo_with_packed_blobs(temp_dir)
+
+        reopened = VesRepository(repo.worktree)
+        assert len(packs_load(reopened)) == 1
+
+        obj = object_read(reopened, shas[0])
+        assert isinstance(obj, VesBlob)
+        assert obj.blobdata == contents[0]
+
+    def test_resolve_partial_sha_of_packed_object(self, temp_dir, clean_env):
+        """Test that short SHAs resolve to packed objects."""
+        repo, _, shas = self._repo_with_packed_blobs(temp_dir)
+
+        assert object_find(repo, shas[1][:8], fmt=b"blob") == shas[1]
+
+    def test_write_skips_packed_objects(self, temp_dir, clean_env):
+        """Test that writing an already packed object does not recreate it."""
+        repo, contents, shas = self._repo_with_packed_blobs(temp_dir)
+
+        assert object_write(VesBlob(data=contents[0]), repo) == shas[0]
+        loose_path = Path(repo.vesdir) / "objects" / shas[0][:2] / shas[0][2:]
+        assert not loose_path.exists()
+
+    def test_pack_write_with_no_objects(self, temp_dir, clean_env):
+        """Test that packing nothing does not create a pack."""
+        repo = repo_create(str(Path(temp_dir) / "test_repo"))
+
+        assert pack_write(repo, []) is None
+        assert packs_load(repo) == []
+
+    def test_pack_write_keeps_open_packs(self, temp_dir, clean_env):
+        """Test that a new pack is added without dropping the open ones."""
+        repo, contents, shas = self._repo_with_packed_blobs(temp_dir)
+        first = packs_load(repo)[0]
+        view = first.get(shas[0])
+
+        sha = object_write(VesBlob(data=b"second pack"), repo)
+        pack_write(repo, [sha])
+
+        packs = packs_load(repo)
+        assert len(packs) == 2 and packs[0] is first
+        assert view is not None and bytes(view) == bytes(first.get(shas[0]))
+        pack_dir = Path(repo.vesdir) / "objects" / "pack"
+        assert not [f for f in os.listdir(pack_dir) if f.endswith(".tmp")]
+
+    def test_malformed_pack_index(self, temp_dir, clean_env):
+        """Test that bad signatures and truncated indexes are rejected."""
+        repo, _, _ = self._repo_with_packed_blobs(temp_dir)
+        index_path = packs_load(repo)[0].path[: -len(".pack")] + ".idx"
+        raw = Path(index_path).read_bytes()
+
+        bad = Path(temp_dir) / "bad.idx"
+        bad.write_bytes(b"XXXX" + raw[4:])
+        with pytest.raises(Exception, match="bad signature"):
+            pack_index_read(str(bad))
+
+        bad.write_bytes(raw[:-10])
+        with pytest.raises(Exception, match="bad length"):
+            pack_index_read(str(bad))
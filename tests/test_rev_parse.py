@@ -6,7 +6,8 @@ import pytest
 
 from src.commands.init import cmd_init
 from src.commands.rev_parse import cmd_rev_parse
-from src.core.objects import VesBlob, object_write
+from src.core import objects
+from src.core.objects import VesBlob, VesCommit, VesTree, object_write
 from src.core.refs import ref_create
 from src.core.repository import repo_find
 
@@ -424,3 +425,60 @@ class TestRevParseCommand:
         output = captured.out.strip()
 
         assert output == test_sha
+
+    def test_rev_parse_commit_as_tree_peeks_only_commit(
+        self, temp_dir, clean_env, capsys, monkeypatch
+    ):
+        """Test that resolving a commit to its tree does not peek the tree."""
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        init_args = Namespace(path=str(repo_path))
+        cmd_init(init_args)
+
+        os.chdir(repo_path)
+        repo = repo_find()
+        assert repo is not None
+
+        tree_sha = object_write(VesTree(), repo)
+        commit = VesCommit()
+        commit.kvlm = {b"tree": tree_sha.encode("ascii"), None: b"Empty\n"}
+        commit_sha = object_write(commit, repo)
+
+        peeks = []
+        object_peek = objects.object_peek
+
+        def counting_peek(repo, sha):
+            peeks.append(sha)
+            return object_peek(repo, sha)
+
+        monkeypatch.setattr(objects, "object_peek", counting_peek)
+
+        args = Namespace(name=commit_sha, type="tree")
+        cmd_rev_parse(args)
+
+        assert capsys.readouterr().out.strip() == tree_sha
+        assert peeks == [commit_sha]
+
+    def test_rev_parse_commit_with_missing_tree(self, temp_dir, clean_env):
+        """Test that resolving a commit to a tree that is not stored fails."""
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        init_args = Namespace(path=str(repo_path))
+        cmd_init(init_args)
+
+        os.chdir(repo_path)
+        repo = repo_find()
+        assert repo is not None
+
+        # Hash the tree without storing it
+        tree_sha = object_write(VesTree())
+        commit = VesCommit()
+        commit.kvlm = {b"tree": tree_sha.encode("ascii"), None: b"Dangling\n"}
+        commit_sha = object_write(commit, repo)
+
+        args = Namespace(name=commit_sha, type="tree")
+
+        with pytest.raises(Exception, match=f"Cannot read object {tree_sha}"):
+            cmd_rev_parse(args)
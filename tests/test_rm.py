@@ -97,6 +97,34 @@ class TestRmCommand:
         for file_path in files_to_remove:
             assert not Path(file_path).exists()
 
+    def test_rm_many_files(self, temp_dir, clean_env):
+        """Test removing enough files to take the parallel unlink path."""
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        init_args = Namespace(path=str(repo_path))
+        cmd_init(init_args)
+
+        os.chdir(repo_path)
+
+        files_to_remove = []
+        for i in range(40):
+            test_file = repo_path / f"file_{i:02d}.txt"
+            test_file.write_bytes(f"Content of file {i}".encode())
+            files_to_remove.append(str(test_file))
+
+        cmd_add(Namespace(path=files_to_remove))
+
+        rm_args = Namespace(path=files_to_remove)
+        cmd_rm(rm_args)
+
+        repo = repo_find()
+        assert repo is not None
+        index = index_read(repo)
+        assert len(index.entries) == 0
+        for file_path in files_to_remove:
+            assert not Path(file_path).exists()
+
     def test_rm_partial_removal(self, temp_dir, clean_env):
         """Test removing some files while keeping others."""
         os.chdir(temp_dir)
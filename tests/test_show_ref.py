@@ -450,3 +450,31 @@ class TestShowRefCommand:
                 assert (
                     "/" in ref_path[5:]
                 )  # Should have at least refs/{category}/{name}
+
+    def test_interrupted_ref_create_leaves_no_ref(
+        self, temp_dir, clean_env, monkeypatch
+    ):
+        """Test that a failed rename leaves nothing for ref_list to report."""
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        init_args = Namespace(path=str(repo_path))
+        cmd_init(init_args)
+
+        os.chdir(repo_path)
+        repo = repo_find()
+        assert repo is not None
+
+        ref_create(repo, "heads/master", "a" * 40)
+
+        def crash(src, dst):
+            raise OSError("simulated crash before rename")
+
+        monkeypatch.setattr(os, "replace", crash)
+        with pytest.raises(OSError, match="simulated crash"):
+            ref_create(repo, "heads/develop", "b" * 40)
+        monkeypatch.undo()
+
+        refs = ref_list(repo)
+        assert refs["heads"] == {"master": "a" * 40}
+        assert not [f for f in os.listdir(repo.vesdir) if f.endswith(".tmp")]
@@ -637,6 +637,111 @@ class TestStatusCommand:
         assert "temp/data.txt" not in output
         assert "temp/" not in output
 
+    def test_status_ignored_directories_with_tracked_or_negated_files(
+        self, temp_dir, clean_env, capsys
+    ):
+        """Test that ignored directories are still walked when their files matter."""
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        cmd_init(Namespace(path=str(repo_path)))
+        os.chdir(repo_path)
+
+        # A tracked file inside a directory that is ignored afterwards
+        (repo_path / "vendor").mkdir()
+        (repo_path / "vendor" / "lib.py").write_text("tracked")
+        cmd_add(Namespace(path=["vendor/lib.py"]))
+
+        (repo_path / ".vesignore").write_text("vendor/\nbuild/\n")
+        cmd_add(Namespace(path=[".vesignore"]))
+        cmd_commit(Namespace(message="Add ignore rules"))
+
+        (repo_path / "build").mkdir()
+        (repo_path / "build" / "out.bin").write_text("output")
+
+        cmd_status(Namespace())
+        output = capsys.readouterr().out
+        assert "deleted:  vendor/lib.py" not in output
+        assert "build" not in output
+
+        # A negation rule can re-include files below an ignored directory
+        (repo_path / ".vesignore").write_text("vendor/\nbuild/\n!build/keep.txt\n")
+        cmd_add(Namespace(path=[".vesignore"]))
+        (repo_path / "build" / "keep.txt").write_text("keep")
+
+        # keep.txt is untracked and out.bin ignored, so build/ collapses
+        cmd_status(Namespace())
+        untracked = capsys.readouterr().out.split("Untracked files:")[1].split()
+        assert untracked == ["build/"]
+
+    def test_status_collapses_directory_with_ignored_subdirectory(
+        self, temp_dir, clean_env, capsys
+    ):
+        """Test that ignored subdirectories do not keep a directory from collapsing."""
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        cmd_init(Namespace(path=str(repo_path)))
+        os.chdir(repo_path)
+
+        (repo_path / ".vesignore").write_text("**/node_modules/\n")
+        cmd_add(Namespace(path=[".vesignore"]))
+
+        modules = repo_path / "pkg" / "node_modules" / "dep"
+        modules.mkdir(parents=True)
+        (modules / "index.js").write_text("module.exports = {};")
+        (repo_path / "pkg" / "main.js").write_text("require('dep');")
+
+        cmd_status(Namespace())
+
+        untracked = capsys.readouterr().out.split("Untracked files:")[1].split()
+        assert untracked == ["pkg/"]
+
+    def test_status_walks_directories_matched_only_by_file_globs(
+        self, temp_dir, clean_env, capsys
+    ):
+        """Test that a glob matching "dir/" through its slash does not prune dir."""
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        cmd_init(Namespace(path=str(repo_path)))
+        os.chdir(repo_path)
+
+        (repo_path / ".ves" / "info").mkdir(exist_ok=True)
+        (repo_path / ".ves" / "info" / "exclude").write_text("*.o?\n")
+
+        (repo_path / "foo.o").mkdir()
+        (repo_path / "foo.o" / "bar.c").write_text("int main;")
+
+        cmd_status(Namespace())
+
+        untracked = capsys.readouterr().out.split("Untracked files:")[1].split()
+        assert untracked == ["foo.o/"]
+
+    @pytest.mark.parametrize("exclude", ["**/build/\n", "**/build/\n!zzz\n"])
+    def test_status_collapse_does_not_depend_on_pruning(
+        self, temp_dir, clean_env, capsys, exclude
+    ):
+        """Test that ignored files never keep a directory from collapsing."""
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        cmd_init(Namespace(path=str(repo_path)))
+        os.chdir(repo_path)
+
+        # A negation, even an unrelated one, turns directory pruning off
+        (repo_path / ".ves" / "info").mkdir(exist_ok=True)
+        (repo_path / ".ves" / "info" / "exclude").write_text(exclude)
+
+        (repo_path / "d" / "build").mkdir(parents=True)
+        (repo_path / "d" / "a.txt").write_text("a")
+        (repo_path / "d" / "build" / "out").write_text("out")
+
+        cmd_status(Namespace())
+
+        untracked = capsys.readouterr().out.split("Untracked files:")[1].split()
+        assert untracked == ["d/"]
+
     def test_status_with_symlink_modified(self, temp_dir, clean_env, capsys):
         """Test status with a symlink that has been modified.
 
@@ -852,6 +957,264 @@ class TestStatusCommand:
         assert "Changes not staged for commit:" in output
         assert "modified: link.txt" in output
 
+    def test_status_with_many_modified_files(self, temp_dir, clean_env, capsys):
+        """Test that status hashes large batches of touched files correctly."""
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        cmd_init(Namespace(path=str(repo_path)))
+        os.chdir(repo_path)
+
+        names = [f"file{i:02d}.txt" for i in range(30)]
+        for name in names:
+            (repo_path / name).write_text(f"content of {name}")
+        cmd_add(Namespace(path=names))
+
+        import time
+
+        time.sleep(0.1)  # Ensure different timestamp
+
+        # Touch every file; only the first 20 actually change content
+        for i, name in enumerate(names):
+            suffix = " changed" if i < 20 else ""
+            (repo_path / name).write_text(f"content of {name}{suffix}")
+
+        cmd_status(Namespace())
+
+        output = capsys.readouterr().out
+        unstaged = output.split("Changes not staged for commit:")[1]
+        unstaged = unstaged.split("Untracked files:")[0]
+
+        modified = [line.split()[-1] for line in unstaged.splitlines() if line]
+        assert sorted(modified) == names[:20]
+
+    def test_status_with_emptied_and_large_files(self, temp_dir, clean_env, capsys):
+        """Test that emptied and large files are hashed correctly by status."""
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        cmd_init(Namespace(path=str(repo_path)))
+        os.chdir(repo_path)
+
+        large = os.urandom(1024 * 1024)
+        (repo_path / "empty.txt").write_text("")
+        (repo_path / "emptied.txt").write_text("not empty yet")
+        (repo_path / "large.bin").write_bytes(large)
+        cmd_add(Namespace(path=["empty.txt", "emptied.txt", "large.bin"]))
+
+        import time
+
+        time.sleep(0.1)  # Ensure different timestamp
+
+        # Rewrite all three; only emptied.txt actually changes
+        (repo_path / "empty.txt").write_text("")
+        (repo_path / "emptied.txt").write_text("")
+        (repo_path / "large.bin").write_bytes(large)
+
+        cmd_status(Namespace())
+
+        output = capsys.readouterr().out
+        assert "modified: emptied.txt" in output
+        assert "modified: empty.txt" not in output
+        assert "modified: large.bin" not in output
+
+    def test_status_size_change_skips_hashing(
+        self, temp_dir, clean_env, capsys, monkeypatch
+    ):
+        """Test that a size change marks a file modified without hashing it."""
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        cmd_init(Namespace(path=str(repo_path)))
+        os.chdir(repo_path)
+
+        test_file = repo_path / "test.txt"
+        test_file.write_text("short")
+        cmd_add(Namespace(path=["test.txt"]))
+        test_file.write_text("a longer content")
+
+        def fail_hash(dir_entry):
+            raise AssertionError(f"{dir_entry.path} should not be hashed")
+
+        monkeypatch.setattr("src.utils.status._hash_worktree_file", fail_hash)
+        cmd_status(Namespace())
+
+        assert "modified: test.txt" in capsys.readouterr().out
+
+    def test_status_refreshes_index_times_of_unchanged_files(
+        self, temp_dir, clean_env, capsys, monkeypatch
+    ):
+        """Test that files found unchanged by hashing are not hashed again."""
+        from src.core.index import index_read
+
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        cmd_init(Namespace(path=str(repo_path)))
+        os.chdir(repo_path)
+
+        test_file = repo_path / "test.txt"
+        test_file.write_text("same content")
+        cmd_add(Namespace(path=["test.txt"]))
+
+        # Bump the times without touching the content
+        os.utime(test_file, ns=(10**18, 10**18))
+        monkeypatch.setattr("src.utils.status.RACY_WINDOW_NS", 0)
+
+        cmd_status(Namespace())
+        assert "modified: test.txt" not in capsys.readouterr().out
+
+        repo = repo_find()
+        entry = index_read(repo).entries[0]
+        assert entry.mtime == (10**9, 0)
+
+        def fail_hash(dir_entry):
+            raise AssertionError(f"{dir_entry.path} should not be hashed")
+
+        monkeypatch.setattr("src.utils.status._hash_worktree_file", fail_hash)
+        cmd_status(Namespace())
+        assert "modified: test.txt" not in capsys.readouterr().out
+
+    def test_status_refresh_keeps_concurrent_index_writes(
+        self, temp_dir, clean_env, capsys, monkeypatch
+    ):
+        """Test that status drops its refresh if the index changed after reading."""
+        from src.core.index import index_read
+        from src.utils.status import cmd_status_index_worktree
+
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        cmd_init(Namespace(path=str(repo_path)))
+        os.chdir(repo_path)
+
+        test_file = repo_path / "test.txt"
+        test_file.write_text("same content")
+        cmd_add(Namespace(path=["test.txt"]))
+        os.utime(test_file, ns=(10**18, 10**18))
+        monkeypatch.setattr("src.utils.status.RACY_WINDOW_NS", 0)
+
+        repo = repo_find()
+        stale = index_read(repo)
+
+        # Another command stages a file between status' read and its refresh
+        (repo_path / "other.txt").write_text("other")
+        cmd_add(Namespace(path=["other.txt"]))
+
+        cmd_status_index_worktree(repo, stale)
+        capsys.readouterr()
+
+        names = [e.name for e in index_read(repo).entries]
+        assert sorted(names) == ["other.txt", "test.txt"]
+        assert not [f for f in os.listdir(repo.vesdir) if f.endswith(".tmp")]
+
+    def test_status_failed_refresh_leaves_index_intact(
+        self, temp_dir, clean_env, capsys, monkeypatch
+    ):
+        """Test that a refresh failing mid-write keeps the old index file."""
+        import src.core.index as index_module
+
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        cmd_init(Namespace(path=str(repo_path)))
+        os.chdir(repo_path)
+
+        test_file = repo_path / "test.txt"
+        test_file.write_text("same content")
+        cmd_add(Namespace(path=["test.txt"]))
+        os.utime(test_file, ns=(10**18, 10**18))
+        monkeypatch.setattr("src.utils.status.RACY_WINDOW_NS", 0)
+
+        index_file = repo_path / ".ves" / "index"
+        before = index_file.read_bytes()
+
+        def disk_full(index, f):
+            f.write(b"DIRC")
+            raise OSError(28, "No space left on device")
+
+        monkeypatch.setattr(index_module, "_index_serialize", disk_full)
+        cmd_status(Namespace())
+
+        assert "modified: test.txt" not in capsys.readouterr().out
+        assert index_file.read_bytes() == before
+        assert not [f for f in os.listdir(repo_path / ".ves") if f.endswith(".tmp")]
+
+    def test_tree_to_dict_reads_shared_subtrees_once(
+        self, temp_dir, clean_env, monkeypatch
+    ):
+        """Test that flattened subtrees are cached across commits."""
+        import src.core.objects as objects
+        from src.utils.tree import tree_to_dict
+
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        cmd_init(Namespace(path=str(repo_path)))
+        os.chdir(repo_path)
+
+        (repo_path / "lib").mkdir()
+        (repo_path / "lib" / "util.py").write_text("util")
+        (repo_path / "main.py").write_text("v1")
+        cmd_add(Namespace(path=["lib/util.py", "main.py"]))
+        cmd_commit(Namespace(message="First"))
+
+        repo = repo_find()
+        first = objects.object_find(repo, "HEAD")
+
+        (repo_path / "main.py").write_text("v2")
+        cmd_add(Namespace(path=["main.py"]))
+        cmd_commit(Namespace(message="Second"))
+
+        reads = []
+        object_read_raw = objects._object_read_raw
+
+        def counting_read(repo, sha):
+            reads.append(sha)
+            return object_read_raw(repo, sha)
+
+        monkeypatch.setattr(objects, "_object_read_raw", counting_read)
+
+        repo = repo_find()
+        old = tree_to_dict(repo, first)
+        new = tree_to_dict(repo, "HEAD", "prefix")
+
+        assert old["lib/util.py"] == new["prefix/lib/util.py"]
+        assert old["main.py"] != new["prefix/main.py"]
+        assert reads
+        assert len(reads) == len(set(reads))
+
+    def test_tree_to_dict_cache_is_bounded(self, temp_dir, clean_env, monkeypatch):
+        """Test that the flattened-tree cache evicts old trees and stays correct."""
+        import src.utils.tree as tree
+
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        cmd_init(Namespace(path=str(repo_path)))
+        os.chdir(repo_path)
+
+        # More subtrees than the cache holds, so flattening evicts as it goes
+        names = [f"d{i}/sub/f.txt" for i in range(4)]
+        for name in names:
+            (repo_path / name).parent.mkdir(parents=True)
+            (repo_path / name).write_text(name)
+        cmd_add(Namespace(path=names))
+        cmd_commit(Namespace(message="First"))
+
+        monkeypatch.setattr(tree, "TREE_DICT_CACHE_SIZE", 2)
+        repo = repo_find()
+
+        flat = tree.tree_to_dict(repo, "HEAD")
+        assert sorted(flat) == names
+        assert len(repo._tree_dicts) == 2
+
+        # Drop the root: the cached d3 subtree is found while reading, then
+        # evicted by the other subtrees before the root is flattened
+        repo._tree_dicts.popitem()
+        assert tree.tree_to_dict(repo, "HEAD") == flat
+        assert len(repo._tree_dicts) == 2
+
     def test_status_untracked_directory_optimization(self, temp_dir, clean_env, capsys):
         """Test that status optimizes display of untracked directories.
 
@@ -942,6 +1305,33 @@ class TestStatusCommand:
         # Should show single files in root
         assert "readme.txt" in output
 
+    def test_status_untracked_directory_from_subdirectory(
+        self, temp_dir, clean_env, capsys
+    ):
+        """Test that directory collapsing does not depend on the current directory."""
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        cmd_init(Namespace(path=str(repo_path)))
+        os.chdir(repo_path)
+
+        mixed_dir = repo_path / "src"
+        mixed_dir.mkdir()
+        (mixed_dir / "tracked.py").write_text("print('tracked')")
+        cmd_add(Namespace(path=["src/tracked.py"]))
+        (mixed_dir / "untracked.py").write_text("print('untracked')")
+
+        other_dir = repo_path / "other"
+        other_dir.mkdir()
+        os.chdir(other_dir)
+
+        cmd_status(Namespace())
+
+        output = capsys.readouterr().out
+        untracked = output.split("Untracked files:")[1].split()
+        assert "src/untracked.py" in untracked
+        assert "src/" not in untracked
+
     def test_status_empty_untracked_directory_not_shown(
         self, temp_dir, clean_env, capsys
     ):
@@ -976,3 +1366,31 @@ class TestStatusCommand:
         assert "empty_dir" not in output
         assert "nested" not in output
         assert "empty_subdir" not in output
+
+    def test_tree_to_dict_wide_tree(self, temp_dir, clean_env):
+        """Test flattening a tree whose subtrees are read in parallel."""
+        from src.utils.tree import PARALLEL_TREE_READ_THRESHOLD, tree_to_dict
+
+        os.chdir(temp_dir)
+
+        repo_path = Path(temp_dir) / "test_repo"
+        cmd_init(Namespace(path=str(repo_path)))
+        os.chdir(repo_path)
+
+        # Wide enough at two depths to take the thread pool path
+        expected = set()
+        for d in range(PARALLEL_TREE_READ_THRESHOLD + 4):
+            (repo_path / f"dir{d}" / "sub").mkdir(parents=True)
+            for name in (f"dir{d}/file.txt", f"dir{d}/sub/nested.txt"):
+                (repo_path / name).write_text(name)
+                expected.add(name)
+        (repo_path / "top.txt").write_text("top")
+        expected.add("top.txt")
+
+        cmd_add(Namespace(path=sorted(expected)))
+        cmd_commit(Namespace(message="Wide"))
+
+        flat = tree_to_dict(repo_find(), "HEAD")
+
+        assert set(flat) == {name.replace("/", os.sep) for name in expected}
+        assert flat["dir3/sub/nested.txt".replace("/", os.sep)] != flat["top.txt"]